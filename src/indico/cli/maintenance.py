@@ -5,7 +5,10 @@
 # modify it under the terms of the MIT License; see the
 # LICENSE file for more details.
 
+from datetime import datetime
+
 import click
+import pytz
 
 from indico.cli.core import cli_group
 from indico.core.db import db
@@ -19,6 +22,9 @@ from indico.modules.events.models.principals import EventPrincipal
 from indico.modules.events.models.roles import EventRole
 from indico.modules.events.sessions import Session
 from indico.modules.events.sessions.models.principals import SessionPrincipal
+from indico.modules.logs.models.archives import LogArchiveType
+from indico.modules.logs.operations import archive_log_entries, get_archivable_log_months
+from indico.util.date_time import now_utc
 
 
 @cli_group()
@@ -101,3 +107,36 @@ def fix_event_role_acls():
                   default=True, abort=True)
     db.session.commit()
     click.secho('Success!', fg='green')
+
+
+@cli.command()
+@click.option('--before', required=True, metavar='YYYY-MM',
+              help='Archive the log entries logged before this month')
+@click.option('--dry-run', '-n', is_flag=True, help='Only show how many log months would be archived')
+def archive_logs(before, dry_run):
+    """Archive old log entries.
+
+    The entries of event, category, user and application logs are moved
+    into one compressed file per log and month in the log archive storage
+    backend and deleted from the database.  Archived entries can still be
+    viewed on the log pages.
+    """
+    try:
+        before_dt = pytz.utc.localize(datetime.strptime(before, '%Y-%m'))
+    except ValueError:
+        raise click.BadParameter('Expected a month in the format YYYY-MM', param_hint='--before') from None
+    if before_dt > now_utc():
+        raise click.BadParameter('The month must not be in the future', param_hint='--before')
+
+    if dry_run:
+        for log_type in LogArchiveType:
+            months = get_archivable_log_months(log_type, before_dt)
+            click.echo(f'{log_type.name}: {len(months)} log months to archive')
+        return
+
+    count = 0
+    for archive in archive_log_entries(before_dt):
+        log_name = archive.type.name if archive.object_id is None else f'{archive.type.name} #{archive.object_id}'
+        click.echo(f'Archived {archive.entry_count} entries of {log_name} from {archive.start_dt:%Y-%m}')
+        count += 1
+    click.secho(f'Created {count} log archives', fg='green')
@@ -6,12 +6,22 @@
 # LICENSE file for more details.
 
 import functools
+import hashlib
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from datetime import timedelta
 
 from flask import current_app, request
-from flask_multipass import InvalidCredentials, Multipass, NoSuchUser
+from flask_multipass import IdentityInfo, InvalidCredentials, Multipass, NoSuchUser
+from flask_multipass.core import multi_value_types
+from werkzeug.datastructures import MultiDict
 from werkzeug.local import LocalProxy
 
 from indico.core import signals
+from indico.core.cache import make_scoped_cache
 from indico.core.config import config
 from indico.core.limiter import make_rate_limiter
 from indico.core.logger import Logger
@@ -22,6 +32,62 @@ logger = Logger.get('auth')
 login_rate_limiter = LocalProxy(functools.cache(lambda: make_rate_limiter('login', config.FAILED_LOGIN_RATE_LIMIT)))
 signup_rate_limiter = LocalProxy(functools.cache(lambda: make_rate_limiter('signup', config.SIGNUP_RATE_LIMIT)))
 
+#: How long (in seconds) we wait for the search results of an identity
+#: provider, unless its settings contain a different `search_timeout`
+DEFAULT_SEARCH_TIMEOUT = 10
+#: How long the search results of an identity provider are cached
+SEARCH_CACHE_TTL = timedelta(minutes=5)
+#: The maximum number of identity provider searches running at the same time
+MAX_CONCURRENT_SEARCHES = 8
+#: The maximum number of searches running at the same time in a single
+#: identity provider.  Searches which time out keep running, so without
+#: this limit a provider which hangs would end up using all search threads.
+MAX_CONCURRENT_PROVIDER_SEARCHES = 2
+
+identity_search_cache = make_scoped_cache('identity-search')
+_search_executor = ThreadPoolExecutor(max_workers=MAX_CONCURRENT_SEARCHES, thread_name_prefix='indico-identity-search')
+_running_searches = Counter()
+_running_searches_lock = threading.Lock()
+
+
+def _get_search_cache_key(provider, criteria, exact):
+    normalized = sorted((key, sorted(str(value).strip().lower() for value in values))
+                        for key, values in criteria.items())
+    return hashlib.sha256(repr((provider.name, exact, normalized)).encode()).hexdigest()
+
+
+def _dump_identity(identity):
+    return {'identifier': identity.identifier, 'multipass_data': identity.multipass_data,
+            'data': list(identity.data.items(multi=True))}
+
+
+def _load_identity(provider, data):
+    # the data has already been mapped by the provider, so we must not pass it to the constructor again
+    identity = IdentityInfo.__new__(IdentityInfo)
+    identity.provider = provider
+    identity.secure_login = None
+    identity.identifier = data['identifier']
+    identity.multipass_data = data['multipass_data']
+    identity.data = MultiDict(data['data'])
+    return identity
+
+
+def _start_provider_search(provider):
+    with _running_searches_lock:
+        if _running_searches[provider.name] >= MAX_CONCURRENT_PROVIDER_SEARCHES:
+            return False
+        _running_searches[provider.name] += 1
+        return True
+
+
+def _search_provider(app, provider, criteria, exact):
+    try:
+        with app.app_context():
+            return list(provider.search_identities(criteria, exact=exact))
+    finally:
+        with _running_searches_lock:
+            _running_searches[provider.name] -= 1
+
 
 class IndicoMultipass(Multipass):
     @property
@@ -120,6 +186,56 @@ class IndicoMultipass(Multipass):
                exc.details)
         return super().handle_auth_error(exc, redirect_to_login=redirect_to_login)
 
+    def search_identities(self, providers=None, exact=False, **criteria):
+        """Search user identities matching certain criteria.
+
+        Unlike in flask-multipass, the identity providers are searched
+        concurrently and the results of each provider are cached for a
+        short time.  A provider which fails or does not respond within its
+        `search_timeout` is skipped, so the results from the other providers
+        are still returned.  So is a provider which already has too many
+        searches running, e.g. because it stopped responding.
+        """
+        for k, v in criteria.items():
+            if isinstance(v, multi_value_types):
+                criteria[k] = v = set(v)
+            elif not isinstance(v, set):
+                criteria[k] = v = {v}
+            if any(not x for x in v):
+                raise ValueError('Empty search criterion: ' + k)
+
+        identities = []
+        pending = []
+        app = current_app._get_current_object()
+        for provider in self.identity_providers.values():
+            if (providers is not None and provider.name not in providers) or not provider.supports_search:
+                continue
+            provider_criteria = provider.map_search_criteria(criteria)
+            cache_key = _get_search_cache_key(provider, provider_criteria, exact)
+            if (cached := identity_search_cache.get(cache_key)) is not None:
+                identities += [_load_identity(provider, data) for data in cached]
+                continue
+            if not _start_provider_search(provider):
+                logger.warning('Not searching identities in %s since too many searches are still running',
+                               provider.name)
+                continue
+            deadline = time.monotonic() + provider.settings.get('search_timeout', DEFAULT_SEARCH_TIMEOUT)
+            future = _search_executor.submit(_search_provider, app, provider, provider_criteria, exact)
+            pending.append((provider, cache_key, deadline, future))
+
+        for provider, cache_key, deadline, future in pending:
+            try:
+                result = future.result(timeout=max(0, deadline - time.monotonic()))
+            except FutureTimeoutError:
+                logger.warning('Searching identities in %s timed out', provider.name)
+                continue
+            except Exception:
+                logger.exception('Searching identities in %s failed', provider.name)
+                continue
+            identity_search_cache.set(cache_key, [_dump_identity(identity) for identity in result], SEARCH_CACHE_TTL)
+            identities += result
+        return identities
+
     def handle_login_form(self, provider, data):
         signal_res = signals.users.check_login_data.send(type(provider), provider=provider, data=data)
         if errors := values_from_signal(signal_res, as_list=True):
@@ -0,0 +1,98 @@
+# This file is part of Indico.
+# Copyright (C) 2002 - 2025 CERN
+#
+# Indico is free software; you can redistribute it and/or
+# modify it under the terms of the MIT License; see the
+# LICENSE file for more details.
+
+import threading
+import time
+
+import pytest
+from flask_multipass import IdentityInfo, IdentityProvider
+
+from indico.core.auth import MAX_CONCURRENT_PROVIDER_SEARCHES, IndicoMultipass, multipass
+
+
+class FakeIdentityProvider(IdentityProvider):
+    supports_search = True
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.delay = self.settings.pop('delay', 0)
+        self.error = self.settings.pop('error', False)
+        self.barrier = self.settings.pop('barrier', None)
+        self.release = self.settings.pop('release', None)
+        self.searches = []
+
+    def search_identities(self, criteria, exact=False):
+        self.searches.append(criteria)
+        if self.barrier:
+            self.barrier.wait(timeout=5)
+        if self.release:
+            self.release.wait(timeout=5)
+        time.sleep(self.delay)
+        if self.error:
+            raise Exception('provider failure')
+        for email in criteria['email']:
+            yield IdentityInfo(self, f'{self.name}-{email}', email=email, first_name=self.name)
+
+
+@pytest.fixture
+def fake_providers(mocker):
+    def _make_providers(**settings):
+        providers = {name: FakeIdentityProvider(multipass, name, provider_settings)
+                     for name, provider_settings in settings.items()}
+        mocker.patch.object(IndicoMultipass, 'identity_providers', new_callable=mocker.PropertyMock,
+                            return_value=providers)
+        return providers
+
+    return _make_providers
+
+
+def test_search_identities(fake_providers):
+    fake_providers(one={}, two={})
+    identities = multipass.search_identities(email='foo@example.test')
+    assert {(ident.provider.name, ident.identifier, ident.data['email']) for ident in identities} == {
+        ('one', 'one-foo@example.test', 'foo@example.test'),
+        ('two', 'two-foo@example.test', 'foo@example.test'),
+    }
+
+
+def test_search_identities_concurrent(fake_providers):
+    # the barrier breaks (and the providers fail) unless all of them are searched at the same time
+    barrier = threading.Barrier(3)
+    fake_providers(one={'barrier': barrier}, two={'barrier': barrier}, three={'barrier': barrier})
+    identities = multipass.search_identities(email='foo@example.test')
+    assert len(identities) == 3
+    assert not barrier.broken
+
+
+def test_search_identities_hanging_provider(fake_providers):
+    release = threading.Event()
+    providers = fake_providers(hanging={'release': release, 'search_timeout': 0.1}, fast={})
+    try:
+        for __ in range(MAX_CONCURRENT_PROVIDER_SEARCHES + 1):
+            identities = multipass.search_identities(email='foo@example.test')
+            assert [ident.provider.name for ident in identities] == ['fast']
+        assert len(providers['hanging'].searches) == MAX_CONCURRENT_PROVIDER_SEARCHES
+    finally:
+        release.set()
+
+
+def test_search_identities_partial(fake_providers):
+    fake_providers(slow={'delay': 2, 'search_timeout': 0.1}, broken={'error': True}, fast={})
+    identities = multipass.search_identities(email='foo@example.test')
+    assert [ident.provider.name for ident in identities] == ['fast']
+
+
+def test_search_identities_cached(fake_providers):
+    providers = fake_providers(one={})
+    identities = multipass.search_identities(email='foo@example.test')
+    cached_identities = multipass.search_identities(email=' FOO@example.test')
+    assert len(providers['one'].searches) == 1
+    assert [(ident.provider, ident.identifier, ident.data.to_dict()) for ident in cached_identities] == [
+        (ident.provider, ident.identifier, ident.data.to_dict()) for ident in identities
+    ]
+    multipass.search_identities(email='bar@example.test')
+    assert len(providers['one'].searches) == 2
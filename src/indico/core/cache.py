@@ -88,7 +88,7 @@ class ScopedCache:
     def add(self, key, value, timeout=None):
         if isinstance(timeout, timedelta):
             timeout = int(timeout.total_seconds())
-        self.cache.add(self._scoped(key), value, timeout=timeout)
+        return self.cache.add(self._scoped(key), value, timeout=timeout)
 
     def delete(self, key):
         self.cache.delete(self._scoped(key))
@@ -152,11 +152,12 @@ class IndicoCache(Cache):
         if isinstance(timeout, timedelta):
             timeout = int(timeout.total_seconds())
         try:
-            super().add(key, value, timeout=timeout)
+            return super().add(key, value, timeout=timeout)
         except RedisError:
             if config.DEBUG:
                 raise
             _logger.exception('add(%r) failed', key)
+            return False
 
     def delete(self, key):
         try:
@@ -49,6 +49,9 @@ DEFAULTS = {
     'CUSTOM_COUNTRIES': {},
     'CUSTOM_LANGUAGES': {},
     'DB_LOG': False,
+    'DB_QUERY_BUDGET': None,
+    'DB_QUERY_REPEAT_THRESHOLD': None,
+    'DB_QUERY_STATS_HEADER': False,
     'DEBUG': False,
     'DEFAULT_LOCALE': 'en_GB',
     'DEFAULT_TIMEZONE': 'UTC',
@@ -63,7 +66,10 @@ DEFAULTS = {
     'FAILED_LOGIN_RATE_LIMIT': '5 per 15 minutes; 10 per day',
     'FAVICON_URL': None,
     'IDENTITY_PROVIDERS': {},
+    'LATENCY_METRICS_DIR': None,
+    'LATEX_MAX_CONCURRENCY': None,
     'LATEX_RATE_LIMIT': '2 per 3 seconds',
+    'LATEX_TIMEOUT': 300,
     'LOCAL_IDENTITIES': True,
     'LOCAL_USERNAMES': True,
     'LOCAL_MODERATION': False,
@@ -73,7 +79,9 @@ DEFAULTS = {
     'LOGGING_CONFIG_FILE': 'logging.yaml',
     'LOGIN_LOGO_URL': None,
     'LOGO_URL': None,
+    'LOG_ARCHIVE_STORAGE': None,
     'LOG_DIR': '/opt/indico/log',
+    'MATERIAL_PACKAGE_CACHE_SIZE': 10 * 1024,  # 10GB
     'MATERIAL_PACKAGE_RATE_LIMIT': '3 per 30 minutes, 3 per day',
     'MAX_DATA_EXPORT_SIZE': 10 * 1024,  # 10GB
     'MAX_UPLOAD_FILES_TOTAL_SIZE': 0,
@@ -81,6 +89,8 @@ DEFAULTS = {
     'NO_REPLY_EMAIL': None,
     'PLUGINS': set(),
     'PROFILE': False,
+    'PROFILE_ENDPOINTS': set(),
+    'PROFILE_SAMPLE_RATE': 0,
     'PROVIDER_MAP': {},
     'PUBLIC_SUPPORT_EMAIL': None,
     'REDIS_CACHE_URL': None,
@@ -98,6 +108,7 @@ DEFAULTS = {
     'SMTP_KEYFILE': None,
     'SMTP_LOGIN': None,
     'SMTP_PASSWORD': None,
+    'SMTP_RATE_LIMIT': None,
     'SMTP_SENDER_FALLBACK': None,
     'SMTP_SERVER': ('localhost', 25),
     'SMTP_TIMEOUT': 30,
@@ -190,6 +201,7 @@ def _convert_key(name):
 def _postprocess_config(data):
     data['BASE_URL'] = data['BASE_URL'].rstrip('/')
     data['STATIC_SITE_STORAGE'] = data['STATIC_SITE_STORAGE'] or data['ATTACHMENT_STORAGE']
+    data['LOG_ARCHIVE_STORAGE'] = data['LOG_ARCHIVE_STORAGE'] or data['ATTACHMENT_STORAGE']
     if data['DISABLE_CELERY_CHECK'] is None:
         data['DISABLE_CELERY_CHECK'] = data['DEBUG']
 
@@ -175,19 +175,37 @@ class IndicoModel(Model):
         where you always need an ID but don't really care if the
         object already has one or not.
         """
+        type(self).assign_ids([self])
+
+    @classmethod
+    def assign_ids(cls, objs):
+        """Immediately assign IDs to many objects of this class.
+
+        This works like :meth:`assign_id` but gets all the IDs with a
+        single query.  Besides that, new objects which already have
+        their ID can be inserted in bulk when the session is flushed,
+        while otherwise each one needs a separate ``INSERT`` to get
+        its ID from the database.
+
+        :param objs: The objects which need an ID
+        """
         from indico.core.db import db
-        table_name = type(self).__table__.fullname
-        mapper = inspect(type(self))
+        table_name = cls.__table__.fullname
+        mapper = inspect(cls)
         candidates = [(attr, col.name) for attr, col in mapper.columns.items()
                       if col.primary_key and col.autoincrement and isinstance(col.type, db.Integer)]
         if len(candidates) != 1:
             raise TypeError('assign_id only works for tables with exactly one auto-incrementing PK column')
         attr_name, col_name = candidates[0]
-        if getattr(self, attr_name) is not None:
+        objs = [obj for obj in objs if getattr(obj, attr_name) is None]
+        if not objs:
             return
+        query = (db.session.query(db.func.nextval(db.func.pg_get_serial_sequence(table_name, col_name)))
+                 .select_from(db.func.generate_series(1, len(objs))))
         with db.session.no_autoflush:
-            id_ = db.session.query(db.func.nextval(db.func.pg_get_serial_sequence(table_name, col_name))).scalar()
-        setattr(self, attr_name, id_)
+            ids = [id_ for id_, in query]
+        for obj, id_ in zip(objs, ids, strict=True):
+            setattr(obj, attr_name, id_)
 
     def populate_from_dict(self, data, keys=None, skip=None, track_changes=True):
         """Populate the object with values in a dictionary.
@@ -5,9 +5,11 @@
 # modify it under the terms of the MIT License; see the
 # LICENSE file for more details.
 
+import functools
 import os
 import pickle
 import tempfile
+import time
 from datetime import date
 from email.utils import formataddr, make_msgid, parseaddr
 from fnmatch import fnmatch
@@ -16,10 +18,12 @@ from urllib.parse import urlsplit
 import click
 from celery.exceptions import MaxRetriesExceededError, Retry
 from sqlalchemy.orm.attributes import flag_modified
+from werkzeug.local import LocalProxy
 
 from indico.core.celery import celery
 from indico.core.config import config
 from indico.core.db import db
+from indico.core.limiter import make_rate_limiter
 from indico.core.logger import Logger
 from indico.modules.core.settings import core_settings
 from indico.util.date_time import now_utc
@@ -32,6 +36,11 @@ from indico.vendor.django_mail.message import EmailMultiAlternatives
 logger = Logger.get('emails')
 MAX_TRIES = 10
 DELAYS = [30, 60, 120, 300, 600, 1800, 3600, 3600, 7200]
+#: The maximum number of queued emails sent in a single task and SMTP connection
+EMAIL_BATCH_SIZE = 100
+
+email_rate_limiter = LocalProxy(functools.cache(lambda: make_rate_limiter('smtp', config.SMTP_RATE_LIMIT,
+                                                                          by_ip=False)))
 
 
 @celery.task(name='send_email', bind=True, max_retries=None)
@@ -67,6 +76,47 @@ def send_email_task(task, email, log_entry=None):
             db.session.commit()
 
 
+@celery.task(name='send_emails', bind=True, max_retries=None)
+def send_emails_task(task, emails):
+    """Send multiple emails using a single SMTP connection.
+
+    Emails that cannot be sent are retried separately using
+    `send_email_task`, unless connecting to the SMTP server fails,
+    in which case the whole batch is retried.
+
+    :param emails: A list of ``(email, log_entry_id)`` tuples
+    """
+    from indico.modules.logs import EventLogEntry
+    attempt = task.request.retries + 1
+    emails = [(email, EventLogEntry.get(log_entry_id) if log_entry_id is not None else None)
+              for email, log_entry_id in emails]
+    try:
+        failed = do_send_emails(emails)
+    except Exception as exc:
+        delay = ([*DELAYS, 0])[task.request.retries] if not config.DEBUG else 1
+        try:
+            task.retry(countdown=delay, max_retries=(MAX_TRIES - 1))
+        except MaxRetriesExceededError:
+            for email, log_entry in emails:
+                if log_entry:
+                    update_email_log_state(log_entry, failed=True)
+                path = store_failed_email(email, log_entry)
+                logger.error('Could not send email "%s" (attempt %d/%d); giving up [%s]; stored data in %s',
+                             truncate(email['subject'], 100), attempt, MAX_TRIES, exc, path)
+            db.session.commit()
+        except Retry:
+            logger.warning('Could not send %d emails (attempt %d/%d); retry in %ds [%s]',
+                           len(emails), attempt, MAX_TRIES, delay, exc)
+            raise
+        return
+    for email, log_entry, exc in failed:
+        logger.warning('Could not send email "%s" (attempt 1/%d); retry in %ds [%s]',
+                       truncate(email['subject'], 100), MAX_TRIES, DELAYS[0], exc)
+        send_email_task.apply_async((email, log_entry), countdown=DELAYS[0])
+    # commit the log entry state changes
+    db.session.commit()
+
+
 def get_actual_sender_address(sender_address: str, reply_address: set[str]) -> tuple[str, set]:
     site_title = core_settings.get('site_title')
     if not sender_address:
@@ -107,23 +157,84 @@ def do_send_email(email, log_entry=None, _from_task=False):
     :param _from_task: Indicates that this function is called from
                        the celery task responsible for sending emails.
     """
-    with get_connection() as conn:
-        msg = EmailMultiAlternatives(subject=email['subject'], body=email['body'], from_email=email['from'],
-                                     to=email['to'], cc=email['cc'], bcc=email['bcc'], reply_to=email['reply_to'],
-                                     attachments=email['attachments'], alternatives=email.get('alternatives'),
-                                     connection=conn)
-        if not msg.to:
-            msg.extra_headers['To'] = 'Undisclosed-recipients:;'
-        if email['html']:
-            msg.content_subtype = 'html'
-        msg.extra_headers['message-id'] = make_msgid(domain=urlsplit(config.BASE_URL).hostname)
-        msg.send()
+    conn = get_connection()
+    try:
+        conn.open()
+        _wait_for_rate_limit()
+        _make_message(email, conn).send()
+    finally:
+        _close_connection(conn)
     if not _from_task:
         logger.info('Sent email "%s"', truncate(email['subject'], 100))
     if log_entry:
         update_email_log_state(log_entry)
 
 
+def do_send_emails(emails):
+    """Send multiple emails using a single SMTP connection.
+
+    Like :func:`do_send_email`, this function does not retry sending
+    emails that failed.  An exception is only raised in case connecting
+    to the SMTP server fails; errors while sending a specific email are
+    returned instead.
+
+    :param emails: A list of ``(email, log_entry)`` tuples
+    :return: A list of ``(email, log_entry, exception)`` tuples for the
+             emails that could not be sent
+    """
+    failed = []
+    conn = get_connection()
+    try:
+        conn.open()
+        for email, log_entry in emails:
+            try:
+                _wait_for_rate_limit()
+                _make_message(email, conn).send()
+            except Exception as exc:
+                failed.append((email, log_entry, exc))
+                # the connection may be unusable after an error; closing it results
+                # in a new one being opened when sending the next email
+                _close_connection(conn)
+                continue
+            logger.info('Sent email "%s"', truncate(email['subject'], 100))
+            if log_entry:
+                update_email_log_state(log_entry)
+    finally:
+        _close_connection(conn)
+    return failed
+
+
+def _close_connection(conn):
+    # errors when closing the connection must not be propagated, since
+    # retrying the batch would send the emails that were already sent
+    try:
+        conn.close()
+    except Exception:
+        logger.warning('Could not close SMTP connection', exc_info=True)
+
+
+def _make_message(email, connection):
+    msg = EmailMultiAlternatives(subject=email['subject'], body=email['body'], from_email=email['from'],
+                                 to=email['to'], cc=email['cc'], bcc=email['bcc'], reply_to=email['reply_to'],
+                                 attachments=email['attachments'], alternatives=email.get('alternatives'),
+                                 connection=connection)
+    if not msg.to:
+        msg.extra_headers['To'] = 'Undisclosed-recipients:;'
+    if email['html']:
+        msg.content_subtype = 'html'
+    msg.extra_headers['message-id'] = make_msgid(domain=urlsplit(config.BASE_URL).hostname)
+    return msg
+
+
+def _wait_for_rate_limit():
+    if config.SMTP_RATE_LIMIT is None:
+        return
+    # the rate limit is shared by all processes sending emails through the same server
+    server = '{}:{}'.format(*config.SMTP_SERVER)
+    while not email_rate_limiter.hit(server):
+        time.sleep(max(1, email_rate_limiter.get_reset_delay(server).total_seconds()))
+
+
 def update_email_log_state(log_entry, failed=False):
     if failed:
         log_entry.data['state'] = 'failed'
@@ -5,9 +5,11 @@
 # modify it under the terms of the MIT License; see the
 # LICENSE file for more details.
 
+from smtplib import SMTPException
+
 import pytest
 
-from indico.core.emails import get_actual_sender_address
+from indico.core.emails import do_send_emails, get_actual_sender_address
 from indico.modules.core.settings import core_settings
 
 
@@ -60,3 +62,31 @@ def test_smtp_sender_config_notset(mocker, sender_email, result):
     core_settings.set('site_title', 'Indico')
     assert get_actual_sender_address(sender_email, set()) == result
     assert get_actual_sender_address(sender_email, {'reply@whatever.com'}) == (result[0], {'reply@whatever.com'})
+
+
+def test_do_send_emails(mocker):
+    mocker.patch('indico.core.emails._wait_for_rate_limit')
+    conn = mocker.patch('indico.core.emails.get_connection').return_value
+    make_message = mocker.patch('indico.core.emails._make_message')
+    error = Exception('refused')
+    make_message.return_value.send.side_effect = [None, error, None]
+    update_state = mocker.patch('indico.core.emails.update_email_log_state')
+    emails = [({'subject': f'Test {i}'}, log_entry) for i, log_entry in enumerate([None, 'entry1', 'entry2'])]
+    assert do_send_emails(emails) == [({'subject': 'Test 1'}, 'entry1', error)]
+    assert make_message.call_count == 3
+    assert all(call.args[1] is conn for call in make_message.call_args_list)
+    conn.open.assert_called_once()
+    assert conn.close.call_count == 2
+    update_state.assert_called_once_with('entry2')
+
+
+def test_do_send_emails_close_error(mocker):
+    mocker.patch('indico.core.emails._wait_for_rate_limit')
+    conn = mocker.patch('indico.core.emails.get_connection').return_value
+    conn.close.side_effect = SMTPException('quit failed')
+    make_message = mocker.patch('indico.core.emails._make_message')
+    update_state = mocker.patch('indico.core.emails.update_email_log_state')
+    emails = [({'subject': f'Test {i}'}, f'entry{i}') for i in range(3)]
+    assert do_send_emails(emails) == []
+    assert make_message.return_value.send.call_count == 3
+    assert update_state.call_count == 3
@@ -5,6 +5,7 @@
 # modify it under the terms of the MIT License; see the
 # LICENSE file for more details.
 
+import itertools
 import re
 import time
 from email.mime.base import MIMEBase
@@ -102,23 +103,32 @@ def flush_email_queue():
     doing a commit/rollback of any other changes that might have
     been pending.
     """
-    from indico.core.emails import store_failed_email, update_email_log_state
+    from indico.core.emails import EMAIL_BATCH_SIZE, send_email_task, send_emails_task
     queue = g.get('email_queue', [])
     if not queue:
         return
     logger.debug('Sending %d queued emails', len(queue))
-    for fn, email, log_entry in queue:
+    # when sending many emails through celery, we send them in batches so each
+    # task can send all its emails over a single connection to the SMTP server
+    batched = [(email, log_entry) for fn, email, log_entry in queue if fn == send_email_task.delay]
+    if len(batched) > 1:
+        single = [(fn, email, log_entry) for fn, email, log_entry in queue if fn != send_email_task.delay]
+        for batch in itertools.batched(batched, EMAIL_BATCH_SIZE):
+            try:
+                send_emails_task.delay([(email, log_entry.id if log_entry else None) for email, log_entry in batch])
+            except Exception:
+                for email, log_entry in batch:
+                    path = _handle_flush_failure(email, log_entry)
+                    logger.exception('Flushing queued email "%s" failed; stored data in %s',
+                                     truncate(email['subject'], 100), path)
+                time.sleep(0.25)
+    else:
+        single = queue
+    for fn, email, log_entry in single:
         try:
             fn(email, log_entry)
         except Exception:
-            # Flushing the email queue happens after a commit.
-            # If anything goes wrong here we keep going and just log
-            # it to avoid losing (more) emails in case celery is not
-            # used for email sending or there is a temporary issue
-            # with celery.
-            if log_entry:
-                update_email_log_state(log_entry, failed=True)
-            path = store_failed_email(email, log_entry)
+            path = _handle_flush_failure(email, log_entry)
             logger.exception('Flushing queued email "%s" failed; stored data in %s',
                              truncate(email['subject'], 100), path)
             # Wait for a short moment in case it's a very temporary issue
@@ -127,6 +137,18 @@ def flush_email_queue():
     db.session.commit()
 
 
+def _handle_flush_failure(email, log_entry):
+    # Flushing the email queue happens after a commit.
+    # If anything goes wrong here we keep going and just log
+    # it to avoid losing (more) emails in case celery is not
+    # used for email sending or there is a temporary issue
+    # with celery.
+    from indico.core.emails import store_failed_email, update_email_log_state
+    if log_entry:
+        update_email_log_state(log_entry, failed=True)
+    return store_failed_email(email, log_entry)
+
+
 @make_interceptable
 def make_email(to_list=None, cc_list=None, bcc_list=None, *, sender_address=None, reply_address=None, attachments=None,
                subject=None, body=None, template=None, html=False, alternatives=None):
@@ -0,0 +1,128 @@
+# This file is part of Indico.
+# Copyright (C) 2002 - 2025 CERN
+#
+# Indico is free software; you can redistribute it and/or
+# modify it under the terms of the MIT License; see the
+# LICENSE file for more details.
+
+"""Process-level cache for JSON settings.
+
+Settings are cached in each process per table and scope (e.g. all
+settings of a specific event).  Every scope has a version stored in
+Redis which is replaced once a transaction changing a setting in that
+scope has been committed, so a process only needs to check that version
+(once per request or task) to know whether its cached copy is still
+up to date.
+"""
+
+from collections import OrderedDict
+from copy import deepcopy
+from threading import Lock
+from uuid import uuid4
+
+from flask import g, has_app_context
+
+from indico.core import signals
+from indico.core.cache import make_scoped_cache
+
+
+#: The maximum number of scopes kept in the cache of each process
+MAX_CACHED_SCOPES = 10000
+
+_versions = make_scoped_cache('settings-version')
+_entries = OrderedDict()
+_lock = Lock()
+
+
+def _get_version_key(scope):
+    table, kwargs = scope
+    return ','.join([table, *(f'{k}={v}' for k, v in sorted(kwargs))])
+
+
+def _get_pending():
+    if not has_app_context():
+        return set()
+    return g.setdefault('settings_pending_invalidations', set())
+
+
+def _get_version(scope):
+    versions = g.setdefault('settings_versions', {}) if has_app_context() else {}
+    try:
+        return versions[scope]
+    except KeyError:
+        pass
+    key = _get_version_key(scope)
+    version = _versions.get(key)
+    if version is None:
+        # not versioned yet (or evicted from redis); in case another process
+        # did the same in the meantime, we simply use its version instead
+        _versions.add(key, uuid4().hex)
+        version = _versions.get(key)
+    versions[scope] = version
+    return version
+
+
+def _drop_entries(scopes):
+    with _lock:
+        for scope in scopes:
+            _entries.pop(scope, None)
+    if has_app_context() and (versions := g.get('settings_versions')):
+        for scope in scopes:
+            versions.pop(scope, None)
+
+
+def _bump_versions(scopes):
+    _versions.set_many({_get_version_key(scope): uuid4().hex for scope in scopes})
+    _drop_entries(scopes)
+
+
+def get_cached_settings(scope, loader):
+    """Get the settings of a scope from the process-level cache.
+
+    :param scope: A ``(table, kwargs)`` tuple where `kwargs` is a frozenset
+                  of the column values identifying the scope
+    :param loader: A callable returning the settings from the database in
+                   case they are not cached
+    """
+    if scope in _get_pending():
+        # the settings have been modified in the current transaction, so they
+        # must not end up in the cache used by other requests
+        return loader()
+    version = _get_version(scope)
+    if version is None:
+        # redis is not available (or we are running the tests)
+        return loader()
+    with _lock:
+        entry = _entries.get(scope)
+        if entry is not None:
+            _entries.move_to_end(scope)
+    if entry is not None and entry[0] == version:
+        return deepcopy(entry[1])
+    data = loader()
+    with _lock:
+        _entries[scope] = (version, deepcopy(data))
+        _entries.move_to_end(scope)
+        while len(_entries) > MAX_CACHED_SCOPES:
+            _entries.popitem(last=False)
+    return data
+
+
+def invalidate_cached_settings(scope):
+    """Invalidate the cached settings of a scope.
+
+    Other processes are notified once the current transaction has been
+    committed, since they could otherwise cache the old settings again.
+    """
+    _drop_entries({scope})
+    if has_app_context():
+        _get_pending().add(scope)
+    else:
+        _bump_versions({scope})
+
+
+@signals.core.after_commit.connect
+def _bump_pending_versions(sender, **kwargs):
+    if not has_app_context():
+        return
+    if pending := g.pop('settings_pending_invalidations', None):
+        _bump_versions(pending)
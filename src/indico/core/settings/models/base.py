@@ -13,6 +13,7 @@ from sqlalchemy.dialects.postgresql import JSONB
 
 from indico.core.db import db
 from indico.core.db.sqlalchemy.principals import PrincipalMixin, PrincipalType
+from indico.core.settings.cache import get_cached_settings, invalidate_cached_settings
 from indico.util.decorators import strict_classproperty
 
 
@@ -25,6 +26,10 @@ def _coerce_value(value):
 class SettingsBase:
     """Base class for any kind of setting tables."""
 
+    #: Whether the settings may be cached across requests; this requires
+    #: the scope of a setting to always be specified in the same way
+    process_cached = False
+
     id = db.Column(
         db.Integer,
         primary_key=True
@@ -55,13 +60,13 @@ class SettingsBase:
          .filter_by(**kwargs)
          .delete(synchronize_session='fetch'))
         db.session.flush()
-        cls._clear_cache()
+        cls._clear_cache(kwargs)
 
     @classmethod
     def delete_all(cls, module, **kwargs):
         cls.query.filter_by(module=module, **kwargs).delete()
         db.session.flush()
-        cls._clear_cache()
+        cls._clear_cache(kwargs)
 
     @classmethod
     def _get_cache(cls, kwargs):
@@ -80,16 +85,23 @@ class SettingsBase:
             # no cache for this settings class / kwargs
             return g.global_settings_cache.setdefault(key, defaultdict(dict)), False
 
-    @staticmethod
-    def _clear_cache():
+    @classmethod
+    def _get_process_cache_scope(cls, kwargs):
+        return cls.__table__.fullname, frozenset(kwargs.items())
+
+    @classmethod
+    def _clear_cache(cls, kwargs):
         if has_request_context():
             g.pop('global_settings_cache', None)
+        if cls.process_cached:
+            invalidate_cached_settings(cls._get_process_cache_scope(kwargs))
 
 
 class JSONSettingsBase(SettingsBase):
     """Base class for setting tables with a JSON value."""
 
     __tablename__ = 'settings'
+    process_cached = True
 
     value = db.Column(
         JSONB,
@@ -107,12 +119,22 @@ class JSONSettingsBase(SettingsBase):
     @classmethod
     def get_all(cls, module, **kwargs):
         cache, hit = cls._get_cache(kwargs)
-        if hit:
-            return cache[module]
-        else:
-            for s in cls.query.filter_by(**kwargs):
-                cache[s.module][s.name] = s.value
-            return cache[module]
+        if not hit:
+            if cls.process_cached:
+                settings = get_cached_settings(cls._get_process_cache_scope(kwargs),
+                                               lambda: cls._load_all(**kwargs))
+            else:
+                settings = cls._load_all(**kwargs)
+            for module_name, module_settings in settings.items():
+                cache[module_name].update(module_settings)
+        return cache[module]
+
+    @classmethod
+    def _load_all(cls, **kwargs):
+        settings = defaultdict(dict)
+        for s in cls.query.filter_by(**kwargs):
+            settings[s.module][s.name] = s.value
+        return dict(settings)
 
     @classmethod
     def get(cls, module, name, default=None, **kwargs):
@@ -129,7 +151,7 @@ class JSONSettingsBase(SettingsBase):
             db.session.add(setting)
         setting.value = _coerce_value(value)
         db.session.flush()
-        cls._clear_cache()
+        cls._clear_cache(kwargs)
 
     @classmethod
     def set_multi(cls, module, items, **kwargs):
@@ -140,7 +162,7 @@ class JSONSettingsBase(SettingsBase):
         for name in items.keys() & existing.keys():
             existing[name].value = _coerce_value(items[name])
         db.session.flush()
-        cls._clear_cache()
+        cls._clear_cache(kwargs)
 
 
 class PrincipalSettingsBase(PrincipalMixin, SettingsBase):
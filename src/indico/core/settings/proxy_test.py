@@ -9,7 +9,9 @@ from datetime import datetime, timedelta
 
 import pytest
 import pytz
+from flask import g
 
+from indico.core import signals
 from indico.core.settings import PrefixSettingsProxy, SettingsProxy
 from indico.core.settings.converters import DatetimeConverter, EnumConverter, TimedeltaConverter
 from indico.modules.events.settings import EventSettingsProxy
@@ -103,6 +105,34 @@ def test_proxy_preload(count_queries):
     assert cnt() == 0
 
 
+@pytest.mark.usefixtures('db', 'request_context')
+def test_proxy_process_cache(count_queries):
+    def _new_request():
+        for name in ('settings_cache', 'global_settings_cache', 'settings_versions'):
+            g.pop(name, None)
+
+    proxy = SettingsProxy('test', {'foo': None})
+    assert proxy.get('foo') is None
+    _new_request()
+    with count_queries() as cnt:
+        assert proxy.get('foo') is None
+    assert cnt() == 0
+    proxy.set('foo', 'bar')
+    _new_request()
+    # uncommitted changes must never end up in the cache
+    for __ in range(2):
+        with count_queries() as cnt:
+            assert proxy.get('foo') == 'bar'
+        assert cnt() == 1
+        _new_request()
+    signals.core.after_commit.send()
+    assert proxy.get('foo') == 'bar'
+    _new_request()
+    with count_queries() as cnt:
+        assert proxy.get('foo') == 'bar'
+    assert cnt() == 0
+
+
 @pytest.mark.usefixtures('db', 'request_context')  # use req ctx so the cache is active
 def test_proxy_cache_mutable():
     proxy = SettingsProxy('test', {'foo': []})
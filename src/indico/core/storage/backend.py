@@ -5,11 +5,16 @@
 # modify it under the terms of the MIT License; see the
 # LICENSE file for more details.
 
+import mmap
 import os
+import stat
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import contextmanager
 from hashlib import md5
 from io import BytesIO
+from queue import Queue
 from tempfile import NamedTemporaryFile
+from threading import Thread
 
 from werkzeug.security import safe_join
 
@@ -46,6 +51,125 @@ def get_storage_backends():
     return named_objects_from_signal(signals.core.get_storage_backends.send(), plugin_attr='plugin')
 
 
+def _get_fileno(fileobj):
+    try:
+        return fileobj.fileno()
+    except (AttributeError, OSError):
+        return None
+
+
+def _hash_fd(fd, offset, size, checksum):
+    with mmap.mmap(fd, offset + size, access=mmap.ACCESS_READ) as data, memoryview(data) as view:
+        # hashlib releases the GIL while hashing, so this can run in parallel
+        # to the actual copying
+        checksum.update(view[offset:])
+
+
+def _copy_fd(source_fd, target_fd, size):
+    """Copy `size` bytes between two file descriptors within the kernel."""
+    copy_func = getattr(os, 'copy_file_range', None)
+    copied = 0
+    while copied < size:
+        try:
+            if copy_func is not None:
+                n = copy_func(source_fd, target_fd, size - copied)
+            else:
+                n = os.sendfile(target_fd, source_fd, None, size - copied)
+        except OSError:
+            if copied or copy_func is None:
+                raise
+            # copy_file_range is not supported for all combinations of file
+            # systems, but sendfile between regular files usually works
+            copy_func = None
+            continue
+        if not n:
+            break
+        copied += n
+    return copied
+
+
+def _copy_file_fast(source, target, checksum):
+    """Copy a file without reading it into Python if possible.
+
+    :return: Whether the file was copied.  If not, nothing has been
+             read from `source` or written to `target`.
+    """
+    if not hasattr(os, 'sendfile'):
+        return False
+    source_fd = _get_fileno(source)
+    target_fd = _get_fileno(target)
+    if source_fd is None or target_fd is None:
+        return False
+    source_stat = os.fstat(source_fd)
+    if not stat.S_ISREG(source_stat.st_mode) or not stat.S_ISREG(os.fstat(target_fd).st_mode):
+        return False
+    # make sure we start at the logical positions of the (buffered) file objects
+    offset = source.tell()
+    target.flush()
+    target_offset = target.tell()
+    os.lseek(source_fd, offset, os.SEEK_SET)
+    os.lseek(target_fd, target_offset, os.SEEK_SET)
+    size = source_stat.st_size - offset
+    if size <= 0:
+        return True
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        hashed = executor.submit(_hash_fd, source_fd, offset, size, checksum)
+        copied = _copy_fd(source_fd, target_fd, size)
+        # propagate any error from hashing, we must not store a wrong checksum
+        hashed.result()
+    if copied != size:
+        raise OSError(f'File size changed while copying ({copied} of {size} bytes copied)')
+    source.seek(offset + size)
+    target.seek(target_offset + size)
+    return True
+
+
+@contextmanager
+def _hashing_thread(checksum):
+    """Compute a checksum on a separate thread.
+
+    This yields a function which queues a chunk of data to be added to
+    the checksum.  The thread is only started once more than one chunk
+    has been queued, so small files do not incur any overhead.  Errors
+    from hashing are re-raised in the thread using the checksum.
+    """
+    # limit how far reading may get ahead of hashing
+    queue = Queue(maxsize=8)
+    thread = None
+    error = None
+
+    def _consume():
+        nonlocal error
+        while (chunk := queue.get()) is not None:
+            if error is not None:
+                # keep draining the queue so the producer never blocks
+                continue
+            try:
+                checksum.update(chunk)
+            except Exception as exc:
+                error = exc
+
+    def _update(chunk):
+        nonlocal thread
+        if error is not None:
+            raise error
+        if thread is None and not queue.empty():
+            thread = Thread(target=_consume, daemon=True)
+            thread.start()
+        queue.put(chunk)
+
+    try:
+        yield _update
+    finally:
+        queue.put(None)
+        if thread is not None:
+            thread.join()
+        else:
+            _consume()
+    if error is not None:
+        raise error
+
+
 class StorageError(Exception):
     """Exception used when a storage operation fails for any reason."""
 
@@ -94,18 +218,29 @@ class Storage:
         """Ensure that fileobj is a file-like object and not a string."""
         return BytesIO(fileobj) if not hasattr(fileobj, 'read') else fileobj
 
-    def _copy_file(self, source, target, chunk_size=1024*1024):
+    def _copy_file(self, source, target, chunk_size=1024*1024, *, checksum=None):
         """Copy a file, in chunks, from ``source`` to ``target``.
 
-        The return value will be the MD5 checksum of the file (hex).
+        If both are regular files, the data is copied by the kernel without
+        passing through Python.  Otherwise it is copied in chunks, while the
+        checksum is computed on a separate thread.
+
+        :param checksum: A :mod:`hashlib` object to use for the checksum
+                         instead of MD5.
+        :return: The hex checksum of the file (MD5 unless `checksum` is
+                 specified)
         """
-        checksum = md5()
-        while True:
-            chunk = source.read(chunk_size)
-            if not chunk:
-                break
-            target.write(chunk)
-            checksum.update(chunk)
+        if checksum is None:
+            checksum = md5(usedforsecurity=False)
+        if _copy_file_fast(source, target, checksum):
+            return checksum.hexdigest()
+        with _hashing_thread(checksum) as update_checksum:
+            while True:
+                chunk = source.read(chunk_size)
+                if not chunk:
+                    break
+                target.write(chunk)
+                update_checksum(chunk)
         return checksum.hexdigest()
 
     def open(self, file_id):  # pragma: no cover
@@ -5,6 +5,7 @@
 # modify it under the terms of the MIT License; see the
 # LICENSE file for more details.
 
+import hashlib
 import os
 from io import BytesIO
 from pathlib import Path
@@ -161,3 +162,46 @@ def test_storage_get_local_path(fs_storage):
     with storage.get_local_path(f) as path:
         assert Path(path).read_bytes() == b'hello world'
     assert not os.path.exists(path)
+
+
+@pytest.mark.parametrize('fast', (True, False))
+@pytest.mark.parametrize('size', (0, 11, 3 * 1024 * 1024 + 7))
+def test_copy_file(tmp_path, fast, size):
+    data = os.urandom(size)
+    source_path = tmp_path / 'source'
+    source_path.write_bytes(b'skipped' + data)
+    with source_path.open('rb') as source, (tmp_path / 'target').open('wb') as target:
+        source.read(7)
+        target.write(b'header')
+        if not fast:
+            source = BytesIO(source.read())
+        checksum = Storage(None)._copy_file(source, target)
+        assert source.read() == b''
+        target.write(b'footer')
+    assert (tmp_path / 'target').read_bytes() == b'header' + data + b'footer'
+    assert checksum == hashlib.md5(data).hexdigest()
+
+
+def test_copy_file_custom_checksum():
+    source = BytesIO(b'hello world')
+    checksum = Storage(None)._copy_file(source, BytesIO(), checksum=hashlib.blake2b())
+    assert checksum == hashlib.blake2b(b'hello world').hexdigest()
+
+
+def test_copy_file_fast_hash_error(tmp_path, mocker):
+    mocker.patch('indico.core.storage.backend._hash_fd', side_effect=OSError('hashing failed'))
+    (tmp_path / 'source').write_bytes(b'hello world')
+    with (tmp_path / 'source').open('rb') as source, (tmp_path / 'target').open('wb') as target:
+        with pytest.raises(OSError, match='hashing failed'):
+            Storage(None)._copy_file(source, target)
+
+
+@pytest.mark.parametrize('size', (1, 100))
+def test_copy_file_hash_error(size):
+    class FailingChecksum:
+        def update(self, data):
+            raise ValueError('hashing failed')
+
+    # with many small chunks the queue fills up, but the failed consumer must not block the copy
+    with pytest.raises(ValueError, match='hashing failed'):
+        Storage(None)._copy_file(BytesIO(b'x' * size), BytesIO(), chunk_size=1, checksum=FailingChecksum())
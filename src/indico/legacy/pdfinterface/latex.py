@@ -10,6 +10,9 @@ import functools
 import os
 import subprocess
 import tempfile
+import time
+from contextvars import ContextVar
+from datetime import timedelta
 from importlib.resources import as_file
 from importlib.resources import files as res_files
 from io import BytesIO
@@ -42,12 +45,17 @@ from indico.util import mdx_latex
 from indico.util.date_time import format_date, format_human_timedelta, format_time
 from indico.util.fs import chmod_umask
 from indico.util.i18n import _, ngettext
+from indico.util.latex import POLL_INTERVAL, RawLatex, get_max_latex_duration, latex_slot, render_cached_fragment
 from indico.util.string import render_markdown
 
 
 #: A rate limiter for PDF generation endpoints that are available publicly without logging in
 latex_rate_limiter = LocalProxy(functools.cache(lambda: make_rate_limiter('latex', config.LATEX_RATE_LIMIT)))
 cache = make_scoped_cache('latex-pdfs')
+aux_cache = make_scoped_cache('latex-aux')
+
+#: The auxiliary files which need to be stable to skip another LaTeX run
+AUX_FILE_EXTENSIONS = ('aux', 'toc', 'out')
 
 
 def generate_cached_pdf(fn, key, obj=None) -> BytesIO:
@@ -79,33 +87,72 @@ def generate_cached_pdf(fn, key, obj=None) -> BytesIO:
     if not session.user and not latex_rate_limiter.hit():
         delay = format_human_timedelta(latex_rate_limiter.get_reset_delay())
         raise TooManyRequests(f"You're doing this too fast, please try again in {delay}")
-    data = fn(obj) if obj is not None else fn()
-    cache.set(cache_key, data, cache_ttl)
+    # If the same PDF is already being generated (e.g. because many people open the link at the
+    # same time), we wait for its result instead of running LaTeX again.
+    pending_key = ('pending', *cache_key)
+    pending = cache.add(pending_key, True, get_max_latex_duration())
+    if not pending and (data := _wait_for_pending_pdf(cache_key, pending_key)) is not None:
+        return BytesIO(data)
+    try:
+        data = fn(obj) if obj is not None else fn()
+        cache.set(cache_key, data, cache_ttl)
+    finally:
+        if pending:
+            cache.delete(pending_key)
     return BytesIO(data)
 
 
+def _wait_for_pending_pdf(cache_key, pending_key):
+    deadline = time.monotonic() + get_max_latex_duration()
+    while time.monotonic() < deadline:
+        time.sleep(POLL_INTERVAL)
+        if (data := cache.get(cache_key)) is not None:
+            return data
+        elif cache.get(pending_key) is None:
+            # the other process failed to generate the PDF
+            return None
+    return None
+
+
+def _make_markdown_converter(source_dir=None):
+    """Create a function converting markdown to LaTeX.
+
+    :param source_dir: The directory containing the LaTeX sources of the
+                       document, where images are downloaded to.  If it is
+                       omitted, the converted fragments are not cached.
+    """
+    # Markdown -> LaTeX renderer
+    # safe_mode - strip out all HTML
+    md = markdown.Markdown(safe_mode='remove')
+    latex_mdx = mdx_latex.LaTeXExtension(configs={'apply_br': True, 'tmpdir': source_dir or config.TEMP_DIR})
+    latex_mdx.extendMarkdown(md, markdown.__dict__)
+
+    def _escape_latex_math(string):
+        return mdx_latex.latex_escape(string, ignore_math=True)
+
+    def _render_markdown(text):
+        return RawLatex(render_markdown(text, md=md.convert, escape_latex_math=_escape_latex_math))
+
+    def _convert_markdown(text):
+        if source_dir is None:
+            return _render_markdown(text)
+        return render_cached_fragment(text, source_dir, lambda: _render_markdown(text))
+
+    return _convert_markdown
+
+
 class PDFLaTeXBase:
     _table_of_contents = False
+    #: A key to keep the auxiliary files of a document with a TOC across builds
+    _aux_cache_key = None
     LATEX_TEMPLATE = None
 
     def __init__(self):
-        # Markdown -> LaTeX renderer
-        # safe_mode - strip out all HTML
-        md = markdown.Markdown(safe_mode='remove')
         self.source_dir = tempfile.mkdtemp(prefix='indico-texgen-', dir=config.TEMP_DIR)
-        latex_mdx = mdx_latex.LaTeXExtension(configs={'apply_br': True, 'tmpdir': self.source_dir})
-        latex_mdx.extendMarkdown(md, markdown.__dict__)
-
-        def _escape_latex_math(string):
-            return mdx_latex.latex_escape(string, ignore_math=True)
-
-        def _convert_markdown(text):
-            return RawLatex(render_markdown(text, md=md.convert, escape_latex_math=_escape_latex_math))
-
-        self._args = {'markdown': _convert_markdown}
+        self._args = {'markdown': _make_markdown_converter(self.source_dir)}
 
     def generate(self, *, as_bytes=False):
-        latex = LatexRunner(self.source_dir, has_toc=self._table_of_contents)
+        latex = LatexRunner(self.source_dir, has_toc=self._table_of_contents, aux_cache_key=self._aux_cache_key)
         filename = latex.run(self.LATEX_TEMPLATE, **self._args)
         return Path(filename).read_bytes() if as_bytes else filename
 
@@ -166,22 +213,58 @@ class LatexEscapeExtension(Extension):
             yield token
 
 
-class RawLatex(str):
-    pass
-
-
 def _latex_escape(s, ignore_braces=False):
     if not isinstance(s, str) or isinstance(s, RawLatex):
         return s
     return RawLatex(mdx_latex.latex_escape(s, ignore_braces=ignore_braces))
 
 
+#: The markdown converter of the document that is currently being rendered
+_markdown_converter = ContextVar('latex_markdown_converter', default=None)
+
+
+def _markdown_filter(text):
+    # templates rendered outside a document (e.g. in a shell) get a converter
+    # which does not cache anything
+    converter = _markdown_converter.get() or _make_markdown_converter()
+    return converter(text)
+
+
+@functools.cache
+def _get_latex_env():
+    # The environment is shared by all documents so templates are only
+    # compiled once; anything specific to a document is passed when
+    # rendering it.
+    template_dir = os.path.join(get_root_path('indico'), 'legacy/pdfinterface/latex_templates')
+    env = Environment(loader=FileSystemLoader(template_dir),
+                      autoescape=False,  # noqa: S701
+                      trim_blocks=True,
+                      keep_trailing_newline=True,
+                      auto_reload=config.DEBUG,
+                      extensions=[LatexEscapeExtension],
+                      undefined=StrictUndefined,
+                      block_start_string=r'\JINJA{', block_end_string='}',
+                      variable_start_string=r'\VAR{', variable_end_string='}',
+                      comment_start_string=r'\#{', comment_end_string='}')
+    env.filters['format_date'] = format_date
+    env.filters['format_time'] = format_time
+    env.filters['format_duration'] = lambda delta: format_human_timedelta(delta, 'minutes')
+    env.filters['latex'] = _latex_escape
+    env.filters['rawlatex'] = RawLatex
+    env.filters['markdown'] = _markdown_filter
+    env.globals['_'] = _
+    env.globals['ngettext'] = ngettext
+    env.globals['session'] = session
+    return env
+
+
 class LatexRunner:
     """Handle the PDF generation from a chosen LaTeX template."""
 
-    def __init__(self, source_dir, has_toc=False):
+    def __init__(self, source_dir, has_toc=False, aux_cache_key=None):
         self.source_dir = source_dir
         self.has_toc = has_toc
+        self.aux_cache_key = aux_cache_key
 
     def run_latex(self, source_file, log_file=None):
         pdflatex_cmd = [config.XELATEX_PATH,
@@ -197,10 +280,14 @@ class LatexRunner:
                 stdout=log_file,
                 stderr=subprocess.STDOUT,
                 cwd=self.source_dir,
-                env=dict(os.environ, TEXMFCNF=f'{os.path.dirname(__file__)}:')
+                env=dict(os.environ, TEXMFCNF=f'{os.path.dirname(__file__)}:'),
+                timeout=config.LATEX_TIMEOUT
             )
             Logger.get('pdflatex').debug('PDF created successfully!')
 
+        except subprocess.TimeoutExpired:
+            Logger.get('pdflatex').error('PDF creation of %s timed out after %ds', source_file, config.LATEX_TIMEOUT)
+            raise
         except subprocess.CalledProcessError:
             Logger.get('pdflatex').debug('PDF creation possibly failed (non-zero exit code)!')
             # Only fail if we are in strict mode
@@ -211,28 +298,12 @@ class LatexRunner:
                 raise
 
     def _render_template(self, template_name, kwargs):
-        template_dir = os.path.join(get_root_path('indico'), 'legacy/pdfinterface/latex_templates')
-        env = Environment(loader=FileSystemLoader(template_dir),
-                          autoescape=False,  # noqa: S701
-                          trim_blocks=True,
-                          keep_trailing_newline=True,
-                          auto_reload=config.DEBUG,
-                          extensions=[LatexEscapeExtension],
-                          undefined=StrictUndefined,
-                          block_start_string=r'\JINJA{', block_end_string='}',
-                          variable_start_string=r'\VAR{', variable_end_string='}',
-                          comment_start_string=r'\#{', comment_end_string='}')
-        env.filters['format_date'] = format_date
-        env.filters['format_time'] = format_time
-        env.filters['format_duration'] = lambda delta: format_human_timedelta(delta, 'minutes')
-        env.filters['latex'] = _latex_escape
-        env.filters['rawlatex'] = RawLatex
-        env.filters['markdown'] = kwargs.pop('markdown')
-        env.globals['_'] = _
-        env.globals['ngettext'] = ngettext
-        env.globals['session'] = session
-        template = env.get_or_select_template(template_name)
-        return template.render(font_dir='fonts/', **kwargs)
+        template = _get_latex_env().get_or_select_template(template_name)
+        token = _markdown_converter.set(kwargs.pop('markdown'))
+        try:
+            return template.render(font_dir='fonts/', **kwargs)
+        finally:
+            _markdown_converter.reset(token)
 
     def prepare(self, template_name, **kwargs):
         chmod_umask(self.source_dir, execute=True)
@@ -254,9 +325,13 @@ class LatexRunner:
         log_filename = os.path.join(self.source_dir, 'output.log')
         log_file = open(log_filename, 'a+')  # noqa: SIM115
         try:
-            self.run_latex(source_filename, log_file)
-            if self.has_toc:
+            seeded_aux = self._restore_aux_files(source_filename) if self.has_toc else None
+            with latex_slot():
                 self.run_latex(source_filename, log_file)
+                if self.has_toc and self._read_aux_files(source_filename) != seeded_aux:
+                    self.run_latex(source_filename, log_file)
+            if self.has_toc and self.aux_cache_key:
+                aux_cache.set(self.aux_cache_key, self._read_aux_files(source_filename), timedelta(days=7))
         finally:
             log_file.close()
 
@@ -266,6 +341,25 @@ class LatexRunner:
 
         return target_filename
 
+    def _read_aux_files(self, source_filename):
+        base = os.path.splitext(source_filename)[0]
+        return {ext: Path(f'{base}.{ext}').read_bytes() for ext in AUX_FILE_EXTENSIONS
+                if os.path.exists(f'{base}.{ext}')}
+
+    def _restore_aux_files(self, source_filename):
+        """Restore the auxiliary files from a previous build of the document.
+
+        If the document did not change in a way that affects e.g. the page
+        numbers in the table of contents, the auxiliary files written by the
+        first LaTeX run are identical and a second run is not needed.
+        """
+        if not self.aux_cache_key or not (files := aux_cache.get(self.aux_cache_key)):
+            return None
+        base = os.path.splitext(source_filename)[0]
+        for ext, data in files.items():
+            Path(f'{base}.{ext}').write_bytes(data)
+        return files
+
 
 def extract_affiliations(contrib):
     affiliations = {}
@@ -517,5 +611,6 @@ class AbstractBook(ContributionBook):
     def __init__(self, event, tz=None):
         sort_by = boa_settings.get(event, 'sort_by')
         super().__init__(event, None, sort_by=sort_by)
+        self._aux_cache_key = f'boa-{event.id}'
         self._args['show_ids'] = boa_settings.get(event, 'show_abstract_ids')
         self._args['url'] = None
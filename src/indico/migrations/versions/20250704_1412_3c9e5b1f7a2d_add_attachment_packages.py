@@ -0,0 +1,38 @@
+"""Add attachment packages table
+
+Revision ID: 3c9e5b1f7a2d
+Revises: 6fac01c501b6
+Create Date: 2025-07-04 14:12:31.518204
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+from indico.core.db.sqlalchemy import UTCDateTime
+
+
+# revision identifiers, used by Alembic.
+revision = '3c9e5b1f7a2d'
+down_revision = '6fac01c501b6'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'packages',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('key', sa.String(), nullable=False, index=True, unique=True),
+        sa.Column('event_id', sa.Integer(), nullable=False, index=True),
+        sa.Column('file_id', sa.Integer(), nullable=False, index=True, unique=True),
+        sa.Column('created_dt', UTCDateTime, nullable=False),
+        sa.Column('last_used_dt', UTCDateTime, nullable=False, index=True),
+        sa.ForeignKeyConstraint(['event_id'], ['events.events.id']),
+        sa.ForeignKeyConstraint(['file_id'], ['indico.files.id']),
+        sa.PrimaryKeyConstraint('id'),
+        schema='attachments'
+    )
+
+
+def downgrade():
+    op.drop_table('packages', schema='attachments')
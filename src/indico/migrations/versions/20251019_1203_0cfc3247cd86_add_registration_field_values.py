@@ -0,0 +1,56 @@
+"""Add registration field values table
+
+Revision ID: 0cfc3247cd86
+Revises: 3c9e5b1f7a2d
+Create Date: 2025-10-19 12:03:47.215031
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '0cfc3247cd86'
+down_revision = '3c9e5b1f7a2d'
+branch_labels = None
+depends_on = None
+
+
+def _populate(input_types, values_sql):
+    input_types = ', '.join(f"'{input_type}'" for input_type in input_types)
+    op.execute(f'''
+        INSERT INTO event_registration.field_values (registration_id, field_id, value)
+        SELECT DISTINCT rd.registration_id, fd.field_id, v.value
+        FROM event_registration.registration_data rd
+        JOIN event_registration.form_field_data fd ON (fd.id = rd.field_data_id)
+        JOIN event_registration.form_items fi ON (fi.id = fd.field_id)
+        CROSS JOIN LATERAL ({values_sql}) v(value)
+        WHERE fi.input_type IN ({input_types}) AND v.value IS NOT NULL
+        ON CONFLICT DO NOTHING;
+    ''')  # noqa: S608
+
+
+def upgrade():
+    op.create_table(
+        'field_values',
+        sa.Column('registration_id', sa.Integer(), nullable=False, autoincrement=False),
+        sa.Column('field_id', sa.Integer(), nullable=False, autoincrement=False),
+        sa.Column('value', sa.String(), nullable=False),
+        sa.ForeignKeyConstraint(['field_id'], ['event_registration.form_items.id']),
+        sa.ForeignKeyConstraint(['registration_id'], ['event_registration.registrations.id']),
+        sa.PrimaryKeyConstraint('registration_id', 'field_id', 'value'),
+        schema='event_registration'
+    )
+    op.create_index(None, 'field_values', ['field_id', 'value'], unique=False, schema='event_registration')
+    _populate(['single_choice', 'multi_choice'],
+              '''SELECT jsonb_object_keys(CASE WHEN jsonb_typeof(rd.data) = 'object' THEN rd.data ELSE '{}' END)''')
+    _populate(['sessions'],
+              '''SELECT jsonb_array_elements_text(CASE WHEN jsonb_typeof(rd.data) = 'array' THEN rd.data ELSE '[]' END)''')
+    _populate(['accommodation'],
+              '''SELECT CASE WHEN jsonb_typeof(rd.data) = 'object' THEN NULLIF(rd.data ->> 'choice', '') END''')
+    _populate(['checkbox', 'bool', 'country'],
+              '''SELECT CASE WHEN jsonb_typeof(rd.data) IN ('string', 'number', 'boolean') THEN rd.data #>> '{}' END''')
+
+
+def downgrade():
+    op.drop_table('field_values', schema='event_registration')
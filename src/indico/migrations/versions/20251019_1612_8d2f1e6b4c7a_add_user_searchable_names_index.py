@@ -0,0 +1,27 @@
+"""Add user searchable names index
+
+Revision ID: 8d2f1e6b4c7a
+Revises: 0cfc3247cd86
+Create Date: 2025-10-19 16:12:08.349127
+"""
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '8d2f1e6b4c7a'
+down_revision = '0cfc3247cd86'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.execute('''
+        CREATE INDEX ix_users_searchable_names_unaccent
+        ON users.users
+        USING gin (indico.indico_unaccent(lower(((((((first_name)::text || ' '::text) || (last_name)::text) || '|||'::text) || (last_name)::text) || ' '::text) || (first_name)::text))) gin_trgm_ops);
+    ''')
+
+
+def downgrade():
+    op.drop_index('ix_users_searchable_names_unaccent', table_name='users', schema='users')
@@ -0,0 +1,52 @@
+"""Add search vectors to log entries
+
+Revision ID: 5b7e2c9d1a43
+Revises: 8d2f1e6b4c7a
+Create Date: 2025-10-19 18:40:12.583104
+"""
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = '5b7e2c9d1a43'
+down_revision = '8d2f1e6b4c7a'
+branch_labels = None
+depends_on = None
+
+
+SEARCH_VECTOR_SQL = '''
+    to_tsvector('simple'::regconfig, indico.indico_unaccent(
+        module || ' ' || type || ' ' || summary || ' ' ||
+        coalesce(data ->> 'subject', '') || ' ' || coalesce(data ->> 'from', '') || ' ' ||
+        coalesce(data ->> 'to', '') || ' ' || coalesce(data ->> 'cc', '') || ' ' ||
+        left(coalesce(data ->> 'body', ''), 100000)
+    ))
+'''
+
+log_tables = {
+    'events': 'event_id',
+    'categories': 'category_id',
+    'users': 'target_user_id',
+    'indico': None,
+}
+
+
+def upgrade():
+    for schema, link_column in log_tables.items():
+        op.add_column('logs', sa.Column('search_vector', postgresql.TSVECTOR(),
+                                        sa.Computed(SEARCH_VECTOR_SQL, persisted=True), nullable=True),
+                      schema=schema)
+        op.create_index(None, 'logs', ['search_vector'], unique=False, schema=schema, postgresql_using='gin')
+        sort_columns = ([link_column] if link_column else []) + ['logged_dt', 'id']
+        op.create_index(None, 'logs', sort_columns, unique=False, schema=schema)
+
+
+def downgrade():
+    for schema, link_column in log_tables.items():
+        sort_columns = ([link_column] if link_column else []) + ['logged_dt', 'id']
+        op.drop_index('ix_logs_{}'.format('_'.join(sort_columns)), table_name='logs', schema=schema)
+        op.drop_index('ix_logs_search_vector', table_name='logs', schema=schema)
+        op.drop_column('logs', 'search_vector', schema=schema)
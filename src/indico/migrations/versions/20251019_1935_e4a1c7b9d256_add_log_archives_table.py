@@ -0,0 +1,53 @@
+"""Add log archives table
+
+Revision ID: e4a1c7b9d256
+Revises: 5b7e2c9d1a43
+Create Date: 2025-10-19 19:35:08.416732
+"""
+
+from enum import Enum
+
+import sqlalchemy as sa
+from alembic import op
+
+from indico.core.db.sqlalchemy import PyIntEnum, UTCDateTime
+
+
+# revision identifiers, used by Alembic.
+revision = 'e4a1c7b9d256'
+down_revision = '5b7e2c9d1a43'
+branch_labels = None
+depends_on = None
+
+
+class _LogArchiveType(int, Enum):
+    event = 1
+    category = 2
+    user = 3
+    app = 4
+
+
+def upgrade():
+    op.create_table(
+        'log_archives',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('type', PyIntEnum(_LogArchiveType), nullable=False),
+        sa.Column('object_id', sa.Integer(), nullable=True),
+        sa.Column('start_dt', UTCDateTime, nullable=False),
+        sa.Column('end_dt', UTCDateTime, nullable=False),
+        sa.Column('entry_count', sa.Integer(), nullable=False),
+        sa.Column('filename', sa.String(), nullable=False),
+        sa.Column('content_type', sa.String(), nullable=False),
+        sa.Column('size', sa.BigInteger(), nullable=False),
+        sa.Column('md5', sa.String(), nullable=False),
+        sa.Column('storage_backend', sa.String(), nullable=False),
+        sa.Column('storage_file_id', sa.String(), nullable=False),
+        sa.Column('created_dt', UTCDateTime, nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+        schema='indico'
+    )
+    op.create_index(None, 'log_archives', ['type', 'object_id', 'start_dt'], unique=False, schema='indico')
+
+
+def downgrade():
+    op.drop_table('log_archives', schema='indico')
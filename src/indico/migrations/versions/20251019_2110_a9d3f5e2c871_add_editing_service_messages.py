@@ -0,0 +1,41 @@
+"""Add editing service messages table
+
+Revision ID: a9d3f5e2c871
+Revises: e4a1c7b9d256
+Create Date: 2025-10-19 21:10:44.902317
+"""
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+from indico.core.db.sqlalchemy import UTCDateTime
+
+
+# revision identifiers, used by Alembic.
+revision = 'a9d3f5e2c871'
+down_revision = 'e4a1c7b9d256'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'service_messages',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('event_id', sa.Integer(), nullable=False, index=True),
+        sa.Column('method', sa.String(), nullable=False),
+        sa.Column('path', sa.String(), nullable=False),
+        sa.Column('payload', postgresql.JSONB(astext_type=sa.Text()), nullable=True),
+        sa.Column('created_dt', UTCDateTime, nullable=False),
+        sa.Column('next_attempt_dt', UTCDateTime, nullable=False, index=True),
+        sa.Column('attempts', sa.Integer(), nullable=False),
+        sa.Column('last_error', sa.String(), nullable=True),
+        sa.ForeignKeyConstraint(['event_id'], ['events.events.id']),
+        sa.PrimaryKeyConstraint('id'),
+        schema='event_editing'
+    )
+
+
+def downgrade():
+    op.drop_table('service_messages', schema='event_editing')
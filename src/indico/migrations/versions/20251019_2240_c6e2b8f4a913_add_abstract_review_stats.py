@@ -0,0 +1,80 @@
+"""Add abstract review stats
+
+Revision ID: c6e2b8f4a913
+Revises: a9d3f5e2c871
+Create Date: 2025-10-19 22:40:17.318520
+"""
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = 'c6e2b8f4a913'
+down_revision = 'a9d3f5e2c871'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('abstracts', sa.Column('score', sa.Float(), nullable=True), schema='event_abstracts')
+    op.add_column('abstracts', sa.Column('review_count', sa.Integer(), nullable=False, server_default='0'),
+                  schema='event_abstracts')
+    op.add_column('abstracts', sa.Column('review_stats', postgresql.JSONB(astext_type=sa.Text()), nullable=False,
+                                         server_default='{}'),
+                  schema='event_abstracts')
+    op.alter_column('abstracts', 'review_count', server_default=None, schema='event_abstracts')
+    op.alter_column('abstracts', 'review_stats', server_default=None, schema='event_abstracts')
+    op.execute('''
+        WITH ratings AS (
+            SELECT r.id AS review_id, r.abstract_id, r.track_id, rt.question_id, (rt.value #>> '{}')::float AS value
+            FROM event_abstracts.abstract_reviews r
+            JOIN event_abstracts.abstract_review_ratings rt ON rt.review_id = r.id
+            JOIN event_abstracts.abstract_review_questions q ON q.id = rt.question_id
+            WHERE q.field_type = 'rating' AND NOT q.no_score AND NOT q.is_deleted AND jsonb_typeof(rt.value) = 'number'
+        ), review_scores AS (
+            SELECT r.abstract_id, r.track_id, avg(ratings.value) AS score
+            FROM event_abstracts.abstract_reviews r
+            LEFT JOIN ratings ON ratings.review_id = r.id
+            GROUP BY r.id
+        ), question_scores AS (
+            SELECT abstract_id, track_id, jsonb_object_agg(question_id::text, score) AS scores
+            FROM (
+                SELECT abstract_id, track_id, question_id, avg(value) AS score
+                FROM ratings
+                WHERE track_id IS NOT NULL
+                GROUP BY abstract_id, track_id, question_id
+            ) x
+            GROUP BY abstract_id, track_id
+        ), track_stats AS (
+            SELECT ts.abstract_id, jsonb_object_agg(ts.track_id::text, jsonb_build_object(
+                'review_count', ts.review_count,
+                'score', ts.score,
+                'question_scores', coalesce(qs.scores, '{}')
+            )) AS stats
+            FROM (
+                SELECT abstract_id, track_id, count(*) AS review_count, avg(score) AS score
+                FROM review_scores
+                WHERE track_id IS NOT NULL
+                GROUP BY abstract_id, track_id
+            ) ts
+            LEFT JOIN question_scores qs ON qs.abstract_id = ts.abstract_id AND qs.track_id = ts.track_id
+            GROUP BY ts.abstract_id
+        ), abstract_stats AS (
+            SELECT abstract_id, count(*) AS review_count, avg(score) AS score
+            FROM review_scores
+            GROUP BY abstract_id
+        )
+        UPDATE event_abstracts.abstracts a
+        SET score = s.score, review_count = s.review_count, review_stats = coalesce(ts.stats, '{}')
+        FROM abstract_stats s
+        LEFT JOIN track_stats ts ON ts.abstract_id = s.abstract_id
+        WHERE a.id = s.abstract_id;
+    ''')
+
+
+def downgrade():
+    op.drop_column('abstracts', 'review_stats', schema='event_abstracts')
+    op.drop_column('abstracts', 'review_count', schema='event_abstracts')
+    op.drop_column('abstracts', 'score', schema='event_abstracts')
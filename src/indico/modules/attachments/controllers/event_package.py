@@ -6,6 +6,8 @@
 # LICENSE file for more details.
 
 import functools
+import hashlib
+import json
 import os
 
 from celery.exceptions import TimeoutError
@@ -25,6 +27,7 @@ from indico.modules.attachments.forms import AttachmentPackageForm
 from indico.modules.attachments.models.attachments import Attachment, AttachmentFile, AttachmentType
 from indico.modules.attachments.models.folders import AttachmentFolder
 from indico.modules.attachments.tasks import generate_materials_package
+from indico.modules.attachments.util import get_cached_attachment_package
 from indico.modules.core.captcha import invalidate_captcha
 from indico.modules.events.contributions.models.contributions import Contribution
 from indico.modules.events.contributions.models.subcontributions import SubContribution
@@ -143,6 +146,15 @@ class AttachmentPackageGeneratorMixin(ZipGeneratorMixin):
         for attachment in attachments:
             yield attachment.file
 
+    def _get_package_key(self, attachments):
+        """Get a key identifying the contents of a material package.
+
+        Packages with the same key contain the same files at the same
+        paths, so a cached package can be used instead of building it.
+        """
+        entries = sorted((name, item.id, item.md5) for name, item in self._iter_named_items(attachments))
+        return hashlib.sha256(json.dumps([self.event.id, entries]).encode()).hexdigest()
+
     def _prepare_folder_structure(self, item):
         attachment = item.attachment
         event_dir = secure_filename(self.event.title, None)
@@ -205,8 +217,13 @@ class AttachmentPackageMixin(AttachmentPackageGeneratorMixin):
     def _process(self):
         form = self._prepare_form()
         if form.validate_on_submit():
-            attachments = [attachment.id for attachment in self._filter_attachments(form.data)]
+            attachments = self._filter_attachments(form.data)
             if attachments:
+                if package := get_cached_attachment_package(self._get_package_key(attachments)):
+                    # serving a cached package is cheap, so there is no need to rate-limit it
+                    if self.should_show_captcha:
+                        invalidate_captcha()
+                    return jsonify(download_url=package.file.signed_download_url, success=True)
                 if self.should_apply_rate_limit:
                     # only increment the rate limit if the user is not a manager, so we don't annoy event managers
                     # who use the button in the display view for some reason, instead of doing it via the management
@@ -215,7 +232,7 @@ class AttachmentPackageMixin(AttachmentPackageGeneratorMixin):
                         delay = format_human_timedelta(material_package_rate_limiter.get_reset_delay())
                         raise TooManyRequests(f"You're doing this too fast, please try again in {delay}")
                     invalidate_captcha()
-                task = generate_materials_package.delay(attachments, self.event)
+                task = generate_materials_package.delay([attachment.id for attachment in attachments], self.event)
                 return jsonify(task_id=task.id, success=True)
             else:
                 flash(_('There are no materials matching your criteria.'), 'warning')
@@ -0,0 +1,46 @@
+# This file is part of Indico.
+# Copyright (C) 2002 - 2025 CERN
+#
+# Indico is free software; you can redistribute it and/or
+# modify it under the terms of the MIT License; see the
+# LICENSE file for more details.
+
+from unittest.mock import MagicMock
+
+from flask import session
+
+from indico.modules.attachments.controllers.display.event import RHPackageEventAttachmentsDisplay
+from indico.modules.attachments.controllers.event_package import AttachmentPackageGeneratorMixin
+from indico.modules.attachments.models.packages import AttachmentPackage
+
+
+def test_package_key(dummy_event, dummy_attachment):
+    mixin = AttachmentPackageGeneratorMixin()
+    mixin.event = dummy_event
+    key = mixin._get_package_key([dummy_attachment])
+    assert mixin._get_package_key([dummy_attachment]) == key
+    # different content
+    dummy_attachment.file.md5 = '0' * 32
+    changed_key = mixin._get_package_key([dummy_attachment])
+    assert changed_key != key
+    # different path within the archive
+    dummy_attachment.folder.title = 'Slides'
+    assert mixin._get_package_key([dummy_attachment]) not in {key, changed_key}
+
+
+def test_package_cache_hit(db, mocker, request_context, dummy_event, dummy_attachment, create_user, create_file):
+    delay = mocker.patch('indico.modules.attachments.controllers.event_package.generate_materials_package.delay')
+    limiter = mocker.patch('indico.modules.attachments.controllers.event_package.material_package_rate_limiter')
+    session.set_session_user(create_user(123))
+    rh = RHPackageEventAttachmentsDisplay()
+    rh.event = dummy_event
+    rh._prepare_form = MagicMock(return_value=MagicMock(validate_on_submit=MagicMock(return_value=True)))
+    rh._filter_attachments = MagicMock(return_value=[dummy_attachment])
+    file = create_file('material-package.zip', 'application/zip', 'test', 'package', claimed=True)
+    db.session.add(AttachmentPackage(key=rh._get_package_key([dummy_attachment]), event=dummy_event, file=file))
+    db.session.flush()
+    assert rh.should_apply_rate_limit
+    resp = rh._process()
+    assert resp.json == {'download_url': file.signed_download_url, 'success': True}
+    assert not delay.called
+    assert not limiter.hit.called
@@ -11,7 +11,7 @@ from flask import g
 from sqlalchemy.event import listens_for
 from sqlalchemy.ext.associationproxy import association_proxy
 from sqlalchemy.ext.declarative import declared_attr
-from sqlalchemy.orm import joinedload
+from sqlalchemy.orm import joinedload, selectinload
 
 from indico.core.db import db
 from indico.core.db.sqlalchemy.links import LinkMixin, LinkType
@@ -198,6 +198,7 @@ class AttachmentFolder(LinkMixin, ProtectionMixin, db.Model):
                      .filter_by(is_deleted=False)
                      .order_by(AttachmentFolder.is_default.desc(), db.func.lower(AttachmentFolder.title))
                      .options(joinedload(AttachmentFolder.attachments),
+                              selectinload(AttachmentFolder.acl_entries),
                               joinedload(AttachmentFolder.linked_event),
                               joinedload(AttachmentFolder.session),
                               joinedload(AttachmentFolder.contribution),
@@ -0,0 +1,78 @@
+# This file is part of Indico.
+# Copyright (C) 2002 - 2025 CERN
+#
+# Indico is free software; you can redistribute it and/or
+# modify it under the terms of the MIT License; see the
+# LICENSE file for more details.
+
+from indico.core.db import db
+from indico.core.db.sqlalchemy import UTCDateTime
+from indico.util.date_time import now_utc
+from indico.util.string import format_repr
+
+
+class AttachmentPackage(db.Model):
+    """A generated material package kept around for reuse.
+
+    The key is a hash of the package contents, so any request resulting
+    in the same set of files can be served with the existing archive.
+    """
+
+    __tablename__ = 'packages'
+    __table_args__ = {'schema': 'attachments'}
+
+    id = db.Column(
+        db.Integer,
+        primary_key=True
+    )
+    #: The content hash identifying the package
+    key = db.Column(
+        db.String,
+        nullable=False,
+        unique=True,
+        index=True
+    )
+    event_id = db.Column(
+        db.ForeignKey('events.events.id'),
+        nullable=False,
+        index=True
+    )
+    file_id = db.Column(
+        db.ForeignKey('indico.files.id'),
+        nullable=False,
+        unique=True,
+        index=True
+    )
+    created_dt = db.Column(
+        UTCDateTime,
+        nullable=False,
+        default=now_utc
+    )
+    #: The last time the package has been requested
+    last_used_dt = db.Column(
+        UTCDateTime,
+        nullable=False,
+        default=now_utc,
+        index=True
+    )
+
+    event = db.relationship(
+        'Event',
+        lazy=True,
+        backref=db.backref(
+            'attachment_packages',
+            lazy='dynamic'
+        )
+    )
+    file = db.relationship(
+        'File',
+        lazy=False,
+        backref=db.backref(
+            'attachment_package',
+            lazy=True,
+            uselist=False
+        )
+    )
+
+    def __repr__(self):
+        return format_repr(self, 'id', 'event_id', 'file_id', _text=self.key)
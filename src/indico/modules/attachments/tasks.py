@@ -7,24 +7,68 @@
 
 import os
 
+from celery.schedules import crontab
+from sqlalchemy.exc import IntegrityError
+
 from indico.core.celery import celery
 from indico.core.config import config
 from indico.core.db import db
+from indico.modules.attachments import logger
 from indico.modules.attachments.models.attachments import Attachment
+from indico.modules.attachments.models.packages import AttachmentPackage
+from indico.modules.attachments.util import get_cached_attachment_package
 from indico.modules.files.models.files import File
 
 
+def _cache_package(key, event, file):
+    db.session.flush()
+    try:
+        with db.session.begin_nested():
+            db.session.add(AttachmentPackage(key=key, event=event, file=file))
+    except IntegrityError:
+        # the same package has been built concurrently; just keep this copy
+        # unclaimed so it gets deleted like an uncached package
+        logger.info('Material package %s has already been cached', key)
+        return
+    file.claimed = True
+
+
 @celery.task(ignore_result=False)
 def generate_materials_package(attachment_ids, event):
     from indico.modules.attachments.controllers.event_package import AttachmentPackageGeneratorMixin
     attachments = Attachment.query.filter(Attachment.id.in_(attachment_ids)).all()
     attachment_package_mixin = AttachmentPackageGeneratorMixin()
     attachment_package_mixin.event = event
+    key = attachment_package_mixin._get_package_key(attachments)
+    if package := get_cached_attachment_package(key):
+        db.session.commit()
+        return package.file.signed_download_url
     generated_zip = attachment_package_mixin._generate_zip_file(attachments, return_file=True)
     f = File(filename='material-package.zip', content_type='application/zip', meta={'event_id': event.id})
     context = ('event', event.id, 'attachment-package')
     f.save(context, generated_zip, backend=config.STATIC_SITE_STORAGE)
     db.session.add(f)
+    if config.MATERIAL_PACKAGE_CACHE_SIZE:
+        _cache_package(key, event, f)
     db.session.commit()
     os.unlink(generated_zip.name)
     return f.signed_download_url
+
+
+@celery.periodic_task(name='prune_attachment_packages', run_every=crontab(minute='15'))
+def prune_attachment_packages():
+    """Evict the least recently used packages exceeding the cache size."""
+    max_size = config.MATERIAL_PACKAGE_CACHE_SIZE * 1024 * 1024
+    query = (AttachmentPackage.query
+             .join(AttachmentPackage.file)
+             .order_by(AttachmentPackage.last_used_dt.desc(), AttachmentPackage.id.desc()))
+    total_size = 0
+    for package in query:
+        total_size += package.file.size
+        if total_size <= max_size:
+            continue
+        logger.info('Evicting %r from the material package cache', package)
+        # the file itself is removed by the `delete_unclaimed_files` task
+        package.file.claimed = False
+        db.session.delete(package)
+    db.session.commit()
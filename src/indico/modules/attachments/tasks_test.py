@@ -0,0 +1,45 @@
+# This file is part of Indico.
+# Copyright (C) 2002 - 2025 CERN
+#
+# Indico is free software; you can redistribute it and/or
+# modify it under the terms of the MIT License; see the
+# LICENSE file for more details.
+
+from datetime import timedelta
+
+from indico.modules.attachments.models.packages import AttachmentPackage
+from indico.modules.attachments.tasks import _cache_package, prune_attachment_packages
+from indico.util.date_time import now_utc
+
+
+def test_cache_package(db, dummy_event, create_file):
+    file = create_file('material-package.zip', 'application/zip', 'test', 'package')
+    _cache_package('key', dummy_event, file)
+    assert file.claimed
+    assert file.attachment_package.key == 'key'
+
+
+def test_cache_package_race(db, dummy_event, create_file):
+    cached_file = create_file('material-package.zip', 'application/zip', 'test', 'package')
+    _cache_package('key', dummy_event, cached_file)
+    # the same package has been built concurrently
+    file = create_file('material-package.zip', 'application/zip', 'test', 'package')
+    _cache_package('key', dummy_event, file)
+    assert not file.claimed
+    assert cached_file.claimed
+    assert AttachmentPackage.query.one().file == cached_file
+
+
+def test_prune_attachment_packages(db, dummy_event, create_file, patch_indico_config):
+    patch_indico_config('MATERIAL_PACKAGE_CACHE_SIZE', 1)
+    files = []
+    for i in range(4):
+        file = create_file('material-package.zip', 'application/zip', 'test', 'x' * 400 * 1024)
+        _cache_package(f'key-{i}', dummy_event, file)
+        file.attachment_package.last_used_dt = now_utc() - timedelta(hours=i)
+        files.append(file)
+    db.session.flush()
+    prune_attachment_packages()
+    # only the two most recently used packages fit into 1 MB
+    assert [f.claimed for f in files] == [True, True, False, False]
+    assert {p.key for p in AttachmentPackage.query} == {'key-0', 'key-1'}
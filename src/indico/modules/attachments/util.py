@@ -7,7 +7,9 @@
 
 from flask import session
 
+from indico.core.config import config
 from indico.core.db import db
+from indico.util.date_time import now_utc
 from indico.util.signals import make_interceptable
 
 
@@ -96,6 +98,22 @@ def can_generate_attachment_package(event, user):
             return event.can_manage(user)
 
 
+def get_cached_attachment_package(key):
+    """Get a cached material package and mark it as recently used.
+
+    :param key: The content key of the package
+    :return: An `AttachmentPackage` or ``None`` if there is no such
+             package or caching is disabled.
+    """
+    from indico.modules.attachments.models.packages import AttachmentPackage
+    if not config.MATERIAL_PACKAGE_CACHE_SIZE:
+        return None
+    package = AttachmentPackage.query.filter_by(key=key).first()
+    if package is not None:
+        package.last_used_dt = now_utc()
+    return package
+
+
 def get_default_folder_names():
     return [
         'Agenda',
@@ -30,7 +30,7 @@ from indico.modules.categories.controllers.util import (get_category_view_params
                                                         group_by_month, make_format_event_date_func,
                                                         make_happening_now_func, make_is_recent_func)
 from indico.modules.categories.models.categories import Category
-from indico.modules.categories.serialize import (serialize_categories_ical, serialize_category, serialize_category_atom,
+from indico.modules.categories.serialize import (iter_categories_ical, serialize_category, serialize_category_atom,
                                                  serialize_category_chain)
 from indico.modules.categories.util import get_category_stats, get_upcoming_events
 from indico.modules.categories.views import WPCategory, WPCategoryCalendar
@@ -51,7 +51,7 @@ from indico.util.signals import values_from_signal
 from indico.util.string import crc32
 from indico.web.args import use_kwargs
 from indico.web.flask.templating import get_template_module
-from indico.web.flask.util import send_file, url_for
+from indico.web.flask.util import send_file, send_stream, url_for
 from indico.web.rh import RH, allow_signed_url
 from indico.web.util import jsonify_data
 
@@ -356,9 +356,9 @@ class RHShowPastEventsInCategory(RHShowEventsInCategoryBase):
 class RHExportCategoryICAL(RHDisplayCategoryBase):
     def _process(self):
         filename = f'{secure_filename(self.category.title, str(self.category.id))}-category.ics'
-        buf = serialize_categories_ical([self.category.id], session.user,
-                                        Event.end_dt >= (now_utc() - timedelta(weeks=4)))
-        return send_file(filename, buf, 'text/calendar')
+        chunks = iter_categories_ical([self.category.id], session.user,
+                                      Event.end_dt >= (now_utc() - timedelta(weeks=4)))
+        return send_stream(filename, chunks, 'text/calendar', inline=True)
 
 
 class RHExportCategoryAtom(RHDisplayCategoryBase):
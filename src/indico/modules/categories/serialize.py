@@ -6,14 +6,16 @@
 # LICENSE file for more details.
 
 from io import BytesIO
+from itertools import batched
 
 from feedgen.feed import FeedGenerator
 from flask import session
 from sqlalchemy.orm import joinedload, load_only, subqueryload, undefer
 
+from indico.core.db import db
 from indico.modules.categories import Category
 from indico.modules.events import Event
-from indico.modules.events.ical import events_to_ical
+from indico.modules.events.ical import iter_events_ical
 from indico.modules.events.settings import event_contact_settings
 from indico.util.string import sanitize_html
 
@@ -30,39 +32,59 @@ def serialize_categories_ical(category_ids, user, event_filter=True, event_filte
     :param update_query: A callable that can update the query used to retrieve the events.
                          Must return the updated query object.
     """
+    return BytesIO(b''.join(iter_categories_ical(category_ids, user, event_filter, event_filter_fn, update_query)))
+
+
+def iter_categories_ical(category_ids, user, event_filter=True, event_filter_fn=None, update_query=None,
+                         batch_size=250):
+    """Export the events in a category to iCal while loading them.
+
+    This takes the same arguments as `serialize_categories_ical` but
+    yields the iCalendar data in chunks.  Only the IDs of the events
+    are loaded upfront; the events themselves are loaded in batches
+    of `batch_size` events, so the memory usage does not depend on
+    the number of events in the categories.
+    """
+    id_query = (db.session.query(Event.id)
+                .filter(Event.category_chain_overlaps(category_ids),
+                        ~Event.is_deleted,
+                        event_filter)
+                .order_by(Event.start_dt))
+    if update_query:
+        id_query = update_query(id_query)
+    event_ids = [event_id for event_id, in id_query]
+    return iter_events_ical(_iter_ical_events(event_ids, event_filter_fn, batch_size), user)
+
+
+def _iter_ical_events(event_ids, event_filter_fn, batch_size):
     own_room_strategy = joinedload('own_room')
     own_room_strategy.load_only('location_id', 'site', 'building', 'floor', 'number', 'verbose_name')
     own_room_strategy.lazyload('owner')
     own_venue_strategy = joinedload('own_venue').load_only('name')
-    query = (Event.query
-             .filter(Event.category_chain_overlaps(category_ids),
-                     ~Event.is_deleted,
-                     event_filter)
-             .options(load_only('id', 'category_id', 'start_dt', 'end_dt', 'title', 'description', 'own_venue_name',
-                                'own_room_name', 'protection_mode', 'access_key', 'label_id', 'logo_metadata',
-                                'effective_protection_mode'),
-                      subqueryload('acl_entries'),
-                      subqueryload('vc_room_associations'),
-                      joinedload('person_links'),
-                      own_room_strategy,
-                      own_venue_strategy)
-             .order_by(Event.start_dt))
-    if update_query:
-        query = update_query(query)
-    it = iter(query)
-    if event_filter_fn:
-        it = filter(event_filter_fn, it)
-    events = list(it)
-    # avoid query spam from accessing contact names/emails
-    event_contact_settings.preload_bulk({e.id for e in events})
-    # make sure the parent categories are in sqlalchemy's identity cache.
-    # this avoids query spam from `protection_parent` lookups
-    _parent_categs = (Category._get_chain_query(Category.id.in_({e.category_id for e in events}))  # noqa: F841,RUF100
-                      .options(load_only('id', 'parent_id', 'protection_mode'),
-                               joinedload('acl_entries'))
-                      .all())
-
-    return BytesIO(events_to_ical(events, user))
+    for batch_ids in batched(event_ids, batch_size):
+        query = (Event.query
+                 .filter(Event.id.in_(batch_ids))
+                 .options(load_only('id', 'category_id', 'start_dt', 'end_dt', 'title', 'description',
+                                    'own_venue_name', 'own_room_name', 'protection_mode', 'access_key', 'label_id',
+                                    'logo_metadata', 'effective_protection_mode'),
+                          subqueryload('acl_entries'),
+                          subqueryload('vc_room_associations'),
+                          joinedload('person_links'),
+                          own_room_strategy,
+                          own_venue_strategy))
+        events_by_id = {e.id: e for e in query}
+        events = [events_by_id[event_id] for event_id in batch_ids if event_id in events_by_id]
+        if event_filter_fn:
+            events = list(filter(event_filter_fn, events))
+        # avoid query spam from accessing contact names/emails
+        event_contact_settings.preload_bulk({e.id for e in events})
+        # make sure the parent categories are in sqlalchemy's identity cache.
+        # this avoids query spam from `protection_parent` lookups
+        _parent_categs = (Category._get_chain_query(Category.id.in_({e.category_id for e in events}))  # noqa: F841,RUF100
+                          .options(load_only('id', 'parent_id', 'protection_mode'),
+                                   joinedload('acl_entries'))
+                          .all())
+        yield from events
 
 
 def serialize_category_atom(category, url, user, event_filter):
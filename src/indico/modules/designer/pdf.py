@@ -5,8 +5,10 @@
 # modify it under the terms of the MIT License; see the
 # LICENSE file for more details.
 
+import math
 import re
 from collections import namedtuple
+from functools import lru_cache
 from io import BytesIO
 
 from PIL import Image
@@ -54,6 +56,21 @@ def _extract_font_size(text):
     return int(FONT_SIZE_RE.match(text).group(1))
 
 
+@lru_cache(maxsize=10000)
+def _get_fitting_font_size(content, font_name, font_size, width, min_font_size=6):
+    """Get the font size needed to fit a string into the given width.
+
+    The font size is reduced in steps of 0.25pt, but since the width of
+    a string is proportional to the font size, we can calculate the
+    number of steps needed instead of trying them one by one.
+    """
+    text_width = stringWidth(content, font_name, font_size)
+    if text_width <= width or font_size <= min_font_size:
+        return font_size
+    steps = math.ceil((font_size - font_size * width / text_width) * 4)
+    return max(min_font_size, font_size - steps * 0.25)
+
+
 class DesignerPDFBase:
     placeholders_context = 'designer-fields'
 
@@ -108,11 +125,7 @@ class DesignerPDFBase:
 
     def _get_resized_font(self, content, font_size, font_name, width):
         content = str(content)  # resolve LazyString
-        min_font_size = 6
-        resized_font = font_size
-        item_width = width / PIXELS_CM * cm
-        while resized_font > min_font_size and item_width < stringWidth(content, font_name, resized_font):
-            resized_font -= 0.25
+        resized_font = _get_fitting_font_size(content, font_name, font_size, width / PIXELS_CM * cm)
         return {'fontSize': resized_font, 'leading': resized_font}
 
     def _draw_item(self, canvas, item, tpl_data, content, margin_x, margin_y):
@@ -205,6 +218,23 @@ class DesignerPDFBase:
 
         canvas.drawImage(img_reader, bg_x, bg_y, bg_width, bg_height)
 
+    def _draw_background_form(self, canvas, template, tpl_data, pos_x, pos_y, width, height):
+        """Draw the background image of a template which is used many times.
+
+        The image is only processed and embedded once; all other places
+        where it is drawn reference the same form XObject.
+        """
+        name = f'designer-background-{template.id}'
+        if not canvas.hasForm(name):
+            canvas.beginForm(name, 0, 0, width, height)
+            with template.background_image.open() as f:
+                self._draw_background(canvas, ImageReader(self._remove_transparency(f)), tpl_data, 0, 0, width, height)
+            canvas.endForm()
+        canvas.saveState()
+        canvas.translate(pos_x, pos_y)
+        canvas.doForm(name)
+        canvas.restoreState()
+
     def _build_config(self, config_data):
         """Build a structured configuration object.
 
@@ -0,0 +1,26 @@
+# This file is part of Indico.
+# Copyright (C) 2002 - 2025 CERN
+#
+# Indico is free software; you can redistribute it and/or
+# modify it under the terms of the MIT License; see the
+# LICENSE file for more details.
+
+import pytest
+from reportlab.pdfbase.pdfmetrics import stringWidth
+
+from indico.modules.designer.pdf import _get_fitting_font_size
+
+
+def _get_fitting_font_size_slow(content, font_name, font_size, width):
+    while font_size > 6 and width < stringWidth(content, font_name, font_size):
+        font_size -= 0.25
+    return font_size
+
+
+@pytest.mark.parametrize('content', ('Indico', 'A very long text that does not fit', 'WWWWW'))
+@pytest.mark.parametrize('font_name', ('Helvetica', 'Times-Bold', 'Courier'))
+@pytest.mark.parametrize('font_size', (5, 12, 24))
+@pytest.mark.parametrize('width', (20, 75.5, 300))
+def test_get_fitting_font_size(content, font_name, font_size, width):
+    expected = _get_fitting_font_size_slow(content, font_name, font_size, width)
+    assert _get_fitting_font_size(content, font_name, font_size, width) == expected
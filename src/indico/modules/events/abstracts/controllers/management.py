@@ -20,7 +20,7 @@ from indico.modules.events.abstracts.models.abstracts import Abstract
 from indico.modules.events.abstracts.models.review_questions import AbstractReviewQuestion
 from indico.modules.events.abstracts.models.review_ratings import AbstractReviewRating
 from indico.modules.events.abstracts.models.reviews import AbstractReview
-from indico.modules.events.abstracts.operations import close_cfa, open_cfa, schedule_cfa
+from indico.modules.events.abstracts.operations import close_cfa, open_cfa, schedule_cfa, update_abstract_review_stats
 from indico.modules.events.abstracts.settings import abstracts_reviewing_settings, abstracts_settings
 from indico.modules.events.abstracts.util import get_configured_notification_states
 from indico.modules.events.abstracts.views import WPManageAbstracts
@@ -141,6 +141,7 @@ class RHManageAbstractReviewing(RHManageAbstractsBase):
                 continue
             value = (rating.value - prev_min) / (prev_max - prev_min)
             rating.value = round(value * (scale_max - scale_min) + scale_min)
+        update_abstract_review_stats(self.event)
 
     def _process(self):
         defaults = FormDefaults(**abstracts_reviewing_settings.get_all(self.event))
@@ -271,6 +272,7 @@ class RHEditAbstractReviewingQuestion(RHReviewingQuestionBase):
         form = self.question.field.create_config_form(obj=defaults)
         if form.validate_on_submit():
             update_reviewing_question(self.question, form)
+            update_abstract_review_stats(self.event)
             return jsonify_data(flash=False)
         return jsonify_form(form, fields=getattr(form, '_order', None))
 
@@ -278,6 +280,7 @@ class RHEditAbstractReviewingQuestion(RHReviewingQuestionBase):
 class RHDeleteAbstractReviewingQuestion(RHReviewingQuestionBase):
     def _process(self):
         delete_reviewing_question(self.question)
+        update_abstract_review_stats(self.event)
         return jsonify_data(flash=False)
 
 
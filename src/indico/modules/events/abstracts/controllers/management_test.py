@@ -43,3 +43,4 @@ def test_abstract_review_scale_ratings(db, dummy_abstract, dummy_event, dummy_us
     rh.event = dummy_event
     rh._scale_ratings(scale_min, scale_max)
     assert rating.value == expected
+    assert dummy_abstract.score == expected
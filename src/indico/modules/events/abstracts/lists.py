@@ -5,6 +5,7 @@
 # modify it under the terms of the MIT License; see the
 # LICENSE file for more details.
 
+import math
 from operator import attrgetter
 
 from flask import flash, request, session
@@ -49,7 +50,7 @@ class AbstractListGeneratorBase(ListGeneratorBase):
             'reviewed_for_tracks': {'title': _('Reviewed for tracks'), 'filter_choices': track_empty | track_choices},
             'accepted_contrib_type': {'title': _('Accepted type'), 'filter_choices': type_empty | type_choices},
             'submitted_contrib_type': {'title': _('Submitted type'), 'filter_choices': type_empty | type_choices},
-            'score': {'title': _('Score')},
+            'score': {'title': _('Score'), 'filter_choices': self._get_score_filter_choices()},
             'submitted_dt': {'title': _('Submission date')},
             'modified_dt': {'title': _('Modification date')},
             'description': {'title': _('Content')},
@@ -58,6 +59,15 @@ class AbstractListGeneratorBase(ListGeneratorBase):
         self.extra_filters = {}
         self.list_config = self._get_config()
 
+    def _get_score_ranges(self):
+        lower, upper = self.event.cfa.rating_range
+        step = max(1, math.ceil((upper - lower) / 10))
+        return {start: min(start + step, upper) for start in range(lower, upper, step)}
+
+    def _get_score_filter_choices(self):
+        score_ranges = {str(start): f'{start} - {end}' for start, end in self._get_score_ranges().items()}
+        return {None: _('No score')} | score_ranges
+
     def _get_static_columns(self, ids):
         """
         Retrieve information needed for the header of the static columns.
@@ -107,7 +117,7 @@ class AbstractListGeneratorBase(ListGeneratorBase):
                          subqueryload('submitted_for_tracks'),
                          subqueryload('reviewed_for_tracks'),
                          subqueryload('person_links'),
-                         subqueryload('reviews').joinedload('ratings'))
+                         subqueryload('reviews'))
                 .order_by(Abstract.friendly_id))
 
     def _filter_list_entries(self, query, filters):
@@ -174,6 +184,8 @@ class AbstractListGeneratorBase(ListGeneratorBase):
                     if ids:
                         column_criteria.append(column.in_(ids))
                 criteria.append(db.or_(*column_criteria))
+            if score_criteria := self._get_score_criteria(item_filters.get('score', ())):
+                criteria.append(db.or_(*score_criteria))
             if 'state' in item_filters:
                 states = [AbstractState(int(state)) for state in item_filters['state']]
                 criteria.append(Abstract.state.in_(states))
@@ -187,6 +199,22 @@ class AbstractListGeneratorBase(ListGeneratorBase):
                 criteria.append(Abstract.submission_comment != '')  # noqa: PLC1901
         return query.filter(db.and_(*criteria))
 
+    def _get_score_criteria(self, values):
+        score_ranges = self._get_score_ranges()
+        upper = self.event.cfa.rating_range[1]
+        score_criteria = []
+        for value in values:
+            if value is None:
+                score_criteria.append(Abstract.score.is_(None))
+            elif (end := score_ranges.get(int(value))) is None:
+                # range from a previous rating scale
+                continue
+            elif end == upper:
+                score_criteria.append(Abstract.score >= int(value))
+            else:
+                score_criteria.append((Abstract.score >= int(value)) & (Abstract.score < end))
+        return score_criteria
+
     def get_list_kwargs(self):
         list_config = self._get_config()
         abstracts_query = self._build_query()
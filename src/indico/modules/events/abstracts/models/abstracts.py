@@ -10,7 +10,7 @@ from itertools import chain
 from operator import attrgetter
 
 from sqlalchemy import inspect
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.dialects.postgresql import JSONB, UUID
 from sqlalchemy.ext.declarative import declared_attr
 from sqlalchemy.ext.hybrid import hybrid_property
 
@@ -236,6 +236,24 @@ class Abstract(ProposalMixin, ProposalRevisionMixin, DescriptionMixin, CustomFie
         nullable=False,
         default=False
     )
+    #: The average score of all reviews (see :meth:`update_review_stats`)
+    score = db.Column(
+        db.Float,
+        nullable=True
+    )
+    #: The number of reviews the abstract received
+    review_count = db.Column(
+        db.Integer,
+        nullable=False,
+        default=0
+    )
+    #: The number of reviews, score and per-question scores for each
+    #: track the abstract has been reviewed in, keyed by track ID
+    review_stats = db.Column(
+        JSONB,
+        nullable=False,
+        default={}
+    )
     event = db.relationship(
         'Event',
         lazy=True,
@@ -447,25 +465,13 @@ class Abstract(ProposalMixin, ProposalRevisionMixin, DescriptionMixin, CustomFie
         else:
             return AbstractReviewingState.mixed
 
-    @property
-    def score(self):
-        scores = [x.score for x in self.reviews if x.score is not None]
-        if not scores:
-            return None
-        return sum(scores) / len(scores)
-
     @property
     def track_question_scores(self):
-        sums = defaultdict(Counter)
-        lens = defaultdict(Counter)
-        for r in self.reviews:
-            if not r.track:
-                continue
-            sums[r.track.id] += Counter(r.scores)
-            lens[r.track.id] += Counter(r.scores.keys())
-        return {track: {question: score / lens[track][question]
-                        for question, score in scores.items()}
-                for track, scores in sums.items()}
+        questions = self.event.abstract_review_questions
+        return {int(track_id): {question: stats['question_scores'][str(question.id)]
+                                for question in questions
+                                if str(question.id) in stats['question_scores']}
+                for track_id, stats in self.review_stats.items()}
 
     @property
     def data_by_field(self):
@@ -656,11 +662,44 @@ class Abstract(ProposalMixin, ProposalRevisionMixin, DescriptionMixin, CustomFie
     def get_track_score(self, track):
         if track not in self.reviewed_for_tracks:
             raise ValueError('Abstract not in review for given track')
-        reviews = [x for x in self.reviews if x.track == track]
-        scores = [x.score for x in reviews if x.score is not None]
-        if not scores:
-            return None
-        return sum(scores) / len(scores)
+        stats = self.review_stats.get(str(track.id))
+        return stats['score'] if stats else None
+
+    def update_review_stats(self):
+        """Update the stored review statistics of the abstract.
+
+        The overall score, the number of reviews and the per-track
+        scores are stored in the abstract so lists can be sorted and
+        filtered by score without loading all reviews and ratings.
+        This needs to be called whenever a review or the reviewing
+        questions used to calculate the scores change.
+        """
+        scores = []
+        track_reviews = Counter()
+        track_scores = defaultdict(list)
+        question_scores = defaultdict(lambda: defaultdict(list))
+        for review in self.reviews:
+            score = review.score
+            if score is not None:
+                scores.append(score)
+            if review.track_id is None:
+                continue
+            track_reviews[review.track_id] += 1
+            if score is not None:
+                track_scores[review.track_id].append(score)
+            for question, value in review.scores.items():
+                question_scores[review.track_id][question.id].append(value)
+        self.score = _mean(scores)
+        self.review_count = len(self.reviews)
+        self.review_stats = {
+            str(track_id): {
+                'review_count': count,
+                'score': _mean(track_scores[track_id]),
+                'question_scores': {str(question_id): _mean(values)
+                                    for question_id, values in question_scores[track_id].items()}
+            }
+            for track_id, count in track_reviews.items()
+        }
 
     def reset_state(self):
         self.state = AbstractState.submitted
@@ -680,3 +719,7 @@ class Abstract(ProposalMixin, ProposalRevisionMixin, DescriptionMixin, CustomFie
     def log(self, *args, **kwargs):
         """Log with prefilled metadata for the abstract."""
         return self.event.log(*args, meta={'abstract_id': self.id}, **kwargs)
+
+
+def _mean(values):
+    return (sum(values) / len(values)) if values else None
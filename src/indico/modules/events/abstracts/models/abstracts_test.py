@@ -0,0 +1,44 @@
+# This file is part of Indico.
+# Copyright (C) 2002 - 2025 CERN
+#
+# Indico is free software; you can redistribute it and/or
+# modify it under the terms of the MIT License; see the
+# LICENSE file for more details.
+
+import pytest
+
+from indico.modules.events.abstracts.models.review_questions import AbstractReviewQuestion
+from indico.modules.events.abstracts.models.review_ratings import AbstractReviewRating
+from indico.modules.events.abstracts.models.reviews import AbstractAction, AbstractReview
+from indico.modules.events.tracks import Track
+
+
+def test_update_review_stats(db, dummy_abstract, dummy_event, dummy_user, create_user):
+    track = Track(title='Dummy Track', event=dummy_event)
+    other_track = Track(title='Other Track', event=dummy_event)
+    dummy_abstract.reviewed_for_tracks = {track, other_track}
+    rating = AbstractReviewQuestion(field_type='rating', title='Rating')
+    other_rating = AbstractReviewQuestion(field_type='rating', title='Other rating')
+    unscored = AbstractReviewQuestion(field_type='rating', title='Unscored', no_score=True)
+    dummy_event.abstract_review_questions.extend([rating, other_rating, unscored])
+    for user, review_track, values in ((dummy_user, track, (1, 2, 5)),
+                                       (create_user(123), track, (3, None, 5)),
+                                       (create_user(456), other_track, (None, None, 5))):
+        review = AbstractReview(abstract=dummy_abstract, track=review_track, user=user,
+                                proposed_action=AbstractAction.accept)
+        for question, value in zip((rating, other_rating, unscored), values, strict=True):
+            review.ratings.append(AbstractReviewRating(question=question, value=value))
+    db.session.flush()
+    assert dummy_abstract.score is None
+    assert dummy_abstract.review_count == 0
+
+    dummy_abstract.update_review_stats()
+    db.session.flush()
+    assert dummy_abstract.score == pytest.approx(2.25)
+    assert dummy_abstract.review_count == 3
+    assert dummy_abstract.get_track_score(track) == pytest.approx(2.25)
+    assert dummy_abstract.get_track_score(other_track) is None
+    assert dummy_abstract.track_question_scores == {
+        track.id: {rating: 2, other_rating: 2},
+        other_track.id: {},
+    }
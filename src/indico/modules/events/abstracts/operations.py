@@ -11,6 +11,7 @@ from operator import attrgetter
 from uuid import uuid4
 
 from flask import session
+from sqlalchemy.orm import subqueryload
 
 from indico.core import signals
 from indico.core.db import db
@@ -342,6 +343,7 @@ def create_abstract_review(abstract, track, user, review_data, questions_data):
         review.ratings.append(AbstractReviewRating(question=question, value=value))
         log_data[question.title] = question.field.get_friendly_value(value)
     db.session.flush()
+    abstract.update_review_stats()
     logger.info('Abstract %s received a review by %s for track %s', abstract, user, track)
     log_data.update({
         'Track': track.title,
@@ -380,6 +382,7 @@ def update_abstract_review(review, review_data, questions_data):
             }
 
     db.session.flush()
+    review.abstract.update_review_stats()
     logger.info('Abstract review %s modified', review)
     log_fields.update({
         'proposed_action': 'Action',
@@ -407,6 +410,23 @@ def update_abstract_review(review, review_data, questions_data):
               session.user, data={'Track': review.track.title, 'Changes': make_diff_log(changes, log_fields)})
 
 
+def update_abstract_review_stats(event):
+    """Update the stored review statistics of all abstracts in an event.
+
+    This is needed when the ratings of many abstracts change at once,
+    e.g. because the rating scale changed or a reviewing question was
+    edited or deleted.
+    """
+    abstracts = (Abstract.query
+                 .with_parent(event)
+                 .options(subqueryload('reviews').subqueryload('ratings').joinedload('question'))
+                 .all())
+    for abstract in abstracts:
+        abstract.update_review_stats()
+    db.session.flush()
+    logger.info('Review statistics of %d abstracts in %r updated', len(abstracts), event)
+
+
 def schedule_cfa(event, start_dt, end_dt, modification_end_dt):
     event.cfa.schedule(start_dt, end_dt, modification_end_dt)
     logger.info('Call for abstracts for %s scheduled by %s', event, session.user)
@@ -8,23 +8,26 @@
 import fnmatch
 import re
 from datetime import datetime
-from hashlib import md5
+from hashlib import md5, sha256
 from operator import attrgetter
 
 import pytz
-from flask import request
+from flask import g, request
 from sqlalchemy import Date, cast
 from sqlalchemy.orm import joinedload, selectinload, subqueryload, undefer
 from werkzeug.exceptions import ServiceUnavailable
 
 from indico.core import signals
+from indico.core.cache import make_scoped_cache
 from indico.core.db import db
 from indico.core.db.sqlalchemy.principals import PrincipalType
 from indico.core.db.sqlalchemy.protection import ProtectionMode
+from indico.modules.api import api_settings
 from indico.modules.attachments.api.util import build_folders_api_data, build_material_legacy_api_data
+from indico.modules.attachments.util import get_attached_folders
 from indico.modules.categories import Category
 from indico.modules.categories.models.legacy_mapping import LegacyCategoryMapping
-from indico.modules.categories.serialize import serialize_categories_ical
+from indico.modules.categories.serialize import iter_categories_ical
 from indico.modules.events import Event
 from indico.modules.events.contributions import contribution_settings
 from indico.modules.events.contributions.models.contributions import Contribution
@@ -37,7 +40,7 @@ from indico.modules.events.timetable.models.entries import TimetableEntry
 from indico.util.date_time import iterdays
 from indico.util.i18n import orig_string
 from indico.util.signals import values_from_signal
-from indico.web.flask.util import send_file, url_for
+from indico.web.flask.util import send_stream, url_for
 from indico.web.http_api.hooks.base import HTTPAPIHook, IteratedDataFetcher
 from indico.web.http_api.responses import HTTPAPIError
 from indico.web.http_api.util import get_query_parameter
@@ -47,6 +50,10 @@ utc = pytz.timezone('UTC')
 MAX_DATETIME = utc.localize(datetime(2099, 12, 31, 23, 59, 0))
 MIN_DATETIME = utc.localize(datetime(2000, 1, 1))
 
+# Event data which is the same for all users (who cannot manage the event), shared between the
+# results of all users requesting the same category export.
+SHARED_CACHE = make_scoped_cache('legacy-http-api-shared')
+
 
 def find_event_day_bounds(obj, day):
     if not (obj.start_dt_local.date() <= day <= obj.end_dt_local.date()):
@@ -99,6 +106,7 @@ class CategoryEventHook(HTTPAPIHook):
     TYPES = ('event', 'categ')
     RE = r'(?P<idlist>\w+(?:-\w+)*)'
     DEFAULT_DETAIL = 'events'
+    STREAMING = True
     MAX_RECORDS = {
         'events': 1000,
         'contributions': 500,
@@ -128,12 +136,13 @@ class CategoryEventHook(HTTPAPIHook):
         legacy_query = LegacyCategoryMapping.query.filter(LegacyCategoryMapping.legacy_category_id.in_(id_list))
         legacy_id_map = {m.legacy_category_id: m.category_id for m in legacy_query}
         id_list = {str(legacy_id_map.get(id_, id_)) for id_ in id_list}
-        return expInt.category(id_list, self._format)
+        self._category_ids = set()
+        return expInt.category(id_list, self._format, category_ids=self._category_ids)
 
     def export_categ_extra(self, user, resultList):
+        # the results may have been streamed, so the category ids are collected while serializing them
         expInt = CategoryEventFetcher(user, self)
-        ids = {event['categoryId'] for event in resultList}
-        return expInt.category_extra(ids)
+        return expInt.category_extra(self._category_ids)
 
     def export_event(self, user):
         expInt = CategoryEventFetcher(user, self)
@@ -469,17 +478,17 @@ class CategoryEventFetcher(IteratedDataFetcher, SerializerBase):
         options.append(selectinload('references'))
         return options
 
-    def category(self, idlist, format):
+    def category(self, idlist, format, category_ids=None):
         try:
             idlist = [int(x) for x in idlist]
         except ValueError:
             raise HTTPAPIError('Category IDs must be numeric', 400)
         if format == 'ics':
-            buf = serialize_categories_ical(idlist, self.user,
-                                            event_filter=Event.happens_between(self._fromDT, self._toDT),
-                                            event_filter_fn=self._filter_event,
-                                            update_query=self._update_query)
-            return send_file('events.ics', buf, 'text/calendar')
+            chunks = iter_categories_ical(idlist, self.user,
+                                          event_filter=Event.happens_between(self._fromDT, self._toDT),
+                                          event_filter_fn=self._filter_event,
+                                          update_query=self._update_query)
+            return send_stream('events.ics', chunks, 'text/calendar', inline=True)
         else:
             query = (Event.query
                      .filter(~Event.is_deleted,
@@ -487,7 +496,73 @@ class CategoryEventFetcher(IteratedDataFetcher, SerializerBase):
                              Event.happens_between(self._fromDT, self._toDT))
                      .options(*self._get_query_options(self._detail_level)))
         query = self._update_query(query)
-        return self.serialize_events(x for x in query if self._filter_event(x) and x.can_access(self.user))
+        if self._can_share_results():
+            return self._serialize_shared_events(query, category_ids)
+        return self.serialize_events((x for x in query if self._filter_event(x) and x.can_access(self.user)),
+                                     category_ids=category_ids)
+
+    def _can_share_results(self):
+        # Only the basic event data is shared; on higher detail levels contributions and sessions
+        # may have their own protection and managers.
+        if self._detail_level != 'events' or self._hook._wantFavorites:
+            return False
+        if get_query_parameter(request.args.to_dict(), ['nc', 'nocache'], 'no') == 'yes':
+            return False
+        return api_settings.get('cache_ttl') > 0
+
+    def _get_shared_cache_key(self, event):
+        # besides the event, the shared data only depends on arguments which are the same for all users
+        data = (event.id, self._tz.zone, self._occurrences, self._occurrences and (self._fromDT, self._toDT))
+        return sha256(repr(data).encode()).hexdigest()
+
+    def _is_shareable(self, event):
+        """Check whether everyone who cannot manage an event gets the same data for it."""
+        if not event.can_access(None):
+            return False
+        return all(folder.can_access(None) and all(attachment.can_access(None) for attachment in folder.attachments)
+                   for folder in get_attached_folders(event, preload_event=True))
+
+    def _get_shared_event_data(self, event):
+        """Get the data of an event which is the same for all users who cannot manage it.
+
+        The data is cached separately for each event, so it is shared
+        between all queries containing the event.
+
+        :return: The event data, or ``None`` if the event needs to be
+                 serialized separately for each user.
+        """
+        cache_key = self._get_shared_cache_key(event)
+        if (entry := SHARED_CACHE.get(cache_key)) is not None:
+            return entry['data']
+        public_fetcher = CategoryEventFetcher(None, self._hook)
+        api_user = g.current_api_user
+        g.current_api_user = None
+        try:
+            data = (public_fetcher._build_event_api_data(event, postprocess=False)
+                    if public_fetcher._is_shareable(event) else None)
+        finally:
+            g.current_api_user = api_user
+        SHARED_CACHE.set(cache_key, {'data': data}, api_settings.get('cache_ttl'))
+        return data
+
+    def _serialize_shared_events(self, query, category_ids=None):
+        """Serialize events using the data shared between all users where possible.
+
+        Events only need to be fully serialized for the current user if
+        they are protected or contain protected materials or if the user
+        can manage them.
+        """
+        for event in query:
+            if not self._filter_event(event) or not event.can_access(self.user):
+                continue
+            if category_ids is not None:
+                category_ids.add(event.category_id)
+            if self.user is not None and event.can_manage(self.user):
+                yield self._build_event_api_data(event)
+            elif (data := self._get_shared_event_data(event)) is not None:
+                yield self._postprocess_event_api_data(event, data)
+            else:
+                yield self._build_event_api_data(event)
 
     def category_extra(self, ids):
         if self._toDT is None:
@@ -557,8 +632,17 @@ class CategoryEventFetcher(IteratedDataFetcher, SerializerBase):
 
         return query
 
-    def serialize_events(self, events):
-        return [self._build_event_api_data(e) for e in events]
+    def serialize_events(self, events, category_ids=None):
+        """Serialize events while iterating over them.
+
+        :param events: An iterable of events
+        :param category_ids: A set to which the category ids of the
+                             serialized events are added
+        """
+        for event in events:
+            if category_ids is not None:
+                category_ids.add(event.category_id)
+            yield self._build_event_api_data(event)
 
     def _serialize_category_path(self, category):
         visibility = {'id': None, 'name': 'Everywhere'}
@@ -587,7 +671,7 @@ class CategoryEventFetcher(IteratedDataFetcher, SerializerBase):
         return [{'_type': 'CategoryPath', 'categoryId': category.id, 'path': self._serialize_category_path(category)}
                 for category in Category.query.filter(Category.id.in_(ids)).options(undefer('chain'))]
 
-    def _build_event_api_data(self, event):
+    def _build_event_api_data(self, event, postprocess=True):
         can_manage = self.user is not None and event.can_manage(self.user)
         data = self._build_event_api_data_base(event)
         material_data = build_material_legacy_api_data(event)
@@ -660,6 +744,9 @@ class CategoryEventFetcher(IteratedDataFetcher, SerializerBase):
                     data['sessions'].extend(self._build_session_api_data(session_))
         if self._occurrences:
             data['occurrences'] = self._serialize_event_occurrences(event, self._fromDT, self._toDT)
+        return self._postprocess_event_api_data(event, data) if postprocess else data
+
+    def _postprocess_event_api_data(self, event, data):
         # check whether the plugins want to add/override any data
         for update in values_from_signal(
             signals.event.metadata_postprocess.send('http-api', event=event, data=data, user=self.user),
@@ -0,0 +1,59 @@
+# This file is part of Indico.
+# Copyright (C) 2002 - 2025 CERN
+#
+# Indico is free software; you can redistribute it and/or
+# modify it under the terms of the MIT License; see the
+# LICENSE file for more details.
+
+import pytest
+from flask import g
+
+from indico.core.db.sqlalchemy.protection import ProtectionMode
+from indico.modules.events import Event
+from indico.modules.events.api import CategoryEventFetcher, CategoryEventHook
+
+
+@pytest.fixture
+def serialize_shared(dummy_event):
+    """Serialize the dummy event using the shared cache for a user."""
+    def _serialize(user):
+        hook = CategoryEventHook({}, 'categ', {'idlist': str(dummy_event.category_id)}, 'json')
+        hook._getParams()
+        g.current_api_user = user
+        fetcher = CategoryEventFetcher(user, hook)
+        return list(fetcher._serialize_shared_events(Event.query.filter_by(id=dummy_event.id)))
+
+    return _serialize
+
+
+@pytest.mark.usefixtures('request_context')
+def test_shared_events_cached(mocker, serialize_shared, dummy_event, dummy_user, create_user):
+    build = mocker.spy(CategoryEventFetcher, '_build_event_api_data')
+    first = serialize_shared(dummy_user)
+    assert build.call_count == 1
+    second = serialize_shared(create_user(123))
+    assert build.call_count == 1
+    assert first == second
+    assert second[0]['title'] == dummy_event.title
+
+
+@pytest.mark.usefixtures('request_context')
+def test_shared_events_protected(mocker, serialize_shared, dummy_event, dummy_user, create_user):
+    other_user = create_user(123)
+    dummy_event.protection_mode = ProtectionMode.protected
+    dummy_event.update_principal(dummy_user, read_access=True)
+    dummy_event.update_principal(other_user, read_access=True)
+    build = mocker.spy(CategoryEventFetcher, '_build_event_api_data')
+    assert len(serialize_shared(dummy_user)) == 1
+    assert len(serialize_shared(other_user)) == 1
+    # protected events are serialized for each user
+    assert [call.args[0].user for call in build.call_args_list] == [dummy_user, other_user]
+    assert serialize_shared(None) == []
+
+
+@pytest.mark.usefixtures('request_context')
+def test_shared_events_manager(serialize_shared, dummy_event, dummy_user):
+    dummy_event.update_principal(dummy_user, full_access=True)
+    assert 'allowed' not in serialize_shared(None)[0]
+    # the manager gets their own data even though the public data is cached
+    assert 'allowed' in serialize_shared(dummy_user)[0]
@@ -34,8 +34,8 @@
     });
   }
 
-  global.handleRowSelection = function(trigger) {
-    const $obj = $('table.i-table input.select-row').on('change', function() {
+  global.handleRowSelection = function(trigger, $rows = $('table.i-table')) {
+    const $obj = $rows.find('input.select-row').on('change', function() {
       $(this)
         .closest('tr')
         .toggleClass('selected', this.checked);
@@ -69,40 +69,8 @@ class EventCloner:
 
     @classmethod
     def run_cloners(cls, old_event, new_event, cloners, n_occurrence=0, event_exists=False):
-        all_cloners = {name: cloner_cls(old_event, n_occurrence)
-                       for name, cloner_cls in get_event_cloners().items()}
-        if any(cloner.is_internal for name, cloner in all_cloners.items() if name in cloners):
-            raise Exception('An internal cloner was selected')
-
-        if event_exists:
-            if any(cloner.new_event_only for name, cloner in all_cloners.items() if name in cloners):
-                raise Exception('A new event only cloner was selected')
-            if any(cloner.get_conflicts(new_event) for name, cloner in all_cloners.items() if name in cloners):
-                raise Exception('Cloner target is not empty')
-
-        # enable internal cloners that are enabled by default or required by another cloner
-        cloners |= {c.name
-                    for c in all_cloners.values()
-                    if c.is_internal and (c.is_default or c.required_by_deep & cloners)}
-        # enable unavailable cloners that may be pulled in as a dependency nonetheless
-        extra = {c.name
-                 for c in all_cloners.values()
-                 if not c.is_available and c.always_available_dep and c.required_by_deep & cloners}
-        cloners |= extra
-        active_cloners = {name: cloner for name, cloner in all_cloners.items() if name in cloners}
-        if not all((c.is_internal or c.is_visible) and c.is_available
-                   for c in active_cloners.values()
-                   if c.name not in extra):
-            raise Exception('An invisible/unavailable cloner was selected')
-        for name, cloner in active_cloners.items():
-            if not (cloners >= cloner.requires_deep):
-                raise Exception('Cloner {} requires {}'.format(name, ', '.join(cloner.requires_deep - cloners)))
-        shared_data = {}
-        cloner_names = set(active_cloners)
-        for name, cloner in active_cloners.items():
-            shared_data[name] = cloner.run(new_event, cloner_names, cloner._prepare_shared_data(shared_data),
-                                           event_exists=event_exists)
-        return active_cloners, shared_data
+        plan = EventClonePlan(old_event, cloners, target_event=(new_event if event_exists else None))
+        return plan.run(new_event, n_occurrence, event_exists=event_exists)
 
     @cached_classproperty
     @classmethod
@@ -131,9 +99,13 @@ class EventCloner:
         # This is not very efficient, but it runs exactly once on a not-very-large set
         return {cloner.name for cloner in get_event_cloners().values() if cls.name in cloner.requires_deep}
 
-    def __init__(self, old_event, n_occurrence=0):
+    def __init__(self, old_event, n_occurrence=0, source_cache=None):
         self.old_event = old_event
         self.n_occurrence = n_occurrence
+        #: A dict which the cloner may use to keep data it loaded from
+        #: the source event.  When cloning an event multiple times it
+        #: is shared by the cloners of all clones.
+        self.source_cache = {} if source_cache is None else source_cache
 
     def run(self, new_event, cloners, shared_data, event_exists=False):
         """Performs the cloning operation.
@@ -192,6 +164,81 @@ class EventCloner:
         return {k: v for k, v in shared_data.items() if k in linked}
 
 
+class EventClonePlan:
+    """The cloners to run when cloning an event.
+
+    Creating the plan validates the selected cloners and resolves their
+    dependencies.  When the same event is cloned multiple times (e.g. to
+    create an event series), the plan can be reused for all the clones,
+    and the cloners may keep data they loaded from the source event in
+    the shared `source_cache`, so it is only queried once.
+
+    :param old_event: The event that's being cloned
+    :param cloners: A set containing the names of the selected cloners
+    :param target_event: The existing event to clone into, if any
+    """
+
+    def __init__(self, old_event, cloners, target_event=None):
+        self.old_event = old_event
+        self.source_cache = {}
+        all_cloners = {name: cloner_cls(old_event) for name, cloner_cls in get_event_cloners().items()}
+        if any(cloner.is_internal for name, cloner in all_cloners.items() if name in cloners):
+            raise Exception('An internal cloner was selected')
+
+        if target_event is not None:
+            if any(cloner.new_event_only for name, cloner in all_cloners.items() if name in cloners):
+                raise Exception('A new event only cloner was selected')
+            if any(cloner.get_conflicts(target_event) for name, cloner in all_cloners.items() if name in cloners):
+                raise Exception('Cloner target is not empty')
+
+        # enable internal cloners that are enabled by default or required by another cloner
+        cloners |= {c.name
+                    for c in all_cloners.values()
+                    if c.is_internal and (c.is_default or c.required_by_deep & cloners)}
+        # enable unavailable cloners that may be pulled in as a dependency nonetheless
+        extra = {c.name
+                 for c in all_cloners.values()
+                 if not c.is_available and c.always_available_dep and c.required_by_deep & cloners}
+        cloners |= extra
+        active_cloners = {name: cloner for name, cloner in all_cloners.items() if name in cloners}
+        if not all((c.is_internal or c.is_visible) and c.is_available
+                   for c in active_cloners.values()
+                   if c.name not in extra):
+            raise Exception('An invisible/unavailable cloner was selected')
+        for name, cloner in active_cloners.items():
+            if not (cloners >= cloner.requires_deep):
+                raise Exception('Cloner {} requires {}'.format(name, ', '.join(cloner.requires_deep - cloners)))
+        #: The names of the cloners to run, in the order they need to run
+        self.cloner_names = list(active_cloners)
+
+    def run(self, new_event, n_occurrence=0, event_exists=False):
+        """Run the cloners to clone the event into a new one.
+
+        :param new_event: The `Event` to clone into
+        :param n_occurrence: The 1-indexed number of the occurrence, if
+                             this is a "recurring" clone, otherwise `0`
+        :param event_exists: If cloning into an existing event
+        :return: A ``(active_cloners, shared_data)`` tuple
+        """
+        cloner_classes = get_event_cloners()
+        active_cloners = {name: cloner_classes[name](self.old_event, n_occurrence, source_cache=self.source_cache)
+                          for name in self.cloner_names}
+        shared_data = {}
+        cloner_names = set(active_cloners)
+        for name, cloner in active_cloners.items():
+            shared_data[name] = cloner.run(new_event, cloner_names, cloner._prepare_shared_data(shared_data),
+                                           event_exists=event_exists)
+        return active_cloners, shared_data
+
+    def clear_source_cache(self):
+        """Discard the data the cloners loaded from the source event.
+
+        This needs to be called whenever the objects loaded from the
+        database may have been expired, e.g. after committing.
+        """
+        self.source_cache.clear()
+
+
 def _resolve_dependencies(cloners):
     cloner_deps = {name: (cls.requires, cls.uses) for name, cls in cloners.items()}
     resolved_deps = set()
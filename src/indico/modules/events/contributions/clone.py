@@ -154,6 +154,7 @@ class ContributionCloner(EventCloner):
         self._subcontrib_map = {}
         with db.session.no_autoflush:
             self._clone_contribs(new_event, event_exists=event_exists)
+            self._assign_ids()
         self._synchronize_friendly_id(new_event)
         if event_exists:
             for orig_contrib, contrib in self._contrib_map.items():
@@ -194,22 +195,40 @@ class ContributionCloner(EventCloner):
         return new_contrib
 
     def _clone_contribs(self, new_event, event_exists=False):
-        query = (Contribution.query.with_parent(self.old_event)
-                 .options(undefer('_last_friendly_subcontribution_id'),
-                          joinedload('own_venue'),
-                          joinedload('own_room').lazyload('*'),
-                          joinedload('session'),
-                          joinedload('session_block').lazyload('session'),
-                          joinedload('type'),
-                          subqueryload('acl_entries'),
-                          subqueryload('subcontributions').joinedload('references'),
-                          subqueryload('references'),
-                          subqueryload('person_links'),
-                          subqueryload('field_values')))
-        for old_contrib in query:
+        # when cloning an event series, the contributions are only loaded for the first clone
+        if 'contributions' not in self.source_cache:
+            self.source_cache['contributions'] = self._load_contribs()
+        for old_contrib in self.source_cache['contributions']:
             self._contrib_map[old_contrib] = self._create_new_contribution(new_event, old_contrib,
                                                                            event_exists=event_exists)
 
+    def _load_contribs(self):
+        return (Contribution.query.with_parent(self.old_event)
+                .options(undefer('_last_friendly_subcontribution_id'),
+                         joinedload('own_venue'),
+                         joinedload('own_room').lazyload('*'),
+                         joinedload('session'),
+                         joinedload('session_block').lazyload('session'),
+                         joinedload('type'),
+                         subqueryload('acl_entries'),
+                         subqueryload('subcontributions').joinedload('references'),
+                         subqueryload('references'),
+                         subqueryload('person_links'),
+                         subqueryload('field_values'))
+                .all())
+
+    def _assign_ids(self):
+        # objects which already have their ID are inserted in bulk instead of one by one
+        contribs = list(self._contrib_map.values())
+        subcontribs = list(self._subcontrib_map.values())
+        Contribution.assign_ids(contribs)
+        SubContribution.assign_ids(subcontribs)
+        ContributionPrincipal.assign_ids([entry for contrib in contribs for entry in contrib.acl_entries])
+        ContributionReference.assign_ids([ref for contrib in contribs for ref in contrib.references])
+        SubContributionReference.assign_ids([ref for subcontrib in subcontribs for ref in subcontrib.references])
+        ContributionPersonLink.assign_ids([link for contrib in contribs for link in contrib.person_links])
+        SubContributionPersonLink.assign_ids([link for subcontrib in subcontribs for link in subcontrib.person_links])
+
     def _clone_subcontribs(self, subcontribs, event_exists=False):
         attrs = get_attrs_to_clone(SubContribution)
         for old_subcontrib in subcontribs:
@@ -5,7 +5,7 @@
 # modify it under the terms of the MIT License; see the
 # LICENSE file for more details.
 
-from flask import flash, session
+from flask import flash, g, has_app_context, session
 
 from indico.core import signals
 from indico.core.db import db
@@ -52,6 +52,18 @@ def _get_feature_definitions(sender, **kwargs):
     return EditingFeature
 
 
+@signals.core.import_tasks.connect
+def _import_tasks(sender, **kwargs):
+    import indico.modules.events.editing.tasks  # noqa: F401
+
+
+@signals.core.after_commit.connect
+def _send_editing_service_messages(sender, **kwargs):
+    if has_app_context() and g.pop('editing_service_messages_pending', False):
+        from indico.modules.events.editing.tasks import send_editing_service_messages
+        send_editing_service_messages.delay()
+
+
 @signals.acl.get_management_permissions.connect_via(Event)
 def _get_management_permissions(sender, **kwargs):
     yield EditingManagerPermission
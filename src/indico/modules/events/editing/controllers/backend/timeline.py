@@ -203,10 +203,7 @@ class RHDeleteEditable(RHContributionEditableBase):
     def _process(self):
         delete_editable(self.editable)
         if editing_settings.get(self.event, 'service_url'):
-            try:
-                service_handle_delete_editable(self.editable)
-            except ServiceRequestFailed:
-                raise ServiceUnavailable(_('Deletion failed, please try again later.'))
+            service_handle_delete_editable(self.editable)
         return '', 204
 
 
@@ -0,0 +1,92 @@
+# This file is part of Indico.
+# Copyright (C) 2002 - 2025 CERN
+#
+# Indico is free software; you can redistribute it and/or
+# modify it under the terms of the MIT License; see the
+# LICENSE file for more details.
+
+from sqlalchemy.dialects.postgresql import JSONB
+
+from indico.core.db import db
+from indico.core.db.sqlalchemy import UTCDateTime
+from indico.util.date_time import now_utc
+from indico.util.string import format_repr
+
+
+class EditingServiceMessage(db.Model):
+    """A pending notification for the editing service.
+
+    Notifications whose response is not needed are stored in this
+    table in the same transaction as the change they notify about and
+    sent to the service by a background task, which retries them until
+    the service accepts them.
+    """
+
+    __tablename__ = 'service_messages'
+    __table_args__ = {'schema': 'event_editing'}
+
+    #: The ID of the message
+    id = db.Column(
+        db.Integer,
+        primary_key=True
+    )
+    #: The ID of the event the message is related to
+    event_id = db.Column(
+        db.Integer,
+        db.ForeignKey('events.events.id'),
+        index=True,
+        nullable=False
+    )
+    #: The HTTP method used to send the message
+    method = db.Column(
+        db.String,
+        nullable=False
+    )
+    #: The path of the message relative to the service URL of the event
+    path = db.Column(
+        db.String,
+        nullable=False
+    )
+    #: The JSON payload of the message
+    payload = db.Column(
+        JSONB,
+        nullable=True
+    )
+    #: The date/time when the message was created
+    created_dt = db.Column(
+        UTCDateTime,
+        nullable=False,
+        default=now_utc
+    )
+    #: The date/time of the next attempt to send the message
+    next_attempt_dt = db.Column(
+        UTCDateTime,
+        nullable=False,
+        index=True,
+        default=now_utc
+    )
+    #: The number of failed attempts to send the message
+    attempts = db.Column(
+        db.Integer,
+        nullable=False,
+        default=0
+    )
+    #: The error of the last failed attempt to send the message
+    last_error = db.Column(
+        db.String,
+        nullable=True
+    )
+
+    #: The event the message is related to
+    event = db.relationship(
+        'Event',
+        lazy=True,
+        backref=db.backref(
+            'editing_service_messages',
+            lazy='dynamic',
+            cascade='all, delete-orphan'
+        )
+    )
+
+    def __repr__(self):
+        return format_repr(self, 'id', 'event_id', 'method', 'path', attempts=0)
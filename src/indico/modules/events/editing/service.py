@@ -5,10 +5,16 @@
 # modify it under the terms of the MIT License; see the
 # LICENSE file for more details.
 
+import os
+from datetime import timedelta
+from functools import cache
 from urllib.parse import urlsplit
 
 import requests
+from flask import g, has_app_context
 from marshmallow import ValidationError
+from requests.adapters import HTTPAdapter
+from urllib3.util import Retry
 
 import indico
 from indico.core.config import config
@@ -16,6 +22,7 @@ from indico.core.db import db
 from indico.modules.events.editing import logger
 from indico.modules.events.editing.models.editable import EditableType
 from indico.modules.events.editing.models.revisions import RevisionType
+from indico.modules.events.editing.models.service_messages import EditingServiceMessage
 from indico.modules.events.editing.operations import create_revision_comment, publish_editable_revision, reset_editable
 from indico.modules.events.editing.schemas import (EditableBasicSchema, EditingRevisionSignedSchema,
                                                    ServiceActionResultSchema, ServiceActionSchema,
@@ -24,10 +31,19 @@ from indico.modules.events.editing.schemas import (EditableBasicSchema, EditingR
 from indico.modules.events.editing.settings import editing_settings
 from indico.modules.users import User
 from indico.util.caching import memoize_redis
+from indico.util.date_time import now_utc
 from indico.util.i18n import _
 from indico.web.flask.util import url_for
 
 
+#: The connect and read timeouts for requests to the editing service
+SERVICE_TIMEOUT = (10, 60)
+#: The number of pending messages loaded at once when sending them to the service
+SERVICE_MESSAGE_BATCH_SIZE = 100
+#: The number of failed attempts after which sending a message is given up
+SERVICE_MESSAGE_MAX_ATTEMPTS = 10
+
+
 class ServiceRequestFailed(Exception):
     def __init__(self, exc):
         error = None
@@ -40,10 +56,28 @@ class ServiceRequestFailed(Exception):
         super().__init__(error or str(exc))
 
 
+@cache
+def _get_session(pid):
+    # each process needs its own session since pooled connections cannot be shared with forked workers
+    session = requests.Session()
+    # connection errors and gateway errors are retried, but only idempotent requests are retried
+    # once the service received them
+    retry = Retry(total=3, backoff_factor=0.5, status_forcelist=(502, 503, 504),
+                  allowed_methods=frozenset({'GET', 'PUT', 'DELETE'}), raise_on_status=False)
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16, max_retries=retry)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+
+def _request(method, url, **kwargs):
+    return _get_session(os.getpid()).request(method, url, timeout=SERVICE_TIMEOUT, **kwargs)
+
+
 @memoize_redis(30)
 def check_service_url(url):
     try:
-        resp = requests.get(url + '/info', allow_redirects=False)
+        resp = _request('GET', url + '/info', allow_redirects=False)
         resp.raise_for_status()
         if resp.status_code != 200:
             raise requests.HTTPError(f'Unexpected status code: {resp.status_code}', response=resp)
@@ -104,8 +138,8 @@ def service_handle_enabled(event):
         'endpoints': _get_event_endpoints(event)
     }
     try:
-        resp = requests.put(_build_url(event, f'/event/{_get_event_identifier(event)}'),
-                            headers=_get_headers(event, include_token=False), json=data)
+        resp = _request('PUT', _build_url(event, f'/event/{_get_event_identifier(event)}'),
+                        headers=_get_headers(event, include_token=False), json=data)
         resp.raise_for_status()
     except requests.RequestException as exc:
         _log_service_error(exc, 'Registering event with service failed')
@@ -114,8 +148,8 @@ def service_handle_enabled(event):
 
 def service_handle_disconnected(event):
     try:
-        resp = requests.delete(_build_url(event, f'/event/{_get_event_identifier(event)}'),
-                               headers=_get_headers(event))
+        resp = _request('DELETE', _build_url(event, f'/event/{_get_event_identifier(event)}'),
+                        headers=_get_headers(event))
         resp.raise_for_status()
     except requests.RequestException as exc:
         _log_service_error(exc, 'Disconnecting event from service failed')
@@ -124,8 +158,8 @@ def service_handle_disconnected(event):
 
 def service_get_status(event):
     try:
-        resp = requests.get(_build_url(event, f'/event/{_get_event_identifier(event)}'),
-                            headers=_get_headers(event))
+        resp = _request('GET', _build_url(event, f'/event/{_get_event_identifier(event)}'),
+                        headers=_get_headers(event))
         resp.raise_for_status()
     except requests.ConnectionError:
         return {'status': None, 'error': _('Connection failed')}
@@ -145,7 +179,7 @@ def service_handle_new_editable(editable, user):
     identifier = _get_event_identifier(editable.event)
     path = f'/event/{identifier}/editable/{editable.type.name}/{editable.contribution_id}'
     try:
-        resp = requests.put(_build_url(editable.event, path), headers=_get_headers(editable.event), json=data)
+        resp = _request('PUT', _build_url(editable.event, path), headers=_get_headers(editable.event), json=data)
         resp.raise_for_status()
         resp = ServiceCreateEditableResultSchema().load(resp.json()) if resp.text else {}
         if resp.get('ready_for_review'):
@@ -166,8 +200,8 @@ def service_handle_review_editable(editable, user, action, parent_revision, new_
     identifier = _get_event_identifier(editable.event)
     path = f'/event/{identifier}/editable/{editable.type.name}/{editable.contribution_id}/{new_revision.id}'
     try:
-        resp = requests.post(_build_url(editable.event, path), headers=_get_headers(editable.event),
-                             json=data)
+        resp = _request('POST', _build_url(editable.event, path), headers=_get_headers(editable.event),
+                        json=data)
         resp.raise_for_status()
         resp = ServiceReviewEditableSchema().load(resp.json())
 
@@ -188,12 +222,66 @@ def service_handle_review_editable(editable, user, action, parent_revision, new_
 
 def service_handle_delete_editable(editable):
     path = f'/event/{_get_event_identifier(editable.event)}/editable/{editable.type.name}/{editable.contribution_id}'
+    _queue_service_message(editable.event, 'DELETE', path)
+
+
+def _queue_service_message(event, method, path, payload=None):
+    """Queue a notification for the editing service.
+
+    The message is sent in the background once the current transaction
+    has been committed, and retried if the service cannot be reached.
+    """
+    event.editing_service_messages.append(EditingServiceMessage(method=method, path=path, payload=payload))
+    if has_app_context():
+        g.editing_service_messages_pending = True
+
+
+def _send_service_message(message):
+    service_url = editing_settings.get(message.event, 'service_url')
+    if not service_url:
+        logger.info('Discarding %r since the event is not connected to the service anymore', message)
+        db.session.delete(message)
+        return
     try:
-        resp = requests.delete(_build_url(editable.event, path), headers=_get_headers(editable.event))
+        resp = _request(message.method, service_url + message.path, headers=_get_headers(message.event),
+                        json=message.payload)
         resp.raise_for_status()
     except requests.RequestException as exc:
-        _log_service_error(exc, 'Calling listener for delete editable failed')
-        raise ServiceRequestFailed(exc)
+        message.attempts += 1
+        message.last_error = str(ServiceRequestFailed(exc))
+        message.next_attempt_dt = now_utc() + timedelta(minutes=2 ** message.attempts)
+        status = exc.response.status_code if exc.response is not None else None
+        if status is not None and 400 <= status < 500 and status != 429:
+            # the service rejected the message, so sending it again is pointless
+            message.attempts = SERVICE_MESSAGE_MAX_ATTEMPTS
+        if message.attempts >= SERVICE_MESSAGE_MAX_ATTEMPTS:
+            logger.error('Giving up sending %r to the editing service: %s', message, message.last_error)
+        else:
+            logger.warning('Sending %r to the editing service failed: %s', message, message.last_error)
+    else:
+        db.session.delete(message)
+
+
+def send_service_messages():
+    """Send pending notifications to the editing service.
+
+    Messages are loaded in batches and sent over a pooled connection.
+    Rows locked by another worker sending messages at the same time are
+    skipped.
+    """
+    while True:
+        messages = (EditingServiceMessage.query
+                    .filter(EditingServiceMessage.next_attempt_dt <= now_utc(),
+                            EditingServiceMessage.attempts < SERVICE_MESSAGE_MAX_ATTEMPTS)
+                    .order_by(EditingServiceMessage.id)
+                    .limit(SERVICE_MESSAGE_BATCH_SIZE)
+                    .with_for_update(skip_locked=True)
+                    .all())
+        if not messages:
+            break
+        for message in messages:
+            _send_service_message(message)
+        db.session.commit()
 
 
 def service_get_custom_actions(editable, revision, user):
@@ -204,7 +292,7 @@ def service_get_custom_actions(editable, revision, user):
     identifier = _get_event_identifier(editable.event)
     path = f'/event/{identifier}/editable/{editable.type.name}/{editable.contribution_id}/{revision.id}/actions'
     try:
-        resp = requests.post(_build_url(editable.event, path), headers=_get_headers(editable.event), json=data)
+        resp = _request('POST', _build_url(editable.event, path), headers=_get_headers(editable.event), json=data)
         resp.raise_for_status()
         return ServiceActionSchema(many=True).load(resp.json())
     except (requests.RequestException, ValidationError) as exc:
@@ -222,7 +310,7 @@ def service_handle_custom_action(editable, revision, user, action):
     identifier = _get_event_identifier(editable.event)
     path = f'/event/{identifier}/editable/{editable.type.name}/{editable.contribution_id}/{revision.id}/action'
     try:
-        resp = requests.post(_build_url(editable.event, path), headers=_get_headers(editable.event), json=data)
+        resp = _request('POST', _build_url(editable.event, path), headers=_get_headers(editable.event), json=data)
         resp.raise_for_status()
         resp = ServiceActionResultSchema().load(resp.json())
     except (requests.RequestException, ValidationError) as exc:
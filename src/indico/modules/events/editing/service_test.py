@@ -6,13 +6,17 @@
 # LICENSE file for more details.
 
 import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from pathlib import Path
+from types import SimpleNamespace
 from unittest.mock import Mock
 
 import pytest
 from itsdangerous import URLSafeSerializer
 
 from indico.modules.events.editing.models.revisions import RevisionType
+from indico.modules.events.editing.models.service_messages import EditingServiceMessage
 from indico.modules.events.editing.settings import editing_settings
 from indico.testing.util import assert_yaml_snapshot
 
@@ -35,6 +39,37 @@ def static_signature(mocker):
     mocker.patch.object(URLSafeSerializer, 'dumps').return_value = 'signature'
 
 
+@pytest.fixture
+def stub_service(dummy_event):
+    """Run a local HTTP server which stands in for the editing service.
+
+    The server records the requests it receives and responds with the
+    status codes queued in ``statuses`` (or 204 once none are left).
+    """
+    received = []
+    statuses = []
+
+    class _Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def do_DELETE(self):
+            received.append((self.path, self.client_address))
+            self.send_response(statuses.pop(0) if statuses else 204)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), _Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    editing_settings.set(dummy_event, 'service_url', f'http://127.0.0.1:{server.server_port}')
+    yield SimpleNamespace(received=received, statuses=statuses)
+    server.shutdown()
+    server.server_close()
+
+
 def _assert_yaml_snapshot(snapshot, data, name):
     __tracebackhide__ = True
     snapshot.snapshot_dir = SNAPSHOT_DIR
@@ -88,10 +123,16 @@ def test_service_handle_review_editable(dummy_editable, dummy_user, dummy_editin
     assert mock_parent_revision.comment == 'foobar'
 
 
-def test_service_handle_delete_editable(dummy_editable, mocked_responses, snapshot):
-    from indico.modules.events.editing.service import service_handle_delete_editable
-    mocked_responses.delete(f'{MOCK_SVC}/event/dummy/editable/paper/420')
+def test_service_handle_delete_editable(db, dummy_editable, mocked_responses):
+    from indico.modules.events.editing.service import send_service_messages, service_handle_delete_editable
+    resp = mocked_responses.delete(f'{MOCK_SVC}/event/dummy/editable/paper/420')
     service_handle_delete_editable(dummy_editable)
+    db.session.flush()
+    # the notification is only sent by the background task
+    assert not resp.calls
+    send_service_messages()
+    assert len(resp.calls) == 1
+    assert not dummy_editable.event.editing_service_messages.has_rows()
 
 
 def test_service_get_custom_action(dummy_editable, dummy_editing_revision, dummy_user, mocked_responses, snapshot):
@@ -123,3 +164,37 @@ def test_service_handle_custom_action(dummy_editable, dummy_editing_revision, du
     assert len(dummy_editing_revision.tags) == 1
     assert len(dummy_editing_revision.comments) == 1
     assert rv['redirect'] == 'https://foo.bar'
+
+
+def test_send_service_messages(db, dummy_event, stub_service):
+    from indico.modules.events.editing.service import _queue_service_message, send_service_messages
+    _queue_service_message(dummy_event, 'DELETE', '/event/dummy/editable/paper/1')
+    _queue_service_message(dummy_event, 'DELETE', '/event/dummy/editable/paper/2')
+    db.session.flush()
+    stub_service.statuses.append(503)
+    send_service_messages()
+    # the first request is retried after the gateway error, and the connection is reused
+    assert [path for path, __ in stub_service.received] == ['/event/dummy/editable/paper/1',
+                                                            '/event/dummy/editable/paper/1',
+                                                            '/event/dummy/editable/paper/2']
+    assert len({address for __, address in stub_service.received}) == 1
+    assert not EditingServiceMessage.query.has_rows()
+
+
+@pytest.mark.parametrize(('statuses', 'requests', 'attempts'), (
+    ([503] * 4, 4, 1),
+    ([404], 1, 10),
+))
+def test_send_service_messages_failed(db, dummy_event, stub_service, statuses, requests, attempts):
+    from indico.modules.events.editing.service import _queue_service_message, send_service_messages
+    _queue_service_message(dummy_event, 'DELETE', '/event/dummy/editable/paper/1')
+    db.session.flush()
+    stub_service.statuses.extend(statuses)
+    send_service_messages()
+    assert len(stub_service.received) == requests
+    message = EditingServiceMessage.query.one()
+    assert message.attempts == attempts
+    assert message.last_error
+    # failed messages are not sent again right away
+    send_service_messages()
+    assert len(stub_service.received) == requests
@@ -0,0 +1,16 @@
+# This file is part of Indico.
+# Copyright (C) 2002 - 2025 CERN
+#
+# Indico is free software; you can redistribute it and/or
+# modify it under the terms of the MIT License; see the
+# LICENSE file for more details.
+
+from celery.schedules import crontab
+
+from indico.core.celery import celery
+from indico.modules.events.editing.service import send_service_messages
+
+
+@celery.periodic_task(name='editing_service_messages', run_every=crontab(minute='*/5'))
+def send_editing_service_messages():
+    send_service_messages()
@@ -5,6 +5,7 @@
 # modify it under the terms of the MIT License; see the
 # LICENSE file for more details.
 
+from collections.abc import Iterable
 from datetime import timedelta
 from email import message
 from email.mime.base import MIMEBase
@@ -196,6 +197,26 @@ def events_to_ical(
     :param method: METHOD field of the iCalendar object
     :param organizer: ORGANIZER field of the iCalendar object
     """
+    return b''.join(iter_events_ical(events, user, scope, skip_access_check=skip_access_check, method=method,
+                                     organizer=organizer))
+
+
+def iter_events_ical(
+    events: Iterable[Event],
+    user: User | None = None,
+    scope: str | None = None,
+    *,
+    skip_access_check: bool = False,
+    method: str | None = None,
+    organizer: tuple[str, str] | None = None
+):
+    """Serialize multiple events into an ical while iterating over them.
+
+    This yields the iCalendar data in chunks, one for each component, so
+    it can be sent to the client without keeping the whole calendar in
+    memory.  The arguments are the same as for `events_to_ical`, except
+    that `events` may be any iterable.
+    """
     from indico.modules.events.contributions.ical import generate_contribution_component
     from indico.modules.events.sessions.ical import generate_session_block_component
 
@@ -206,6 +227,11 @@ def events_to_ical(
     if method:
         calendar.add('method', method)
 
+    # the components are serialized separately and put between the lines
+    # of the (otherwise empty) calendar
+    head, end, tail = calendar.to_ical().rpartition(b'END:VCALENDAR')
+    yield head
+
     for event in events:
         if not skip_access_check and not event.can_access(user):
             continue
@@ -234,6 +260,6 @@ def events_to_ical(
             ]
 
         for component in components:
-            calendar.add_component(component)
+            yield component.to_ical()
 
-    return calendar.to_ical()
+    yield end + tail
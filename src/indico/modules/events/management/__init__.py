@@ -13,6 +13,11 @@ from indico.web.flask.util import url_for
 from indico.web.menu import SideMenuItem, SideMenuSection
 
 
+@signals.core.import_tasks.connect
+def _import_tasks(sender, **kwargs):
+    import indico.modules.events.management.tasks  # noqa: F401
+
+
 @signals.menu.sections.connect_via('event-management-sidemenu')
 def _sidemenu_sections(sender, **kwargs):
     yield SideMenuSection('organization', _('Organization'), 60, icon='list', active=True)
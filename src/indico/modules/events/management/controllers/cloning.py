@@ -8,8 +8,8 @@
 from datetime import datetime, timedelta
 
 from dateutil import rrule
-from flask import flash, jsonify, request, session
-from werkzeug.exceptions import BadRequest
+from flask import current_app, flash, jsonify, request, session
+from werkzeug.exceptions import BadRequest, NotFound
 
 from indico.modules.events.cloning import EventCloner
 from indico.modules.events.management.controllers import RHManageEventBase
@@ -17,8 +17,10 @@ from indico.modules.events.management.forms import (CLONE_REPEAT_CHOICES, CloneC
                                                     CloneRepeatabilityForm, CloneRepeatIntervalForm,
                                                     CloneRepeatOnceForm, CloneRepeatPatternForm, ImportContentsForm,
                                                     ImportSourceEventForm)
+from indico.modules.events.management.views import WPEventSettings
 from indico.modules.events.notifications import notify_event_creation
-from indico.modules.events.operations import clone_event, clone_into_event
+from indico.modules.events.operations import (EVENT_SERIES_CLONE_BATCH_SIZE, clone_event, clone_event_series,
+                                              clone_into_event, get_event_series_clone_status, start_event_series_clone)
 from indico.modules.events.util import get_event_from_url
 from indico.util.i18n import _
 from indico.web.flask.util import url_for
@@ -186,11 +188,14 @@ class RHCloneEvent(RHManageEventBase):
                     # recurring event
                     clone_calculator = get_clone_calculator(form.repeatability.data, self.event)
                     dates = clone_calculator.calculate(request.form)[0]
-                    clones = [
-                        clone_event(self.event, n, start_dt, set(form.selected_items.data), form.category.data,
-                                    form.refresh_users.data)
-                        for n, start_dt in enumerate(dates, 1)
-                    ]
+                    if len(dates) > EVENT_SERIES_CLONE_BATCH_SIZE:
+                        # cloning many events would take too long to run within the request
+                        clone_id = start_event_series_clone(self.event, dates, set(form.selected_items.data),
+                                                            form.category.data, form.refresh_users.data)
+                        return jsonify_data(redirect=url_for('.clone_status', self.event, clone_id=clone_id),
+                                            flash=False)
+                    clones = clone_event_series(self.event, dates, set(form.selected_items.data), form.category.data,
+                                                form.refresh_users.data)
                     if clones:
                         notify_event_creation(clones[0], clones)
                         flash(_('{} new events created.').format(len(clones)), 'success')
@@ -208,6 +213,23 @@ class RHCloneEvent(RHManageEventBase):
                                 cloner_dependencies=dependencies, **tpl_args)
 
 
+class RHCloneEventStatus(RHManageEventBase):
+    """Show the progress of an event series clone running in the background."""
+
+    ALLOW_LOCKED = True
+
+    def _process(self):
+        status = get_event_series_clone_status(self.event, request.view_args['clone_id'])
+        if status is None:
+            raise NotFound(_('This clone operation does not exist or has expired.'))
+        response = current_app.make_response(
+            WPEventSettings.render_template('clone_event_status.html', self.event, 'settings', status=status)
+        )
+        if not status['finished']:
+            response.headers['Refresh'] = '3'
+        return response
+
+
 def _get_import_source_from_url(target_event, url):
     event = get_event_from_url(url)
     if event == target_event:
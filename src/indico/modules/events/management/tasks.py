@@ -0,0 +1,19 @@
+# This file is part of Indico.
+# Copyright (C) 2002 - 2025 CERN
+#
+# Indico is free software; you can redistribute it and/or
+# modify it under the terms of the MIT License; see the
+# LICENSE file for more details.
+
+from flask import session
+
+from indico.core.celery import celery
+from indico.modules.events import logger
+from indico.modules.events.operations import run_event_series_clone
+
+
+@celery.task(name='clone_event_series', request_context=True)
+def clone_event_series_task(clone_id, event, dates, cloners, category, user, *, refresh_users):
+    session.set_session_user(user)
+    logger.info('Cloning %r %d times into %r for %r', event, len(dates), category, user)
+    run_event_series_clone(clone_id, event, dates, cloners, category, refresh_users=refresh_users)
@@ -409,6 +409,7 @@ class Event(SearchableTitleMixin, DescriptionMixin, LocationMixin, ProtectionMan
     # - all_room_reservation_occurrence_links (ReservationOccurrenceLink.event)
     # - all_vc_room_associations (VCRoomEventAssociation.event)
     # - attachment_folders (AttachmentFolder.linked_event)
+    # - attachment_packages (AttachmentPackage.event)
     # - clones (Event.cloned_from)
     # - contribution_fields (ContributionField.event)
     # - contribution_types (ContributionType.event)
@@ -417,6 +418,7 @@ class Event(SearchableTitleMixin, DescriptionMixin, LocationMixin, ProtectionMan
     # - designer_templates (DesignerTemplate.event)
     # - editing_file_types (EditingFileType.event)
     # - editing_review_conditions (EditingReviewCondition.event)
+    # - editing_service_messages (EditingServiceMessage.event)
     # - editing_tags (EditingTag.event)
     # - favorite_of (User.favorite_events)
     # - layout_images (ImageFile.event)
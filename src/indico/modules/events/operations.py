@@ -5,23 +5,28 @@
 # modify it under the terms of the MIT License; see the
 # LICENSE file for more details.
 
+import itertools
+import uuid
+from datetime import timedelta
 from operator import attrgetter
 
 from flask import g, session
 
 from indico.core import signals
+from indico.core.cache import make_scoped_cache
 from indico.core.db import db
 from indico.core.db.sqlalchemy.util.session import no_autoflush
 from indico.modules.categories.models.event_move_request import EventMoveRequest
 from indico.modules.categories.util import format_visibility
 from indico.modules.events import Event, EventLogRealm, logger
-from indico.modules.events.cloning import EventCloner, get_event_cloners
+from indico.modules.events.cloning import EventClonePlan, EventCloner, get_event_cloners
 from indico.modules.events.features import features_event_settings
 from indico.modules.events.layout import layout_settings
 from indico.modules.events.management.settings import privacy_settings
 from indico.modules.events.models.events import EventType
 from indico.modules.events.models.labels import EventLabel
 from indico.modules.events.models.references import ReferenceType
+from indico.modules.events.notifications import notify_event_creation
 from indico.modules.events.util import format_log_person, format_log_ref, split_log_location_changes
 from indico.modules.logs.models.entries import CategoryLogRealm, LogKind
 from indico.modules.logs.util import make_diff_log
@@ -29,6 +34,14 @@ from indico.util.i18n import orig_string
 from indico.util.signals import make_interceptable
 
 
+#: The number of events created and committed at once when cloning an event series in the background
+EVENT_SERIES_CLONE_BATCH_SIZE = 10
+#: How long the status of an event series clone running in the background is kept
+EVENT_SERIES_CLONE_STATUS_TTL = timedelta(days=1)
+
+event_series_clone_cache = make_scoped_cache('event-series-clone')
+
+
 def create_reference_type(data):
     reference_type = ReferenceType()
     reference_type.populate_from_dict(data)
@@ -173,7 +186,8 @@ def clone_event(event, n_occurrence, start_dt, cloners, category=None, refresh_u
 
     :param n_occurrence: The 1-indexed number of the occurrence, if this is a "recurring" clone, otherwise `0`
     :param start_dt: The start datetime of the new event;
-    :param cloners: A set containing the names of all enabled cloners;
+    :param cloners: A set containing the names of all enabled cloners, or
+                    an `EventClonePlan` when cloning the event multiple times;
     :param category: The `Category` the new event will be created in.
     :aparam refresh_users: Whether `EventPerson` data should be updated from
                            their linked `User` object
@@ -192,7 +206,8 @@ def clone_event(event, n_occurrence, start_dt, cloners, category=None, refresh_u
                              add_creator_as_manager=False, cloning=True)
 
     # Run the modular cloning system
-    used_cloners, shared_data = EventCloner.run_cloners(event, new_event, cloners, n_occurrence)
+    plan = cloners if isinstance(cloners, EventClonePlan) else EventClonePlan(event, cloners)
+    used_cloners, shared_data = plan.run(new_event, n_occurrence)
     if refresh_users:
         new_event.refresh_event_persons(notify=False)
     signals.event.cloned.send(event, new_event=new_event, used_cloners=used_cloners, shared_data=shared_data)
@@ -205,6 +220,82 @@ def clone_event(event, n_occurrence, start_dt, cloners, category=None, refresh_u
     return new_event
 
 
+def clone_event_series(event, dates, cloners, category=None, refresh_users=False):
+    """Clone an event on each date of a series.
+
+    The selected cloners are only validated once for the whole series.
+
+    :param dates: The start datetimes of the new events
+    :return: The list of new events
+
+    See :func:`clone_event` for the other arguments.
+    """
+    plan = EventClonePlan(event, cloners)
+    return [clone_event(event, n, start_dt, plan, category, refresh_users) for n, start_dt in enumerate(dates, 1)]
+
+
+def _get_series_clone_cache_key(event, clone_id):
+    return f'{event.id}-{clone_id}'
+
+
+def get_event_series_clone_status(event, clone_id):
+    """Get the status of an event series clone running in the background.
+
+    :return: A dict containing the number of `total` and `created`
+             events, the `category_url` of the new events and whether
+             cloning is `finished`, or ``None`` if there is no such clone.
+    """
+    return event_series_clone_cache.get(_get_series_clone_cache_key(event, clone_id))
+
+
+def _set_event_series_clone_status(event, clone_id, status):
+    event_series_clone_cache.set(_get_series_clone_cache_key(event, clone_id), status, EVENT_SERIES_CLONE_STATUS_TTL)
+
+
+def start_event_series_clone(event, dates, cloners, category, refresh_users=False):
+    """Clone an event on each date of a series in a background task.
+
+    :return: An ID which can be passed to :func:`get_event_series_clone_status`.
+
+    See :func:`clone_event_series` for the arguments.
+    """
+    from indico.modules.events.management.tasks import clone_event_series_task
+    clone_id = str(uuid.uuid4())
+    _set_event_series_clone_status(event, clone_id, {'total': len(dates), 'created': 0, 'category_url': category.url,
+                                                     'finished': False})
+    clone_event_series_task.delay(clone_id, event, dates, cloners, category, session.user,
+                                  refresh_users=refresh_users)
+    return clone_id
+
+
+def run_event_series_clone(clone_id, event, dates, cloners, category, refresh_users=False):
+    """Clone an event on each date of a series in batches.
+
+    This is meant to run in a background task.  The source event is
+    only loaded once per batch, and after each batch the new events are
+    committed and the status updated.
+
+    See :func:`clone_event_series` for the arguments.
+    """
+    status = get_event_series_clone_status(event, clone_id) or {'total': len(dates), 'created': 0,
+                                                                'category_url': category.url}
+    plan = EventClonePlan(event, cloners)
+    clones = []
+    try:
+        for batch in itertools.batched(enumerate(dates, 1), EVENT_SERIES_CLONE_BATCH_SIZE):
+            clones += [clone_event(event, n, start_dt, plan, category, refresh_users) for n, start_dt in batch]
+            db.session.commit()
+            # committing expired everything loaded from the source event
+            plan.clear_source_cache()
+            status['created'] = len(clones)
+            _set_event_series_clone_status(event, clone_id, {**status, 'finished': False})
+        if clones:
+            notify_event_creation(clones[0], clones)
+        logger.info('Cloned %r %d times into %r', event, len(clones), category)
+    finally:
+        _set_event_series_clone_status(event, clone_id, {**status, 'finished': True})
+
+
 def clone_into_event(source_event, target_event, cloners):
     """Clone data into an existing event.
 
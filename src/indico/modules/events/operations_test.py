@@ -5,13 +5,14 @@
 # modify it under the terms of the MIT License; see the
 # LICENSE file for more details.
 
-from datetime import datetime
+from datetime import datetime, timedelta
 
 import pytest
 from flask import session
 
-from indico.modules.events.operations import clone_event
+from indico.modules.events.operations import clone_event, get_event_series_clone_status, run_event_series_clone
 from indico.modules.events.settings import event_language_settings
+from indico.modules.events.timetable.operations import schedule_contribution
 
 
 @pytest.mark.usefixtures('request_context')
@@ -27,3 +28,30 @@ def test_language_settings_cloned(dummy_event, dummy_user):
     assert event_language_settings.get(new_event, 'default_locale') == 'fr_FR'
     assert event_language_settings.get(new_event, 'enforce_locale')
     assert event_language_settings.get(new_event, 'supported_locales') == ['es_ES', 'en_GB']
+
+
+@pytest.mark.usefixtures('request_context')
+def test_run_event_series_clone(mocker, dummy_event, dummy_user, create_contribution, create_subcontribution):
+    mocker.patch('indico.modules.events.operations.EVENT_SERIES_CLONE_BATCH_SIZE', 2)
+    notify_event_creation = mocker.patch('indico.modules.events.operations.notify_event_creation')
+    session.set_session_user(dummy_user)
+    for i in range(3):
+        contrib = create_contribution(dummy_event, f'Contribution {i}')
+        create_subcontribution(contrib, f'Subcontribution {i}')
+        schedule_contribution(contrib, dummy_event.start_dt + timedelta(minutes=20 * i))
+    dates = [dummy_event.start_dt + timedelta(weeks=n) for n in range(1, 6)]
+
+    run_event_series_clone('test', dummy_event, dates, {'timetable'}, dummy_event.category)
+    status = get_event_series_clone_status(dummy_event, 'test')
+    assert status['finished']
+    assert status['created'] == status['total'] == 5
+    clones = notify_event_creation.call_args.args[1]
+    assert [clone.start_dt for clone in clones] == dates
+    contrib_ids = set()
+    for clone in clones:
+        assert sorted(contrib.title for contrib in clone.contributions) == [f'Contribution {i}' for i in range(3)]
+        assert sorted(subcontrib.title for contrib in clone.contributions
+                      for subcontrib in contrib.subcontributions) == [f'Subcontribution {i}' for i in range(3)]
+        assert clone.timetable_entries.count() == 3
+        contrib_ids |= {contrib.id for contrib in clone.contributions}
+    assert len(contrib_ids) == 15
@@ -10,7 +10,6 @@ from collections import namedtuple
 from itertools import product
 
 from reportlab.lib.units import cm
-from reportlab.lib.utils import ImageReader
 from werkzeug.exceptions import BadRequest
 
 from indico.core import signals
@@ -35,10 +34,33 @@ class RegistrantsListToBadgesPDF(DesignerPDFBase):
         super().__init__(template, config)
         from indico.modules.events.registration.util import get_persons
         self.persons = get_persons(registrations, include_accompanying_persons)
+        self.placeholders = get_placeholders(self.placeholders_context)
+        self._sorted_items = {}
+        self._field_placeholders = {}
 
     def _build_config(self, config_data):
         return ConfigData(**config_data)
 
+    def _get_sorted_items(self, tpl_data):
+        """Get the items of a template in the order they need to be drawn."""
+        try:
+            return self._sorted_items[id(tpl_data)]
+        except KeyError:
+            pass
+        # Print images first
+        image_placeholders = {name for name, placeholder in self.placeholders.items() if placeholder.is_image}
+        items = sorted(tpl_data.items, key=lambda item: (int(item.get('zIndex', 10)),
+                                                         item['type'] not in image_placeholders))
+        self._sorted_items[id(tpl_data)] = items
+        return items
+
+    def _get_field_placeholder(self, regform, item):
+        from indico.modules.designer.placeholders import RegistrationFormFieldPlaceholder
+        key = (regform.id, item['type'])
+        if key not in self._field_placeholders:
+            self._field_placeholders[key] = RegistrationFormFieldPlaceholder.from_designer_item(regform, item)
+        return self._field_placeholders[key]
+
     def _iter_position(self, canvas, n_horizonal, n_vertical):
         """Go over every possible position on the page."""
         config = self.config
@@ -84,25 +106,17 @@ class RegistrantsListToBadgesPDF(DesignerPDFBase):
             canvas.restoreState()
 
         if template.background_image:
-            with template.background_image.open() as f:
-                self._draw_background(canvas, ImageReader(self._remove_transparency(f)), tpl_data, *badge_rect)
-
-        placeholders = get_placeholders(self.placeholders_context)
-
-        # Print images first
-        image_placeholders = {name for name, placeholder in placeholders.items() if placeholder.is_image}
-        items = sorted(tpl_data.items, key=lambda item: (int(item.get('zIndex', 10)),
-                                                         item['type'] not in image_placeholders))
+            self._draw_background_form(canvas, template, tpl_data, *badge_rect)
 
+        items = self._get_sorted_items(tpl_data)
         for item in items:
             if is_regform_field_placeholder(item):
-                from indico.modules.designer.placeholders import RegistrationFormFieldPlaceholder
-                placeholder = RegistrationFormFieldPlaceholder.from_designer_item(regform, item)
+                placeholder = self._get_field_placeholder(regform, item)
                 if placeholder is None:
                     # the regform field referenced by the designer item does not exist
                     continue
             else:
-                placeholder = placeholders.get(item['type'])
+                placeholder = self.placeholders.get(item['type'])
 
             if placeholder:
                 if placeholder.group == 'registrant':
@@ -52,6 +52,8 @@ _bp.add_url_rule('/manage/registration/<int:reg_form_id>/display', 'manage_regfo
 # Registrations management
 _bp.add_url_rule('/manage/registration/<int:reg_form_id>/registrations/', 'manage_reglist',
                  reglists.RHRegistrationsListManage)
+_bp.add_url_rule('/manage/registration/<int:reg_form_id>/registrations/data', 'manage_reglist_data',
+                 reglists.RHRegistrationsListData)
 _bp.add_url_rule('/manage/registration/<int:reg_form_id>/registrations/customize', 'customize_reglist',
                  reglists.RHRegistrationsListCustomize, methods=('GET', 'POST'))
 _bp.add_url_rule('/manage/registration/<int:reg_form_id>/registrations/static-url', 'generate_static_url',
@@ -113,6 +115,8 @@ _bp.add_url_rule('/manage/registration/<int:reg_form_id>/registrations/email-pre
                  reglists.RHRegistrationEmailRegistrantsPreview, methods=('GET', 'POST'))
 _bp.add_url_rule('/manage/registration/<int:reg_form_id>/registrations/import', 'registrations_import',
                  reglists.RHRegistrationsImport, methods=('GET', 'POST'))
+_bp.add_url_rule('/manage/registration/<int:reg_form_id>/registrations/import/<uuid:import_id>',
+                 'registrations_import_status', reglists.RHRegistrationsImportStatus)
 _bp.add_url_rule('/manage/registration/<int:reg_form_id>/registrations/table.pdf', 'registrations_pdf_export_table',
                  reglists.RHRegistrationsExportPDFTable, methods=('POST',))
 _bp.add_url_rule('/manage/registration/<int:reg_form_id>/registrations/book.pdf', 'registrations_pdf_export_book',
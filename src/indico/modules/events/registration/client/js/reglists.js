@@ -7,8 +7,8 @@
 
 /* eslint-disable import/unambiguous */
 /* global setupListGenerator:false, getSelectedRows:false, handleSelectedRowHighlight:false,
-          setupTableSorter:false, ajaxDialog:false, handleAjaxError:false, confirmPrompt:false,
-          build_url:false */
+          setupTableSorter:false, handleRowSelection:false, ajaxDialog:false, handleAjaxError:false,
+          confirmPrompt:false, build_url:false */
 
 import {showUserSearch} from 'indico/react/components/principals/imperative';
 import {$T} from 'indico/utils/i18n';
@@ -17,8 +17,9 @@ import {$T} from 'indico/utils/i18n';
   global.setupRegistrationList = function setupRegistrationList() {
     setupListGenerator();
 
-    function handleRegListRowSelection() {
-      $('table.i-table input.select-row')
+    function handleRegListRowSelection($rows = $('table.i-table')) {
+      $rows
+        .find('input.select-row')
         .on('change', function() {
           $('.regform-download-attachments').toggleClass(
             'disabled',
@@ -26,7 +27,8 @@ import {$T} from 'indico/utils/i18n';
           );
         })
         .trigger('change');
-      $('table.i-table input.select-row')
+      $rows
+        .find('input.select-row')
         .on('change', function() {
           $('.regform-download-documents').toggleClass(
             'disabled',
@@ -36,6 +38,46 @@ import {$T} from 'indico/utils/i18n';
         .trigger('change');
     }
 
+    function loadRemainingRegistrations() {
+      // only the first page of the list is rendered with the page, the other
+      // registrations are appended one page after the other
+      const $table = $('#registration-list table[data-next-page-after]');
+      if (!$table.length || $table.data('loading')) {
+        return;
+      }
+      $table.data('loading', true);
+      $.ajax({
+        url: build_url($table.data('page-url'), {after: $table.attr('data-next-page-after')}),
+        error(xhr) {
+          $table.data('loading', false);
+          handleAjaxError(xhr);
+        },
+        success(data) {
+          $table.data('loading', false);
+          if (!$.contains(document.body, $table[0])) {
+            // the list has been reloaded in the meantime
+            return;
+          }
+          const $rows = $($.parseHTML(data.html)).filter('tr');
+          $table.children('tbody').append($rows);
+          handleRowSelection(false, $rows);
+          handleRegListRowSelection($rows);
+          $table.trigger('update');
+          if (data.after) {
+            $table.attr('data-next-page-after', data.after);
+            loadRemainingRegistrations();
+          } else {
+            $table.removeAttr('data-next-page-after');
+            $('.js-registrations-loading').remove();
+          }
+        },
+      });
+    }
+
+    $('.list').on('indico:htmlUpdated', function() {
+      loadRemainingRegistrations();
+    });
+
     $('body').on('click', '#preview-email', function() {
       const $this = $(this);
       ajaxDialog({
@@ -101,6 +143,7 @@ import {$T} from 'indico/utils/i18n';
             handleSelectedRowHighlight(true);
             handleRegListRowSelection();
             setupTableSorter();
+            loadRemainingRegistrations();
           }
         },
       });
@@ -127,10 +170,12 @@ import {$T} from 'indico/utils/i18n';
           handleSelectedRowHighlight(true);
           handleRegListRowSelection();
           setupTableSorter();
+          loadRemainingRegistrations();
         }
       },
     });
 
     handleRegListRowSelection();
+    loadRemainingRegistrations();
   };
 })(window);
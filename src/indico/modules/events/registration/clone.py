@@ -203,6 +203,7 @@ class RegistrationCloner(EventCloner):
                                 )
                             )
                         ]
+            new_registration.update_field_values()
             db.session.flush()
             signals.event.registration_state_updated.send(new_registration, previous_state=None)
 
@@ -10,14 +10,13 @@ import itertools
 import os
 import uuid
 from collections import defaultdict
-from contextlib import contextmanager
 from io import BytesIO
 from operator import attrgetter
 
-from flask import flash, jsonify, redirect, render_template, request, session
+from flask import current_app, flash, jsonify, redirect, render_template, request, session
 from pypdf import PdfWriter
 from sqlalchemy.orm import joinedload, subqueryload
-from webargs import fields
+from webargs import fields, validate
 from werkzeug.exceptions import BadRequest, Forbidden, NotFound
 
 from indico.core import signals
@@ -46,18 +45,20 @@ from indico.modules.events.registration.forms import (BadgeSettingsForm, CreateM
                                                       EmailRegistrantsForm, ImportRegistrationsForm, PublishReceiptForm,
                                                       RegistrationBasePriceForm,
                                                       RegistrationExceptionalModificationForm, RejectRegistrantsForm)
+from indico.modules.events.registration.lists import LIST_PAGE_SIZE
 from indico.modules.events.registration.models.items import PersonalDataType, RegistrationFormItemType
 from indico.modules.events.registration.models.registrations import Registration, RegistrationData, RegistrationState
 from indico.modules.events.registration.notifications import (notify_registration_receipt_created,
                                                               notify_registration_state_update)
 from indico.modules.events.registration.placeholders.registrations import PicturePlaceholder
 from indico.modules.events.registration.settings import event_badge_settings
-from indico.modules.events.registration.util import (ActionMenuEntry, create_registration,
-                                                     generate_spreadsheet_from_registrations,
+from indico.modules.events.registration.util import (REGISTRATION_IMPORT_BATCH_SIZE, ActionMenuEntry,
+                                                     create_registration, generate_spreadsheet_from_registrations,
                                                      get_flat_section_submission_data, get_initial_form_values,
-                                                     get_ticket_attachments, get_title_uuid, get_user_data,
-                                                     import_registrations_from_csv, load_registration_schema,
-                                                     make_registration_schema)
+                                                     get_registration_import_status, get_ticket_attachments,
+                                                     get_title_uuid, get_user_data, import_registrations,
+                                                     load_registration_schema, make_registration_schema,
+                                                     parse_registrations_csv, start_registration_import)
 from indico.modules.events.registration.views import WPManageRegistration
 from indico.modules.events.util import ZipGeneratorMixin
 from indico.modules.logs import LogKind
@@ -178,8 +179,14 @@ class RHRegistrationsListManage(RHManageRegFormBase):
             reverse=True
         )
 
+        has_pending_registrations = (Registration.query
+                                     .with_parent(regform)
+                                     .filter(~Registration.is_deleted, Registration.state == RegistrationState.pending)
+                                     .has_rows())
         return WPManageRegistration.render_template('management/regform_reglist.html', self.event,
-                                                    action_menu_items=action_menu_items, **reg_list_kwargs)
+                                                    action_menu_items=action_menu_items,
+                                                    has_pending_registrations=has_pending_registrations,
+                                                    **reg_list_kwargs)
 
 
 class RHRegistrationsListCustomize(RHManageRegFormBase):
@@ -211,6 +218,21 @@ class RHRegistrationListStaticURL(RHManageRegFormBase):
         return jsonify(url=self.list_generator.generate_static_url())
 
 
+class RHRegistrationsListData(RHManageRegFormBase):
+    """Get a page of the registrations list of a registration form."""
+
+    ALLOW_LOCKED = True
+
+    @use_kwargs({
+        'sort': fields.String(load_default='name'),
+        'desc': fields.Bool(load_default=False),
+        'after': fields.Int(load_default=None),
+        'limit': fields.Int(load_default=LIST_PAGE_SIZE, validate=validate.Range(1, 1000)),
+    }, location='query')
+    def _process(self, sort, desc, after, limit):
+        return jsonify(self.list_generator.get_list_page(sort=sort, desc=desc, after=after, limit=limit))
+
+
 class RHRegistrationDetails(RHManageRegistrationBase):
     """Display information about a registration."""
 
@@ -505,10 +527,16 @@ class RHRegistrationsImport(RHRegistrationsActionBase):
                 raise Forbidden(_('Registration is disabled due to an expired retention period'))
             skip_moderation = self.regform.moderation_enabled and form.skip_moderation.data
             delimiter = form.delimiter.data.delimiter
-            registrations = import_registrations_from_csv(self.regform, form.source_file.data,
-                                                          skip_moderation=skip_moderation,
-                                                          notify_users=form.notify_users.data,
-                                                          delimiter=delimiter)
+            records = parse_registrations_csv(self.regform, form.source_file.data, delimiter=delimiter)
+            if len(records) > REGISTRATION_IMPORT_BATCH_SIZE:
+                # large imports would take too long to run within the request
+                import_id = start_registration_import(self.regform, records, skip_moderation=skip_moderation,
+                                                      notify_users=form.notify_users.data)
+                return jsonify_data(flash=False, redirect_no_loading=True,
+                                    redirect=url_for('.registrations_import_status', self.regform,
+                                                     import_id=import_id))
+            registrations = import_registrations(self.regform, records, skip_moderation=skip_moderation,
+                                                 notify_users=form.notify_users.data)
             flash(ngettext('{} registration has been imported.',
                            '{} registrations have been imported.',
                            len(registrations)).format(len(registrations)), 'success')
@@ -518,6 +546,22 @@ class RHRegistrationsImport(RHRegistrationsActionBase):
                                 regform=self.regform)
 
 
+class RHRegistrationsImportStatus(RHManageRegFormBase):
+    """Show the progress of a registration import running in the background."""
+
+    def _process(self):
+        status = get_registration_import_status(self.regform, request.view_args['import_id'])
+        if status is None:
+            raise NotFound(_('This import does not exist or has expired.'))
+        response = current_app.make_response(
+            WPManageRegistration.render_template('management/import_registrations_status.html', self.event,
+                                                 regform=self.regform, status=status)
+        )
+        if not status['finished']:
+            response.headers['Refresh'] = '3'
+        return response
+
+
 class RHRegistrationsPrintBadges(RHRegistrationsActionBase):
     ALLOW_LOCKED = True
     normalize_url_spec = {
@@ -1011,14 +1055,15 @@ class RHRegistrationsExportReceipts(ZipGeneratorMixin, RHRegistrationsActionBase
             outputbuf.seek(0)
             yield _FileWrapper(outputbuf, f'{template.title}-{template.id}.pdf')
 
-    @contextmanager
-    def _get_item_path(self, item):
+    def _open_item(self, item):
         if isinstance(item, _FileWrapper):
-            yield item.content
-            return
+            return item.content
+        return item[1].open()
 
-        with item[1].get_local_path() as path:
-            yield path
+    def _get_item_size(self, item):
+        if isinstance(item, _FileWrapper):
+            return item.content.getbuffer().nbytes
+        return item[1].size
 
     @use_kwargs({
         'combined': fields.Bool(load_default=False),
@@ -5,15 +5,18 @@
 # modify it under the terms of the MIT License; see the
 # LICENSE file for more details.
 
+import json
 from copy import deepcopy
 from decimal import Decimal
 
 from markupsafe import Markup
 from marshmallow import fields, validate
 
+from indico.core.db import db
 from indico.core.marshmallow import mm
 from indico.modules.events.registration.custom import RegistrationListColumn
-from indico.modules.events.registration.models.registrations import RegistrationData
+from indico.modules.events.registration.models.field_values import RegistrationFieldValue
+from indico.modules.events.registration.models.registrations import Registration, RegistrationData
 from indico.util.i18n import _
 from indico.util.marshmallow import not_empty
 
@@ -70,6 +73,9 @@ class RegistrationFormFieldBase:
     #: on the frontend it depends solely on the config in the field registry whether
     #: the field can be selected as a condition.
     allow_condition = False
+    #: whether the values of this field are copied to `RegistrationFieldValue`
+    #: so registrations can be filtered by them using an index
+    is_indexed = False
 
     def __init__(self, form_item):
         self.form_item = form_item
@@ -150,6 +156,28 @@ class RegistrationFormFieldBase:
         """
         return RegistrationData.data.op('#>>')('{}').in_(data_list)
 
+    def get_indexed_values(self, data):
+        """Get the values stored as `RegistrationFieldValue` for the field.
+
+        The values need to have the same format as the keys of
+        `filter_choices` since they are used to filter registrations.
+
+        :param data: The registration data of the field
+        :return: A set of strings
+        """
+        if not self.is_indexed or data is None or isinstance(data, (dict, list)):
+            return set()
+        return {data if isinstance(data, str) else json.dumps(data)}
+
+    def create_indexed_sql_filter(self, data_list):
+        """
+        Create a SQL criterion to check whether one of the registration's
+        indexed values of the field is in `data_list`.  This is used
+        instead of `create_sql_filter` for fields with `is_indexed` set.
+        """
+        return Registration.field_values.any(db.and_(RegistrationFieldValue.field_id == self.form_item.id,
+                                                     RegistrationFieldValue.value.in_(data_list)))
+
     def create_setup_schema(self, context=None):
         name = f'{type(self).__name__}SetupDataSchema'
         schema = self.setup_schema_base_cls.from_dict(self.setup_schema_fields, name=name)
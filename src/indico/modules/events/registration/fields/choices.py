@@ -122,6 +122,7 @@ class ChoiceBaseField(RegistrationFormBillableItemsField):
     mm_field_class = fields.Dict
     mm_field_kwargs = {'keys': fields.String(), 'values': fields.Integer()}
     allow_condition = True
+    is_indexed = True
 
     @classmethod
     def unprocess_field_data(cls, versioned_data, unversioned_data):
@@ -203,6 +204,9 @@ class ChoiceBaseField(RegistrationFormBillableItemsField):
     def create_sql_filter(self, data_list):
         return RegistrationData.data.has_any(db.func.cast(data_list, ARRAY(db.String)))
 
+    def get_indexed_values(self, data):
+        return set(data) if data else set()
+
     def calculate_price(self, reg_data, versioned_data):
         if not reg_data:
             return 0
@@ -485,6 +489,7 @@ class AccommodationField(RegistrationFormBillableItemsField):
     mm_field_class = fields.Nested
     mm_field_args = (AccommodationSchema,)
     allow_condition = True
+    is_indexed = True
 
     def _get_default_value(self, *, ui):
         versioned_data = self.form_item.versioned_data
@@ -619,6 +624,9 @@ class AccommodationField(RegistrationFormBillableItemsField):
             friendly_data['nights'] = 0
         return friendly_data['choice'] if for_humans or for_search else friendly_data
 
+    def get_indexed_values(self, data):
+        return {data['choice']} if data and data.get('choice') else set()
+
     def calculate_price(self, reg_data, versioned_data):
         if not reg_data:
             return 0
@@ -14,7 +14,8 @@ from sqlalchemy.orm import joinedload
 from indico.core.db.sqlalchemy import db
 from indico.modules.events.registration.controllers.display import RHRegistrationForm
 from indico.modules.events.registration.fields.base import FieldSetupSchemaBase, RegistrationFormFieldBase
-from indico.modules.events.registration.models.registrations import RegistrationData
+from indico.modules.events.registration.models.field_values import RegistrationFieldValue
+from indico.modules.events.registration.models.registrations import Registration, RegistrationData
 from indico.modules.events.sessions.models.blocks import SessionBlock
 from indico.modules.events.sessions.models.sessions import Session
 from indico.util.date_time import format_interval, format_skeleton
@@ -43,6 +44,7 @@ class SessionsField(RegistrationFormFieldBase):
     mm_field_class = fields.List
     mm_field_args = (fields.Integer,)
     setup_schema_base_cls = SessionsFieldDataSchema
+    is_indexed = True
 
     @property
     def default_value(self):
@@ -104,3 +106,12 @@ class SessionsField(RegistrationFormFieldBase):
     def create_sql_filter(self, data_list):
         data_list = json.dumps(list(map(int, data_list)))
         return RegistrationData.data.op('@>')(db.func.jsonb(data_list))
+
+    def get_indexed_values(self, data):
+        return {str(block_id) for block_id in data} if data else set()
+
+    def create_indexed_sql_filter(self, data_list):
+        # registrations need to contain all the selected session blocks
+        return db.and_(*(Registration.field_values.any(db.and_(RegistrationFieldValue.field_id == self.form_item.id,
+                                                                RegistrationFieldValue.value == value))
+                         for value in data_list))
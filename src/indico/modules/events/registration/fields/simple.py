@@ -106,6 +106,7 @@ class CheckboxField(RegistrationFormBillableField):
     mm_field_class = fields.Boolean
     setup_schema_base_cls = LimitedPlacesBillableFieldDataSchema
     allow_condition = True
+    is_indexed = True
     friendly_data_mapping = {None: '',
                              True: L_('Yes'),
                              False: L_('No')}
@@ -254,6 +255,7 @@ class BooleanField(RegistrationFormBillableField):
     setup_schema_base_cls = BooleanFieldSetupSchema
     not_empty_if_required = False
     allow_condition = True
+    is_indexed = True
     friendly_data_mapping = {None: '',
                              True: L_('Yes'),
                              False: L_('No')}
@@ -320,6 +322,7 @@ class PhoneField(RegistrationFormFieldBase):
 class CountryField(RegistrationFormFieldBase):
     name = 'country'
     mm_field_class = fields.String
+    is_indexed = True
     setup_schema_fields = {
         'use_affiliation_country': fields.Bool(),
     }
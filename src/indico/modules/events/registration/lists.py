@@ -6,7 +6,8 @@
 # LICENSE file for more details.
 
 from flask import request
-from sqlalchemy.orm import joinedload, undefer
+from sqlalchemy.orm import selectinload, undefer
+from werkzeug.exceptions import BadRequest
 
 from indico.core import signals
 from indico.core.db import db
@@ -22,6 +23,10 @@ from indico.util.string import natural_sort_key
 from indico.web.flask.templating import get_template_module
 
 
+#: The default number of registrations in a page of the registration list
+LIST_PAGE_SIZE = 100
+
+
 class RegistrationListGenerator(ListGeneratorBase):
     """Listing and filtering actions in the registration list."""
 
@@ -165,10 +170,9 @@ class RegistrationListGenerator(ListGeneratorBase):
         return (Registration.query
                 .with_parent(self.regform)
                 .filter(~Registration.is_deleted)
-                .options(joinedload('data').joinedload('field_data').joinedload('field'),
-                         joinedload('tags'),
-                         undefer('num_receipt_files'))
-                .order_by(db.func.lower(Registration.last_name), db.func.lower(Registration.first_name)))
+                .options(selectinload('data').joinedload('field_data').joinedload('field'),
+                         selectinload('tags'),
+                         undefer('num_receipt_files')))
 
     def _apply_extra_filters(self, registrations, filters):
         if not (extra_filters := filters.get('extra')):
@@ -191,10 +195,15 @@ class RegistrationListGenerator(ListGeneratorBase):
                          if name in self.extra_filters}
         if not field_filters and not filters['items'] and not extra_filters:
             return query
+        # indexed fields are filtered using their `RegistrationFieldValue` rows, the
+        # others by checking the JSON data of the registrations
         criteria = [db.and_(RegistrationFormFieldData.field_id == field_id,
                             field_types[field_id].create_sql_filter(data_list))
-                    for field_id, data_list in field_filters.items()]
-        items_criteria = []
+                    for field_id, data_list in field_filters.items()
+                    if not field_types[field_id].is_indexed]
+        items_criteria = [field_types[field_id].create_indexed_sql_filter(data_list)
+                          for field_id, data_list in field_filters.items()
+                          if field_types[field_id].is_indexed]
         if 'checked_in' in filters['items']:
             checked_in_values = filters['items']['checked_in']
             # If both values 'true' and 'false' are selected, there's no point in filtering
@@ -229,7 +238,7 @@ class RegistrationListGenerator(ListGeneratorBase):
             if len(receipts_present_values) == 1:
                 items_criteria.append(Registration.receipt_files.any() == bool(int(receipts_present_values[0])))
 
-        if field_filters:
+        if criteria:
             subquery = (RegistrationData.query
                         .with_entities(db.func.count(RegistrationData.registration_id))
                         .join(RegistrationData.field_data)
@@ -237,7 +246,7 @@ class RegistrationListGenerator(ListGeneratorBase):
                         .filter(db.or_(*criteria))
                         .correlate(Registration)
                         .scalar_subquery())
-            query = query.filter(subquery == len(field_filters))
+            query = query.filter(subquery == len(criteria))
 
         for impl, values in extra_filters.items():
             query = impl.modify_query(query, values)
@@ -251,28 +260,129 @@ class RegistrationListGenerator(ListGeneratorBase):
         item_ids = [item_id for item_id in item_ids if item_id not in extra_item_ids]
         return (*super()._split_item_ids(item_ids, separator_type), extra_item_ids)
 
+    def _get_list_columns(self, item_ids, registrations):
+        dynamic_item_ids, static_item_ids, extra_item_ids = self._split_item_ids(item_ids, 'dynamic')
+        extra_columns = self._get_extra_columns(extra_item_ids)
+        for col in extra_columns:
+            col.data = col.load_data(registrations)
+        return {
+            'static_columns': self._get_static_columns(static_item_ids),
+            'extra_columns': extra_columns,
+            'dynamic_columns': self._get_sorted_regform_items(dynamic_item_ids),
+        }
+
+    def _get_sort_columns(self, sort):
+        """Get the SQL expressions used to sort the list by a column.
+
+        :param sort: The id of a static item or a registration form field
+        """
+        static_columns = {
+            'id': [Registration.friendly_id],
+            'name': [db.func.lower(Registration.last_name), db.func.lower(Registration.first_name)],
+            'reg_date': [Registration.submitted_dt],
+            'state': [Registration.state],
+            'checked_in': [Registration.checked_in],
+            'consent_to_publish': [Registration.consent_to_publish],
+            'participant_hidden': [Registration.participant_hidden],
+        }
+        if sort in static_columns:
+            return static_columns[sort]
+        try:
+            field_id = int(self._column_ids_to_db([sort])[0])
+        except (KeyError, ValueError):
+            raise BadRequest(f'Cannot sort by {sort}')
+        field = next((item for item in self.regform.form_items if item.id == field_id and item.is_field), None)
+        if field is None:
+            raise BadRequest(f'Cannot sort by {sort}')
+        value = (RegistrationData.query
+                 .with_entities(RegistrationData.data[()].astext)
+                 .join(RegistrationData.field_data)
+                 .filter(RegistrationData.registration_id == Registration.id,
+                         RegistrationFormFieldData.field_id == field.id)
+                 .correlate(Registration)
+                 .scalar_subquery())
+        return [db.func.lower(db.func.coalesce(value, ''))]
+
+    def _get_page(self, query, filters, sort='name', desc=False, after=None, limit=LIST_PAGE_SIZE):
+        """Get a page of registrations from a query.
+
+        The registrations are sorted and paginated in SQL, using keyset
+        pagination: a page starts right after the sort values of the last
+        registration of the previous page.  Filters which can only be
+        applied in Python (see `CustomRegistrationListItem.filter_list`)
+        are applied to the page, so it may contain less than `limit`
+        registrations.
+
+        :param query: The query returning the (filtered) registrations
+        :param filters: The filters of the list
+        :param sort: The id of the column to sort by
+        :param desc: Whether to sort in descending order
+        :param after: The id of the last registration of the previous page
+        :param limit: The maximum number of registrations in the page
+        :return: A tuple containing the registrations and the `after` value
+                 to get the next page (``None`` if there are no further pages)
+        """
+        sort_columns = [*self._get_sort_columns(sort), Registration.id]
+        if after is not None:
+            last = (Registration.query
+                    .with_parent(self.regform)
+                    .filter_by(id=after)
+                    .with_entities(*sort_columns)
+                    .first())
+            if last is None:
+                raise BadRequest('Invalid registration')
+            sort_key = db.tuple_(*sort_columns)
+            last_key = db.tuple_(*(db.literal(value, type_=col.type)
+                                   for col, value in zip(sort_columns, last, strict=True)))
+            query = query.filter(sort_key < last_key if desc else sort_key > last_key)
+        registrations = query.order_by(*(col.desc() if desc else col for col in sort_columns)).limit(limit + 1).all()
+        next_after = registrations[limit - 1].id if len(registrations) > limit else None
+        return self._apply_extra_filters(registrations[:limit], filters), next_after
+
     def get_list_kwargs(self):
+        """Get the data needed to render the registration list.
+
+        Only the first page of the list is included; the remaining
+        registrations are loaded by the client using `get_list_page`.
+        """
         reg_list_config = self._get_config()
+        filters = reg_list_config['filters']
         registrations_query = self._build_query()
         total_entries = registrations_query.count()
-        registrations = self._filter_list_entries(registrations_query, reg_list_config['filters']).all()
-        registrations = self._apply_extra_filters(registrations, reg_list_config['filters'])
-        dynamic_item_ids, static_item_ids, extra_item_ids = self._split_item_ids(reg_list_config['items'], 'dynamic')
-        static_columns = self._get_static_columns(static_item_ids)
-        extra_columns = self._get_extra_columns(extra_item_ids)
-        for col in extra_columns:
-            col.data = col.load_data(registrations)
-        regform_items = self._get_sorted_regform_items(dynamic_item_ids)
+        query = self._filter_list_entries(registrations_query, filters)
+        filtered_entries = query.count()
+        registrations, next_page_after = self._get_page(query, filters)
         return {
             'regform': self.regform,
             'registrations': registrations,
             'total_registrations': total_entries,
-            'static_columns': static_columns,
-            'extra_columns': extra_columns,
-            'dynamic_columns': regform_items,
-            'filtering_enabled': total_entries != len(registrations)
+            'filtered_registrations': filtered_entries,
+            'next_page_after': next_page_after,
+            **self._get_list_columns(reg_list_config['items'], registrations),
+            'filtering_enabled': total_entries != filtered_entries
         }
 
+    def get_list_page(self, sort='name', desc=False, after=None, limit=LIST_PAGE_SIZE):
+        """Get a page of the registration list.
+
+        :param sort: The id of the column to sort by
+        :param desc: Whether to sort in descending order
+        :param after: The id of the last registration of the previous page
+        :param limit: The maximum number of registrations in the page
+        :return: A dict containing the HTML of the table rows and the
+                 `after` value to get the next page (``None`` if there
+                 are no further pages).
+        """
+        reg_list_config = self._get_config()
+        filters = reg_list_config['filters']
+        query = self._filter_list_entries(self._build_query(), filters)
+        registrations, next_page_after = self._get_page(query, filters, sort=sort, desc=desc, after=after,
+                                                        limit=limit)
+        tpl = get_template_module('events/registration/management/_reglist.html')
+        html = tpl.render_registration_rows(self.regform, registrations,
+                                            **self._get_list_columns(reg_list_config['items'], registrations))
+        return {'html': html, 'after': next_page_after}
+
     def get_list_export_config(self):
         static_item_ids, item_ids, _extra_item_ids = self.get_item_ids()
         return {
@@ -0,0 +1,53 @@
+# This file is part of Indico.
+# Copyright (C) 2002 - 2025 CERN
+#
+# Indico is free software; you can redistribute it and/or
+# modify it under the terms of the MIT License; see the
+# LICENSE file for more details.
+
+import re
+
+import pytest
+
+from indico.modules.events.registration.lists import RegistrationListGenerator
+from indico.modules.events.registration.models.registrations import Registration
+from indico.modules.events.registration.util import create_registration
+
+
+def _get_names(html):
+    ids = [int(id_) for id_ in re.findall(r'id="registration-(\d+)"', html)]
+    return [Registration.get_or_404(id_).display_full_name for id_ in ids]
+
+
+def _get_all_pages(generator, **kwargs):
+    pages = [generator.get_list_page(limit=2, **kwargs)]
+    while pages[-1]['after'] is not None:
+        pages.append(generator.get_list_page(after=pages[-1]['after'], limit=2, **kwargs))
+    return pages
+
+
+@pytest.mark.usefixtures('request_context')
+def test_get_list_page(dummy_regform):
+    for i, (first_name, last_name) in enumerate([('Guinea', 'Pig'), ('Big', 'Boss'), ('Test', 'User'),
+                                                 ('Another', 'User'), ('Keyset', 'Pagination')]):
+        create_registration(dummy_regform, {'email': f'user{i}@example.test', 'first_name': first_name,
+                                            'last_name': last_name}, notify_user=False)
+    generator = RegistrationListGenerator(dummy_regform)
+
+    kwargs = generator.get_list_kwargs()
+    assert kwargs['total_registrations'] == kwargs['filtered_registrations'] == 5
+    assert len(kwargs['registrations']) == 5
+    assert kwargs['next_page_after'] is None
+
+    pages = _get_all_pages(generator)
+    assert [len(_get_names(page['html'])) for page in pages] == [2, 2, 1]
+    names = [name for page in pages for name in _get_names(page['html'])]
+    assert names == ['Big Boss', 'Keyset Pagination', 'Guinea Pig', 'Another User', 'Test User']
+
+    pages = _get_all_pages(generator, sort='first_name', desc=True)
+    names = [name for page in pages for name in _get_names(page['html'])]
+    assert names == ['Test User', 'Keyset Pagination', 'Guinea Pig', 'Big Boss', 'Another User']
+
+    pages = _get_all_pages(generator, sort='id')
+    names = [name for page in pages for name in _get_names(page['html'])]
+    assert names == ['Guinea Pig', 'Big Boss', 'Test User', 'Another User', 'Keyset Pagination']
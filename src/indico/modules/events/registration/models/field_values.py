@@ -0,0 +1,68 @@
+# This file is part of Indico.
+# Copyright (C) 2002 - 2025 CERN
+#
+# Indico is free software; you can redistribute it and/or
+# modify it under the terms of the MIT License; see the
+# LICENSE file for more details.
+
+from indico.core.db import db
+from indico.util.string import format_repr
+
+
+class RegistrationFieldValue(db.Model):
+    """An indexed value of a registration form field in a registration.
+
+    This is a copy of the values stored in `RegistrationData` for fields
+    which can be used to filter the registration list or to build
+    statistics, so these queries can use an index instead of looking
+    at the JSON data of all registrations.  Fields with more than one
+    value (e.g. multiple choices) have one row for each value.
+    """
+
+    __tablename__ = 'field_values'
+    __table_args__ = (db.Index(None, 'field_id', 'value'),
+                      {'schema': 'event_registration'})
+
+    #: The ID of the registration
+    registration_id = db.Column(
+        db.Integer,
+        db.ForeignKey('event_registration.registrations.id'),
+        primary_key=True,
+        autoincrement=False
+    )
+    #: The ID of the registration form field
+    field_id = db.Column(
+        db.Integer,
+        db.ForeignKey('event_registration.form_items.id'),
+        primary_key=True,
+        autoincrement=False
+    )
+    #: The value, in the same format as the keys of the field's filter choices
+    value = db.Column(
+        db.String,
+        primary_key=True
+    )
+
+    #: The registration containing the value
+    registration = db.relationship(
+        'Registration',
+        lazy=True,
+        backref=db.backref(
+            'field_values',
+            lazy=True,
+            cascade='all, delete-orphan'
+        )
+    )
+    #: The registration form field
+    field = db.relationship(
+        'RegistrationFormItem',
+        lazy=True,
+        backref=db.backref(
+            'field_values',
+            lazy='dynamic',
+            cascade='all, delete-orphan'
+        )
+    )
+
+    def __repr__(self):
+        return format_repr(self, 'registration_id', 'field_id', 'value')
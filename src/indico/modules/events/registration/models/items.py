@@ -363,6 +363,7 @@ class RegistrationFormItem(db.Model):
     )
 
     # relationship backrefs:
+    # - field_values (RegistrationFieldValue.field)
     # - parent (RegistrationFormItem.children)
     # - registration_form (RegistrationForm.form_items)
     # - show_if_field (RegistrationFormItem.condition_for)
@@ -313,6 +313,7 @@ class Registration(db.Model):
         default='',
     )
     # relationship backrefs:
+    # - field_values (RegistrationFieldValue.registration)
     # - invitation (RegistrationInvitation.registration)
     # - legacy_mapping (LegacyRegistrationMapping.registration)
     # - receipt_files (ReceiptFile.registration)
@@ -457,6 +458,21 @@ class Registration(db.Model):
     def data_by_field(self):
         return {x.field_data.field_id: x for x in self.data}
 
+    def update_field_values(self):
+        """Update the indexed field values based on the registration data.
+
+        This needs to be called whenever the registration data changes.
+        """
+        from indico.modules.events.registration.models.field_values import RegistrationFieldValue
+        values = {(data.field_data.field, value)
+                  for data in self.data
+                  for value in data.field_data.field.field_impl.get_indexed_values(data.data)}
+        existing = {(field_value.field, field_value.value): field_value for field_value in self.field_values}
+        for key in existing.keys() - values:
+            self.field_values.remove(existing[key])
+        for field, value in values - existing.keys():
+            self.field_values.append(RegistrationFieldValue(field=field, value=value))
+
     @property
     def billable_data(self):
         return [data for data in self.data if data.price]
@@ -6,9 +6,13 @@
 # LICENSE file for more details.
 
 from collections import defaultdict, namedtuple
+from decimal import Decimal
 from itertools import chain, groupby
 
-from indico.modules.events.registration.models.registrations import RegistrationData
+from indico.core.db import db
+from indico.modules.events.payment.models.transactions import PaymentTransaction, TransactionStatus
+from indico.modules.events.registration.models.field_values import RegistrationFieldValue
+from indico.modules.events.registration.models.registrations import Registration, RegistrationData
 from indico.util.date_time import now_utc
 from indico.util.i18n import _
 
@@ -110,6 +114,10 @@ class DataItem(namedtuple('DataItem', ['regs', 'attendance', 'capacity', 'billab
                                paid_amount, unpaid, unpaid_amount)
 
 
+#: Registrations with the same value for a field, price and payment status
+RegistrationDataGroup = namedtuple('RegistrationDataGroup', ['choice_id', 'field_data', 'price', 'paid', 'count'])
+
+
 class FieldStats:
     """Hold stats for a registration form field."""
 
@@ -129,11 +137,12 @@ class FieldStats:
         return {choice['id']: choice for choice in field.current_data.versioned_data['choices']}
 
     def _get_registration_data(self, field):
-        registration_ids = [r.id for r in field.registration_form.active_registrations]
-        field_data_ids = [data.id for data in field.data_versions]
-        return RegistrationData.query.filter(RegistrationData.registration_id.in_(registration_ids),
-                                             RegistrationData.field_data_id.in_(field_data_ids),
-                                             RegistrationData.data != {}).all()
+        """Aggregate the registration data of the field.
+
+        :returns: [RegistrationDataGroup] -- the groups of registrations
+                  with the same data for the field.
+        """
+        raise NotImplementedError
 
     def _build_data(self):
         """Build data from registration data and field choices.
@@ -347,25 +356,52 @@ class AccommodationStats(FieldStats, StatsBase):
         return [Cell(type='progress',
                      data=(details.regs / details.capacity, f'{details.regs} / {details.capacity}'))]
 
+    def _get_registration_data(self, field):
+        # the choices are counted using the indexed field values, so only
+        # the registration data containing a choice is taken into account
+        field_data = {data.id: data for data in field.data_versions}
+        nights = (db.cast(RegistrationData.data['departure_date'].astext, db.Date) -
+                  db.cast(RegistrationData.data['arrival_date'].astext, db.Date))
+        paid = PaymentTransaction.status.in_([TransactionStatus.successful, TransactionStatus.pending])
+        rows = (db.session.query(RegistrationFieldValue.value.label('choice_id'),
+                                 RegistrationData.field_data_id.label('field_data_id'),
+                                 nights.label('nights'),
+                                 db.func.coalesce(paid, False).label('paid'))
+                .join(Registration, Registration.id == RegistrationFieldValue.registration_id)
+                .join(RegistrationData, db.and_(RegistrationData.registration_id == Registration.id,
+                                                RegistrationData.field_data_id.in_(field_data)))
+                .outerjoin(PaymentTransaction, PaymentTransaction.id == Registration.transaction_id)
+                .filter(RegistrationFieldValue.field_id == field.id, Registration.is_active)
+                .subquery())
+        query = (db.session.query(rows.c.choice_id, rows.c.field_data_id, rows.c.nights, rows.c.paid, db.func.count())
+                 .group_by(rows.c.choice_id, rows.c.field_data_id, rows.c.nights, rows.c.paid))
+        groups = []
+        for choice_id, field_data_id, num_nights, is_paid, count in query:
+            versioned_data = field_data[field_data_id].versioned_data
+            choice = next((x for x in versioned_data['choices'] if x['id'] == choice_id and x['price']), None)
+            price = Decimal(str(choice['price'])) * num_nights if choice and num_nights else 0
+            groups.append(RegistrationDataGroup(choice_id, field_data[field_data_id], price, is_paid, count))
+        return groups
+
     def _build_key(self, obj):
-        choice_id = obj.data['choice'] if isinstance(obj, RegistrationData) else obj['id']
-        choice_price = obj.price if isinstance(obj, RegistrationData) else obj['price']
+        choice_id = obj.choice_id if isinstance(obj, RegistrationDataGroup) else obj['id']
+        choice_price = obj.price if isinstance(obj, RegistrationDataGroup) else obj['price']
         choice_caption = self._field.data['captions'][choice_id]
         return choice_caption, choice_id, choice_price
 
     def _build_regitems_data(self, key, regitems):
         price = key[2]
         choices = lambda r: {choice['id']: choice for choice in r.field_data.versioned_data['choices']}
-        data = {'regs': len(regitems),
-                'capacity': next((choices(regitem)[regitem.data['choice']]['places_limit'] for regitem in regitems), 0),
-                'cancelled': any(not choices(regitem)[regitem.data['choice']]['is_enabled'] for regitem in regitems),
+        data = {'regs': sum(regitem.count for regitem in regitems),
+                'capacity': next((choices(regitem)[regitem.choice_id]['places_limit'] for regitem in regitems), 0),
+                'cancelled': any(not choices(regitem)[regitem.choice_id]['is_enabled'] for regitem in regitems),
                 'billable': bool(price)}
         if data['billable']:
             data['price'] = price
-            data['paid'] = sum(1 for regitem in regitems if regitem.registration.is_paid)
-            data['paid_amount'] = sum(float(price) for regitem in regitems if regitem.registration.is_paid)
-            data['unpaid'] = sum(1 for regitem in regitems if not regitem.registration.is_paid)
-            data['unpaid_amount'] = sum(float(price) for regitem in regitems if not regitem.registration.is_paid)
+            data['paid'] = sum(regitem.count for regitem in regitems if regitem.paid)
+            data['paid_amount'] = sum(float(price) * regitem.count for regitem in regitems if regitem.paid)
+            data['unpaid'] = sum(regitem.count for regitem in regitems if not regitem.paid)
+            data['unpaid_amount'] = sum(float(price) * regitem.count for regitem in regitems if not regitem.paid)
         return DataItem(**data)
 
     def _build_choice_data(self, choice):
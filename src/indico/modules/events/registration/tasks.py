@@ -8,6 +8,7 @@
 from collections import defaultdict
 
 from celery.schedules import crontab
+from flask import session
 
 from indico.core import signals
 from indico.core.celery import celery
@@ -15,10 +16,11 @@ from indico.core.db import db
 from indico.core.storage.backend import get_storage
 from indico.modules.events import Event
 from indico.modules.events.registration import logger
+from indico.modules.events.registration.models.field_values import RegistrationFieldValue
 from indico.modules.events.registration.models.form_fields import RegistrationFormField, RegistrationFormFieldData
 from indico.modules.events.registration.models.forms import RegistrationForm
 from indico.modules.events.registration.models.registrations import Registration, RegistrationData
-from indico.modules.events.registration.util import close_registration
+from indico.modules.events.registration.util import close_registration, run_registration_import
 from indico.modules.receipts.models.files import ReceiptFile
 from indico.util.date_time import now_utc
 from indico.util.string import snakify_keys
@@ -73,6 +75,10 @@ def delete_field_data():
                 data.data = snakify_keys(default)
             else:
                 db.session.delete(data)
+        # the purged data must not remain in the indexed values either
+        (RegistrationFieldValue.query
+         .filter(RegistrationFieldValue.field_id.in_({field.id for field in fields}))
+         .delete(synchronize_session='fetch'))
     db.session.commit()
 
 
@@ -118,3 +124,10 @@ def delete_previous_registration_file(registration_id, field_data_id, storage_ba
     logger.debug('Deleting registration file: %s from %s storage', storage_file_id, storage_backend)
     storage = get_storage(storage_backend)
     storage.delete(storage_file_id)
+
+
+@celery.task(name='import_registrations', request_context=True)
+def import_registrations_task(import_id, regform, records, user, *, skip_moderation, notify_users):
+    session.set_session_user(user)
+    logger.info('Importing %d registrations into %r for %r', len(records), regform, user)
+    run_registration_import(import_id, regform, records, skip_moderation=skip_moderation, notify_users=notify_users)
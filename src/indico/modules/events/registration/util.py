@@ -10,11 +10,11 @@ import csv
 import dataclasses
 import itertools
 import uuid
-from datetime import datetime
+from datetime import datetime, timedelta
 from io import BytesIO
 from operator import attrgetter
 
-from flask import json, session
+from flask import g, json, session
 from marshmallow import RAISE, ValidationError, fields, validates
 from PIL import Image, ImageOps
 from qrcode import QRCode, constants
@@ -22,11 +22,13 @@ from sqlalchemy import and_, or_
 from sqlalchemy.orm import contains_eager, joinedload, load_only, undefer
 
 from indico.core import signals
+from indico.core.cache import make_scoped_cache
 from indico.core.config import config
 from indico.core.db import db
 from indico.core.db.sqlalchemy.util.session import no_autoflush
 from indico.core.errors import UserValueError
 from indico.core.marshmallow import IndicoSchema
+from indico.core.notifications import flush_email_queue
 from indico.modules.core.captcha import CaptchaField
 from indico.modules.events import EventLogRealm
 from indico.modules.events.models.events import Event
@@ -49,7 +51,7 @@ from indico.modules.events.registration.notifications import (notify_invitation,
                                                               notify_registration_modification)
 from indico.modules.logs import LogKind
 from indico.modules.logs.util import make_diff_log
-from indico.modules.users.util import get_user_by_email
+from indico.modules.users.util import get_user_by_email, get_users_by_emails
 from indico.util.countries import get_country_reverse
 from indico.util.date_time import now_utc
 from indico.util.i18n import _
@@ -59,6 +61,15 @@ from indico.util.string import camelize_keys, validate_email, validate_email_ver
 from indico.web.args import parser
 
 
+#: The number of registrations created and committed at once by a background import
+REGISTRATION_IMPORT_BATCH_SIZE = 200
+#: How long the status of a background import is kept
+REGISTRATION_IMPORT_STATUS_TTL = timedelta(days=1)
+
+registration_import_cache = make_scoped_cache('registration-import')
+_notset = object()
+
+
 @dataclasses.dataclass
 class ActionMenuEntry:
     text: str
@@ -86,11 +97,14 @@ def import_user_records_from_csv(fileobj, columns, delimiter=','):
              the keys of which are given by the column names.
     """
     with csv_text_io_wrapper(fileobj) as ftxt:
-        reader = csv.reader(ftxt.read().splitlines(), delimiter=delimiter)
+        rows = list(csv.reader(ftxt.read().splitlines(), delimiter=delimiter))
+    # look up all users at once instead of running a query for each row
+    email_idx = columns.index('email')
+    users_by_email = get_users_by_emails(row[email_idx].strip() for row in rows if len(row) == len(columns))
     used_emails = set()
-    email_row_map = {}
+    user_rows = {}
     user_records = []
-    for row_num, row in enumerate(reader, 1):
+    for row_num, row in enumerate(rows, 1):
         values = [value.strip() for value in row]
         if len(columns) != len(values):
             raise UserValueError(_('Row {}: malformed CSV data - please check that the number of columns is correct')
@@ -110,13 +124,14 @@ def import_user_records_from_csv(fileobj, columns, delimiter=','):
 
         if record['email'] in used_emails:
             raise UserValueError(_('Row {}: email address is not unique').format(row_num))
-        if conflict_row_num := email_row_map.get(record['email']):
+        user = users_by_email.get(record['email'])
+        if user and (conflict_row_num := user_rows.get(user)):
             raise UserValueError(_('Row {}: email address belongs to the same user as in row {}')
                                  .format(row_num, conflict_row_num))
 
         used_emails.add(record['email'])
-        if user := get_user_by_email(record['email']):
-            email_row_map.update((e, row_num) for e in user.all_emails)
+        if user:
+            user_rows[user] = row_num
 
         user_records.append(record)
     return user_records
@@ -392,9 +407,12 @@ def create_personal_data_fields(regform):
 
 
 @no_autoflush
-def create_registration(regform, data, invitation=None, management=False, notify_user=True, skip_moderation=None):
+def create_registration(regform, data, invitation=None, management=False, notify_user=True, skip_moderation=None,
+                        *, registration_user=_notset):
     user = session.user if session else None
-    registration = Registration(registration_form=regform, user=get_user_by_email(data['email']),
+    if registration_user is _notset:
+        registration_user = get_user_by_email(data['email'])
+    registration = Registration(registration_form=regform, user=registration_user,
                                 base_price=regform.base_price, currency=regform.currency, created_by_manager=management)
     if skip_moderation is None:
         skip_moderation = management
@@ -426,6 +444,7 @@ def create_registration(regform, data, invitation=None, management=False, notify
         invitation.registration = registration
     if not management and regform.needs_publish_consent:
         registration.consent_to_publish = data.get('consent_to_publish', RegistrationVisibility.nobody)
+    registration.update_field_values()
     registration.sync_state(_skip_moderation=skip_moderation)
     db.session.flush()
     signals.event.registration_created.send(registration, management=management, data=data)
@@ -520,6 +539,7 @@ def modify_registration(registration, data, management=False, notify_user=True):
         if consent_to_publish is not None:
             update_registration_consent_to_publish(registration, consent_to_publish)
 
+    registration.update_field_values()
     registration.sync_state()
     db.session.flush()
     # sanity check
@@ -912,32 +932,152 @@ def create_invitation(regform, user, email_sender, email_subject, email_body, *,
     return invitation
 
 
-def import_registrations_from_csv(regform, fileobj, skip_moderation=True, notify_users=False, delimiter=','):
-    """Import event registrants from a CSV file into a form."""
-    columns = ['first_name', 'last_name', 'affiliation', 'position', 'phone', 'email']
-    user_records = import_user_records_from_csv(fileobj, columns=columns, delimiter=delimiter)
+def _check_import_records(regform, records, *, check_invitations=False):
+    """Check whether the people from CSV records are already registered.
 
+    :param records: A list of ``(row_num, record)`` tuples.
+    :param check_invitations: Whether to also check for existing invitations.
+    :return: A tuple containing a dict mapping emails to users (see
+             :func:`get_users_by_emails`) and a dict mapping the row
+             numbers of records which cannot be imported to an error.
+    """
+    emails = {record['email'] for __, record in records}
+    users_by_email = get_users_by_emails(emails)
+    user_ids = {user.id for user in users_by_email.values()}
     reg_data = (db.session.query(Registration.user_id, Registration.email)
                 .with_parent(regform)
-                .filter(Registration.is_active)
+                .filter(Registration.is_active,
+                        or_(Registration.email.in_(emails), Registration.user_id.in_(user_ids)))
                 .all())
     registered_user_ids = {rd.user_id for rd in reg_data if rd.user_id is not None}
     registered_emails = {rd.email for rd in reg_data}
-
-    for row_num, record in enumerate(user_records, 1):
+    invited_emails = set()
+    if check_invitations:
+        invited_emails = {inv.email for inv in (db.session.query(RegistrationInvitation.email)
+                                                .with_parent(regform)
+                                                .filter(RegistrationInvitation.email.in_(emails)))}
+
+    errors = {}
+    for row_num, record in records:
+        user = users_by_email.get(record['email'])
         if record['email'] in registered_emails:
-            raise UserValueError(_('Row {}: a registration with this email already exists').format(row_num))
+            errors[row_num] = _('Row {}: a registration with this email already exists').format(row_num)
+        elif user and user.id in registered_user_ids:
+            errors[row_num] = _('Row {}: a registration for this user already exists').format(row_num)
+        elif record['email'] in invited_emails:
+            errors[row_num] = _('Row {}: an invitation for this user already exists').format(row_num)
+    return users_by_email, errors
+
+
+def parse_registrations_csv(regform, fileobj, delimiter=','):
+    """Parse and validate a CSV file containing registrations.
+
+    :return: A list of ``(row_num, record)`` tuples.
+    :raise UserValueError: if any record is invalid or conflicts with
+                           an existing registration
+    """
+    columns = ['first_name', 'last_name', 'affiliation', 'position', 'phone', 'email']
+    records = list(enumerate(import_user_records_from_csv(fileobj, columns=columns, delimiter=delimiter), 1))
+    __, errors = _check_import_records(regform, records)
+    if errors:
+        raise UserValueError(errors[min(errors)])
+    return records
 
-        user = get_user_by_email(record['email'])
-        if user and user.id in registered_user_ids:
-            raise UserValueError(_('Row {}: a registration for this user already exists').format(row_num))
 
+def import_registrations(regform, records, *, skip_moderation=True, notify_users=False):
+    """Create registrations from records returned by :func:`parse_registrations_csv`."""
+    users_by_email = get_users_by_emails(data['email'] for __, data in records)
     return [
-        create_registration(regform, data, management=True, notify_user=notify_users, skip_moderation=skip_moderation)
-        for data in user_records
+        create_registration(regform, data, management=True, notify_user=notify_users, skip_moderation=skip_moderation,
+                            registration_user=users_by_email.get(data['email']))
+        for __, data in records
     ]
 
 
+def import_registrations_from_csv(regform, fileobj, skip_moderation=True, notify_users=False, delimiter=','):
+    """Import event registrants from a CSV file into a form."""
+    records = parse_registrations_csv(regform, fileobj, delimiter=delimiter)
+    return import_registrations(regform, records, skip_moderation=skip_moderation, notify_users=notify_users)
+
+
+def _get_import_cache_key(regform, import_id):
+    return f'{regform.id}-{import_id}'
+
+
+def get_registration_import_status(regform, import_id):
+    """Get the status of a registration import running in the background.
+
+    :return: A dict containing the number of `total`, `processed` and
+             `imported` records, a list of `errors` and whether the
+             import is `finished`, or ``None`` if there is no such import.
+    """
+    return registration_import_cache.get(_get_import_cache_key(regform, import_id))
+
+
+def _set_registration_import_status(regform, import_id, status):
+    registration_import_cache.set(_get_import_cache_key(regform, import_id), status, REGISTRATION_IMPORT_STATUS_TTL)
+
+
+def start_registration_import(regform, records, *, skip_moderation=True, notify_users=False):
+    """Import registrations in a background task.
+
+    :param records: A list of records returned by :func:`parse_registrations_csv`.
+    :return: An ID which can be passed to :func:`get_registration_import_status`.
+    """
+    from indico.modules.events.registration.tasks import import_registrations_task
+    import_id = str(uuid.uuid4())
+    _set_registration_import_status(regform, import_id, {'total': len(records), 'processed': 0, 'imported': 0,
+                                                         'errors': [], 'finished': False})
+    import_registrations_task.delay(import_id, regform, records, session.user, skip_moderation=skip_moderation,
+                                    notify_users=notify_users)
+    return import_id
+
+
+def _import_registration(regform, row_num, data, registration_user, *, skip_moderation, notify_user):
+    email_queue = g.get('email_queue', [])
+    queued_emails = len(email_queue)
+    try:
+        with db.session.begin_nested():
+            create_registration(regform, data, management=True, notify_user=notify_user,
+                                skip_moderation=skip_moderation, registration_user=registration_user)
+    except Exception:
+        logger.exception('Could not import row %d into %r', row_num, regform)
+        # the emails belong to the registration which has just been rolled back
+        del email_queue[queued_emails:]
+        return False
+    return True
+
+
+def run_registration_import(import_id, regform, records, *, skip_moderation=True, notify_users=False):
+    """Create registrations from CSV records in batches.
+
+    This is meant to run in a background task.  After each batch the
+    registrations are committed, the notifications sent, and the status
+    updated, so records which cannot be imported (e.g. because someone
+    registered in the meantime) only affect their own row.
+    """
+    status = get_registration_import_status(regform, import_id) or {'total': len(records), 'processed': 0,
+                                                                     'imported': 0, 'errors': []}
+    try:
+        for batch in itertools.batched(records, REGISTRATION_IMPORT_BATCH_SIZE):
+            users_by_email, errors = _check_import_records(regform, batch)
+            for row_num, data in batch:
+                if row_num in errors:
+                    status['errors'].append(errors[row_num])
+                elif _import_registration(regform, row_num, data, users_by_email.get(data['email']),
+                                          skip_moderation=skip_moderation, notify_user=notify_users):
+                    status['imported'] += 1
+                else:
+                    status['errors'].append(_('Row {}: the registration could not be created').format(row_num))
+            db.session.commit()
+            flush_email_queue()
+            status['processed'] += len(batch)
+            _set_registration_import_status(regform, import_id, {**status, 'finished': False})
+        logger.info('Imported %d/%d registrations into %r', status['imported'], status['total'], regform)
+    finally:
+        _set_registration_import_status(regform, import_id, {**status, 'finished': True})
+
+
 def import_invitations_from_csv(regform, fileobj, email_sender, email_subject, email_body, *,
                                 skip_moderation=True, skip_access_check=True, skip_existing=False, delimiter=','):
     """Import invitations from a CSV file.
@@ -947,34 +1087,10 @@ def import_invitations_from_csv(regform, fileobj, email_sender, email_subject, e
     """
     columns = ['first_name', 'last_name', 'affiliation', 'email']
     user_records = import_user_records_from_csv(fileobj, columns=columns, delimiter=delimiter)
-
-    reg_data = (db.session.query(Registration.user_id, Registration.email)
-                .with_parent(regform)
-                .filter(Registration.is_active)
-                .all())
-    registered_user_ids = {rd.user_id for rd in reg_data if rd.user_id is not None}
-    registered_emails = {rd.email for rd in reg_data}
-    invited_emails = {inv.email for inv in regform.invitations}
-
-    filtered_records = []
-    for row_num, user in enumerate(user_records, 1):
-        if user['email'] in registered_emails:
-            if skip_existing:
-                continue
-            raise UserValueError(_('Row {}: a registration with this email already exists').format(row_num))
-
-        indico_user = get_user_by_email(user['email'])
-        if indico_user and indico_user.id in registered_user_ids:
-            if skip_existing:
-                continue
-            raise UserValueError(_('Row {}: a registration for this user already exists').format(row_num))
-
-        if user['email'] in invited_emails:
-            if skip_existing:
-                continue
-            raise UserValueError(_('Row {}: an invitation for this user already exists').format(row_num))
-
-        filtered_records.append(user)
+    __, errors = _check_import_records(regform, list(enumerate(user_records, 1)), check_invitations=True)
+    if errors and not skip_existing:
+        raise UserValueError(errors[min(errors)])
+    filtered_records = [user for row_num, user in enumerate(user_records, 1) if row_num not in errors]
 
     invitations = [create_invitation(regform, user, email_sender, email_subject, email_body,
                                      skip_moderation=skip_moderation, skip_access_check=skip_access_check)
@@ -25,7 +25,8 @@ from indico.modules.events.registration.util import (create_registration, get_ev
                                                      get_registered_event_persons, get_ticket_qr_code_data,
                                                      get_user_data, import_invitations_from_csv,
                                                      import_registrations_from_csv, import_user_records_from_csv,
-                                                     modify_registration)
+                                                     modify_registration, parse_registrations_csv,
+                                                     run_registration_import)
 from indico.modules.users.models.users import UserTitle
 from indico.testing.util import assert_json_snapshot
 
@@ -194,6 +195,28 @@ def test_import_registrations_error(dummy_regform, dummy_user):
     assert 'Row 1' in str(e.value)
 
 
+def test_run_registration_import(dummy_regform, dummy_user):
+    csv = b'\n'.join([b'John,Doe,ACME Inc.,Regional Manager,+1-202-555-0140,jdoe@example.test',
+                      b'Jane,Smith,ACME Inc.,CEO,,jane@example.test',
+                      b'Billy Bob,Doe,,,,1337@EXAMPLE.test'])
+    records = parse_registrations_csv(dummy_regform, BytesIO(csv))
+    assert [row_num for row_num, __ in records] == [1, 2, 3]
+
+    # someone registered after the file has been validated
+    create_registration(dummy_regform, {
+        'email': 'jane@example.test',
+        'first_name': 'Jane',
+        'last_name': 'Smith'
+    }, notify_user=False)
+
+    run_registration_import('test', dummy_regform, records, notify_users=False)
+    registrations = {reg.email: reg for reg in dummy_regform.registrations}
+    assert set(registrations) == {'jdoe@example.test', 'jane@example.test', '1337@example.test'}
+    assert registrations['1337@example.test'].user == dummy_user
+    assert registrations['jdoe@example.test'].user is None
+    assert not registrations['jane@example.test'].created_by_manager
+
+
 def test_import_invitations(monkeypatch, dummy_regform, dummy_user):
     monkeypatch.setattr('indico.modules.events.registration.util.notify_invitation', lambda *args, **kwargs: None)
 
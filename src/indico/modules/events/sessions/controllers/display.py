@@ -16,6 +16,7 @@ from indico.modules.events.sessions.ical import session_to_ical
 from indico.modules.events.sessions.models.sessions import Session
 from indico.modules.events.sessions.util import generate_session_pdf_timetable, get_sessions_for_user
 from indico.modules.events.sessions.views import WPDisplayMySessionsConference, WPDisplaySession
+from indico.modules.events.timetable.util import make_pdf_timetable_pending_response
 from indico.web.flask.util import send_file
 from indico.web.rh import allow_signed_url
 
@@ -81,5 +82,6 @@ class RHExportSessionToICAL(RHDisplaySessionBase):
 
 class RHExportSessionTimetableToPDF(RHDisplaySessionBase):
     def _process(self):
-        pdf = generate_session_pdf_timetable(self.session)
+        if (pdf := generate_session_pdf_timetable(self.session, cached=True)) is None:
+            return make_pdf_timetable_pending_response()
         return send_file('session-timetable.pdf', pdf, 'application/pdf')
@@ -155,9 +155,18 @@ def has_sessions_for_user(event, user):
     return _query_sessions_for_user(event, user).has_rows()
 
 
-def generate_session_pdf_timetable(sess):
-    from indico.modules.events.timetable.util import TimetableExportConfig, generate_pdf_timetable
+def generate_session_pdf_timetable(sess, *, cached=False):
+    """Generate the PDF timetable of a session.
+
+    :param cached: Whether to use :func:`get_cached_pdf_timetable`, which
+                   returns ``None`` while the PDF is generated in the
+                   background.
+    """
+    from indico.modules.events.timetable.util import (TimetableExportConfig, generate_pdf_timetable,
+                                                      get_cached_pdf_timetable)
     config = TimetableExportConfig(show_toc=False)
+    if cached:
+        return get_cached_pdf_timetable(sess.event, config, only_session=sess)
     return generate_pdf_timetable(sess.event, config, only_session=sess)
 
 
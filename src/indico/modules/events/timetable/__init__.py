@@ -5,7 +5,7 @@
 # modify it under the terms of the MIT License; see the
 # LICENSE file for more details.
 
-from flask import render_template, session
+from flask import has_app_context, render_template, session
 
 from indico.core import signals
 from indico.core.logger import Logger
@@ -48,6 +48,55 @@ def _get_timetable_cloner(sender, **kwargs):
     return TimetableCloner
 
 
+@signals.event.timetable_entry_created.connect
+@signals.event.timetable_entry_updated.connect
+@signals.event.timetable_entry_deleted.connect
+@signals.event.times_changed.connect
+@signals.event.location_changed.connect
+@signals.event.updated.connect
+@signals.event.contribution_created.connect
+@signals.event.contribution_updated.connect
+@signals.event.contribution_deleted.connect
+@signals.event.subcontribution_created.connect
+@signals.event.subcontribution_updated.connect
+@signals.event.subcontribution_deleted.connect
+@signals.event.session_updated.connect
+@signals.event.session_deleted.connect
+@signals.event.session_block_updated.connect
+@signals.event.session_block_deleted.connect
+@signals.event.person_updated.connect
+@signals.acl.entry_changed.connect
+@signals.acl.protection_changed.connect
+def _timetable_changed(sender, obj=None, **kwargs):
+    from indico.modules.events.models.events import Event
+    from indico.modules.events.timetable.util import invalidate_timetable_version
+    obj = obj if obj is not None else sender
+    event = obj if isinstance(obj, Event) else getattr(obj, 'event', None)
+    if isinstance(event, Event):
+        invalidate_timetable_version(event)
+
+
+@signals.attachments.folder_created.connect
+@signals.attachments.folder_updated.connect
+@signals.attachments.folder_deleted.connect
+@signals.attachments.attachment_created.connect
+@signals.attachments.attachment_updated.connect
+@signals.attachments.attachment_deleted.connect
+def _attachments_changed(sender, **kwargs):
+    from indico.modules.attachments.models.attachments import Attachment
+    from indico.modules.events.timetable.util import invalidate_timetable_version
+    folder = sender.folder if isinstance(sender, Attachment) else sender
+    if folder.event is not None:
+        invalidate_timetable_version(folder.event)
+
+
+@signals.core.after_commit.connect
+def _apply_timetable_invalidations(sender, **kwargs):
+    from indico.modules.events.timetable.util import apply_timetable_invalidations
+    if has_app_context():
+        apply_timetable_invalidations()
+
+
 @template_hook('session-timetable')
 def _render_session_timetable(session, **kwargs):
     from indico.modules.events.timetable.util import render_session_timetable
@@ -14,8 +14,9 @@ from indico.modules.events.controllers.base import RHDisplayEventBase
 from indico.modules.events.layout import layout_settings
 from indico.modules.events.timetable.forms import TimetablePDFExportForm
 from indico.modules.events.timetable.legacy import TimetableSerializer
-from indico.modules.events.timetable.util import (TimetableExportConfig, generate_pdf_timetable,
-                                                  render_entry_info_balloon, serialize_event_info)
+from indico.modules.events.timetable.util import (TimetableExportConfig, get_cached_pdf_timetable,
+                                                  make_pdf_timetable_pending_response, render_entry_info_balloon,
+                                                  serialize_event_info)
 from indico.modules.events.timetable.views import WPDisplayTimetable
 from indico.modules.events.util import get_theme
 from indico.modules.events.views import WPSimpleEventDisplay
@@ -100,7 +101,8 @@ class RHTimetableExportPDF(RHTimetableProtectionBase):
                 print_date_close_to_sessions=form.session_info.data['printDateCloseToSessions'],
             )
 
-            pdf = generate_pdf_timetable(self.event, config)
+            if (pdf := get_cached_pdf_timetable(self.event, config)) is None:
+                return make_pdf_timetable_pending_response()
             return send_file('timetable.pdf', pdf, 'application/pdf')
         return jsonify_template('events/timetable/timetable_pdf_export.html', form=form,
                                 back_url=url_for('.timetable', self.event))
@@ -110,5 +112,6 @@ class RHTimetableExportDefaultPDF(RHTimetableProtectionBase):
     """Generate a PDF timetable with default settings."""
 
     def _process(self):
-        pdf = generate_pdf_timetable(self.event)
+        if (pdf := get_cached_pdf_timetable(self.event)) is None:
+            return make_pdf_timetable_pending_response()
         return send_file('timetable.pdf', pdf, 'application/pdf')
@@ -6,12 +6,15 @@
 # LICENSE file for more details.
 
 from collections import defaultdict
-from hashlib import md5
+from datetime import timedelta
+from hashlib import md5, sha256
 from itertools import chain
 
-from flask import has_request_context, session
+from flask import g, has_request_context, session
 from sqlalchemy.orm import defaultload
 
+from indico.core.cache import make_scoped_cache
+from indico.modules.attachments.util import get_attached_folders
 from indico.modules.events.contributions.models.persons import AuthorType
 from indico.modules.events.models.events import EventType
 from indico.modules.events.timetable.models.entries import TimetableEntry, TimetableEntryType
@@ -19,6 +22,12 @@ from indico.util.date_time import iterdays
 from indico.web.flask.util import url_for
 
 
+#: How long a serialized timetable is kept in the cache
+TIMETABLE_DATA_CACHE_TTL = timedelta(days=1)
+
+timetable_data_cache = make_scoped_cache('timetable-data')
+
+
 class TimetableSerializer:
     def __init__(self, event, management=False, user=None, api=False):
         self.management = management
@@ -30,6 +39,20 @@ class TimetableSerializer:
     def serialize_timetable(self, days=None, hide_weekends=False, strip_empty_days=False):
         tzinfo = self.event.tzinfo if self.management else self.event.display_tzinfo
         self.event.preload_all_acl_entries()
+        query = (TimetableEntry.query.with_parent(self.event)
+                 .options(defaultload('contribution'), defaultload('session_block').joinedload('session'))
+                 .order_by(TimetableEntry.type != TimetableEntryType.SESSION_BLOCK))
+        visible_entries = [entry for entry in query if entry.can_view(self.user)]
+        cache_key = self._get_cache_key(visible_entries, tzinfo, days, hide_weekends, strip_empty_days)
+        if cache_key is not None and (timetable := timetable_data_cache.get(cache_key)) is not None:
+            return timetable
+        timetable = self._serialize_timetable({entry.id for entry in visible_entries}, tzinfo, days, hide_weekends,
+                                              strip_empty_days)
+        if cache_key is not None:
+            timetable_data_cache.set(cache_key, timetable, timeout=TIMETABLE_DATA_CACHE_TTL)
+        return timetable
+
+    def _serialize_timetable(self, visible_entry_ids, tzinfo, days, hide_weekends, strip_empty_days):
         timetable = {}
         for day in iterdays(self.event.start_dt.astimezone(tzinfo), self.event.end_dt.astimezone(tzinfo),
                             skip_weekends=hide_weekends, day_whitelist=days):
@@ -48,7 +71,7 @@ class TimetableSerializer:
             date_str = day.strftime('%Y%m%d')
             if date_str not in timetable:
                 continue
-            if not entry.can_view(self.user):
+            if entry.id not in visible_entry_ids:
                 continue
             data = self.serialize_timetable_entry(entry, load_children=False)
             key = self._get_entry_key(entry)
@@ -65,6 +88,42 @@ class TimetableSerializer:
             timetable = self._strip_empty_days(timetable)
         return timetable
 
+    def _get_cache_key(self, visible_entries, tzinfo, days, hide_weekends, strip_empty_days):
+        """Get the cache key of the timetable as seen by the current user.
+
+        Only the data shown to people who cannot manage the event is
+        cached.  Such users see the same data unless they have access to
+        different protected entries or attachment folders, so the key
+        contains a hash of everything they can see instead of the user
+        itself and all users with the same access share a cached copy.
+
+        :return: The cache key or ``None`` if the timetable must not be
+                 cached.
+        """
+        from indico.modules.events.timetable.util import get_timetable_version
+        if self.management or self.can_manage_event or g.get('static_site'):
+            return None
+        if self.event.id in g.get('timetable_pending_invalidations', ()):
+            # the timetable has been modified in the current transaction
+            return None
+        if (version := get_timetable_version(self.event)) is None:
+            return None
+        visible = []
+        for entry in visible_entries:
+            visible.append(self._get_entry_key(entry))
+            if entry.type == TimetableEntryType.SESSION_BLOCK:
+                linked_object = entry.session_block.session
+            elif entry.type == TimetableEntryType.CONTRIBUTION:
+                linked_object = entry.contribution
+            else:
+                continue
+            folders = get_attached_folders(linked_object, include_empty=False, include_hidden=False,
+                                           preload_event=True)
+            visible += (f'f{folder.id}' for folder in folders)
+        protection_key = sha256(','.join(sorted(set(visible))).encode()).hexdigest()
+        return '-'.join(map(str, (self.event.id, version, tzinfo, self.api, hide_weekends,
+                                  strip_empty_days, ','.join(sorted(map(str, days or ()))), protection_key)))
+
     def serialize_session_timetable(self, session_, without_blocks=False, strip_empty_days=False):
         event_tz = self.event.tzinfo
         timetable = {}
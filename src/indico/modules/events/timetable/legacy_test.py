@@ -0,0 +1,30 @@
+# This file is part of Indico.
+# Copyright (C) 2002 - 2025 CERN
+#
+# Indico is free software; you can redistribute it and/or
+# modify it under the terms of the MIT License; see the
+# LICENSE file for more details.
+
+import pytest
+
+from indico.modules.events.timetable.legacy import TimetableSerializer
+from indico.modules.events.timetable.util import apply_timetable_invalidations, invalidate_timetable_version
+
+
+@pytest.mark.usefixtures('request_context')
+def test_serialize_timetable_cached(dummy_event, mocker):
+    serialize = mocker.spy(TimetableSerializer, '_serialize_timetable')
+    timetable = TimetableSerializer(dummy_event).serialize_timetable()
+    assert TimetableSerializer(dummy_event).serialize_timetable() == timetable
+    assert serialize.call_count == 1
+    # the management view is never cached
+    TimetableSerializer(dummy_event, management=True).serialize_timetable()
+    assert serialize.call_count == 2
+    # changing the timetable results in new data
+    invalidate_timetable_version(dummy_event)
+    TimetableSerializer(dummy_event).serialize_timetable()
+    assert serialize.call_count == 3
+    apply_timetable_invalidations()
+    TimetableSerializer(dummy_event).serialize_timetable()
+    TimetableSerializer(dummy_event).serialize_timetable()
+    assert serialize.call_count == 4
@@ -0,0 +1,22 @@
+# This file is part of Indico.
+# Copyright (C) 2002 - 2025 CERN
+#
+# Indico is free software; you can redistribute it and/or
+# modify it under the terms of the MIT License; see the
+# LICENSE file for more details.
+
+from flask import session
+
+from indico.core.celery import celery
+from indico.modules.events.timetable import logger
+from indico.modules.events.timetable.util import build_cached_pdf_timetable
+
+
+@celery.task(request_context=True)
+def generate_pdf_timetable_task(key, event, config, only_session, user, timezone, lang):
+    # the timetable depends on the access and preferences of the user requesting it
+    session.set_session_user(user)
+    session.timezone = timezone
+    session.lang = lang
+    logger.info('Generating PDF timetable of %r for %r', event, user)
+    build_cached_pdf_timetable(key, event, config, only_session)
@@ -5,19 +5,24 @@
 # modify it under the terms of the MIT License; see the
 # LICENSE file for more details.
 
+import hashlib
 from collections import defaultdict
 from dataclasses import dataclass
+from datetime import timedelta
 from io import BytesIO
 from itertools import groupby
 from operator import attrgetter
+from uuid import uuid4
 
-from flask import render_template, session
+from flask import current_app, g, has_app_context, render_template, session
 from pytz import utc
 from sqlalchemy import Date, cast
 from sqlalchemy.orm import contains_eager, joinedload, subqueryload, undefer
 from weasyprint import CSS, HTML
 
+from indico.core.cache import make_scoped_cache
 from indico.core.db import db
+from indico.core.errors import IndicoError
 from indico.modules.events.contributions.models.contributions import Contribution
 from indico.modules.events.models.events import Event
 from indico.modules.events.models.persons import EventPersonLink
@@ -34,6 +39,15 @@ from indico.web.flask.templating import get_template_module
 from indico.web.forms.colors import get_colors
 
 
+_timetable_versions = make_scoped_cache('timetable-version')
+pdf_timetable_cache = make_scoped_cache('timetable-pdf')
+
+#: How long a generated timetable PDF is kept in the cache
+PDF_TIMETABLE_CACHE_TTL = timedelta(days=1)
+#: How long we wait for a timetable PDF being generated before trying again
+PDF_TIMETABLE_PENDING_TTL = timedelta(minutes=10)
+
+
 def _query_events(categ_ids, day_start, day_end):
     event = db.aliased(Event)
     dates_overlap = lambda t: (t.start_dt >= day_start) & (t.start_dt <= day_end)
@@ -498,6 +512,89 @@ def generate_pdf_timetable(
     return create_pdf(html, css, event)
 
 
+def get_timetable_version(event):
+    """Get a token which changes whenever the timetable of an event changes."""
+    version = _timetable_versions.get(event.id)
+    if version is None:
+        # in case another process did the same in the meantime we use its version
+        _timetable_versions.add(event.id, uuid4().hex)
+        version = _timetable_versions.get(event.id)
+    return version
+
+
+def invalidate_timetable_version(event):
+    """Change the timetable version of an event.
+
+    The version is only changed once the current transaction has been
+    committed, since other processes could otherwise cache data based
+    on the old timetable with the new version.
+    """
+    if has_app_context():
+        g.setdefault('timetable_pending_invalidations', set()).add(event.id)
+    else:
+        _timetable_versions.delete(event.id)
+
+
+def apply_timetable_invalidations():
+    if event_ids := g.pop('timetable_pending_invalidations', None):
+        _timetable_versions.delete_many(*event_ids)
+
+
+def _get_pdf_timetable_key(event, config, only_session):
+    data = (event.id, get_timetable_version(event), config, only_session.id if only_session else None,
+            session.user.id if session.user else None, session.timezone, session.lang)
+    return hashlib.sha256(repr(data).encode()).hexdigest()
+
+
+def get_cached_pdf_timetable(
+    event: Event,
+    config=TimetableExportConfig(),  # noqa: B008 (frozen dataclass)
+    *,
+    only_session: Session | None = None,
+):
+    """Get a PDF timetable, generating it in the background if needed.
+
+    Since the timetable depends on the user's access and preferences, the
+    PDF is cached per user; anonymous users share the same cached PDF.
+
+    :return: A `BytesIO` containing the PDF, or ``None`` if it is still
+             being generated.
+    """
+    from indico.modules.events.timetable.tasks import generate_pdf_timetable_task
+    key = _get_pdf_timetable_key(event, config, only_session)
+    data = pdf_timetable_cache.get(key)
+    if data is False:
+        # allow trying again the next time
+        pdf_timetable_cache.delete(key)
+        raise IndicoError(_('Generating the timetable PDF failed.'))
+    elif data is not None:
+        return BytesIO(data)
+    if pdf_timetable_cache.add(('pending', key), True, PDF_TIMETABLE_PENDING_TTL):
+        generate_pdf_timetable_task.delay(key, event, config, only_session, session.user, session.timezone,
+                                          session.lang)
+    return None
+
+
+def build_cached_pdf_timetable(key, event, config, only_session):
+    """Generate a PDF timetable and store it in the cache."""
+    try:
+        pdf = generate_pdf_timetable(event, config, only_session=only_session)
+    except Exception:
+        pdf_timetable_cache.set(key, False, timedelta(minutes=1))
+        raise
+    else:
+        pdf_timetable_cache.set(key, pdf.getvalue(), PDF_TIMETABLE_CACHE_TTL)
+    finally:
+        pdf_timetable_cache.delete(('pending', key))
+
+
+def make_pdf_timetable_pending_response():
+    """Create a page which reloads itself until the PDF is available."""
+    response = current_app.make_response(render_template('events/timetable/pdf_pending.html'))
+    response.headers['Refresh'] = '3'
+    return response
+
+
 @memoize_request
 def get_top_level_entries(event):
     return event.timetable_entries.filter_by(parent_id=None).all()
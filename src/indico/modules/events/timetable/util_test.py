@@ -6,11 +6,14 @@
 # LICENSE file for more details.
 
 from datetime import date, datetime
+from io import BytesIO
 
 import pytest
 from pytz import utc
 
-from indico.modules.events.timetable.util import find_latest_entry_end_dt
+from indico.modules.events.timetable.util import (apply_timetable_invalidations, build_cached_pdf_timetable,
+                                                  find_latest_entry_end_dt, get_cached_pdf_timetable,
+                                                  get_timetable_version, invalidate_timetable_version)
 
 
 @pytest.mark.parametrize(('event_start_dt', 'event_end_dt', 'day', 'valid'), (
@@ -27,3 +30,31 @@ def test_find_latest_entry_end_dt_valid_day(dummy_event, event_start_dt, event_e
     if not valid:
         with pytest.raises(ValueError):
             find_latest_entry_end_dt(obj=dummy_event, day=day)
+
+
+@pytest.mark.usefixtures('request_context')
+def test_get_cached_pdf_timetable(dummy_event, mocker):
+    task = mocker.patch('indico.modules.events.timetable.tasks.generate_pdf_timetable_task')
+    mocker.patch('indico.modules.events.timetable.util.generate_pdf_timetable', return_value=BytesIO(b'pdf'))
+    assert get_cached_pdf_timetable(dummy_event) is None
+    assert get_cached_pdf_timetable(dummy_event) is None
+    task.delay.assert_called_once()
+    key, event, config, only_session = task.delay.call_args.args[:4]
+    build_cached_pdf_timetable(key, event, config, only_session)
+    assert get_cached_pdf_timetable(dummy_event).read() == b'pdf'
+    # changing the timetable results in a new PDF
+    invalidate_timetable_version(dummy_event)
+    apply_timetable_invalidations()
+    assert get_cached_pdf_timetable(dummy_event) is None
+    assert task.delay.call_count == 2
+
+
+@pytest.mark.usefixtures('request_context')
+def test_timetable_version(dummy_event):
+    version = get_timetable_version(dummy_event)
+    assert get_timetable_version(dummy_event) == version
+    invalidate_timetable_version(dummy_event)
+    # the version only changes after committing
+    assert get_timetable_version(dummy_event) == version
+    apply_timetable_invalidations()
+    assert get_timetable_version(dummy_event) != version
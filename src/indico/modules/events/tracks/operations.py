@@ -8,6 +8,7 @@
 from flask import session
 
 from indico.core.db import db
+from indico.modules.events.abstracts.models.abstracts import Abstract
 from indico.modules.events.tracks import logger
 from indico.modules.events.tracks.models.groups import TrackGroup
 from indico.modules.events.tracks.models.tracks import Track
@@ -34,6 +35,10 @@ def update_track(track, data):
 
 
 def delete_track(track):
+    # the reviews of the track are kept, but they no longer count for any track
+    track_key = str(track.id)
+    for abstract in Abstract.query.with_parent(track.event).filter(Abstract.review_stats.has_key(track_key)):
+        abstract.review_stats = {key: stats for key, stats in abstract.review_stats.items() if key != track_key}
     db.session.delete(track)
     logger.info('Track deleted by %r: %r', session.user, track)
 
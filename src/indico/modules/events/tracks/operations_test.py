@@ -0,0 +1,31 @@
+# This file is part of Indico.
+# Copyright (C) 2002 - 2025 CERN
+#
+# Indico is free software; you can redistribute it and/or
+# modify it under the terms of the MIT License; see the
+# LICENSE file for more details.
+
+import pytest
+
+from indico.modules.events.abstracts.models.reviews import AbstractAction, AbstractReview
+from indico.modules.events.tracks import Track
+from indico.modules.events.tracks.operations import delete_track
+
+
+@pytest.mark.usefixtures('request_context')
+def test_delete_track_review_stats(db, dummy_abstract, dummy_event, dummy_user, create_user):
+    track = Track(title='Dummy Track', event=dummy_event)
+    other_track = Track(title='Other Track', event=dummy_event)
+    dummy_abstract.reviewed_for_tracks = {track, other_track}
+    for user, review_track in ((dummy_user, track), (create_user(123), other_track)):
+        AbstractReview(abstract=dummy_abstract, track=review_track, user=user, proposed_action=AbstractAction.accept)
+    db.session.flush()
+    dummy_abstract.update_review_stats()
+    db.session.flush()
+    assert set(dummy_abstract.review_stats) == {str(track.id), str(other_track.id)}
+
+    delete_track(track)
+    db.session.flush()
+    assert set(dummy_abstract.review_stats) == {str(other_track.id)}
+    assert set(dummy_abstract.track_question_scores) == {other_track.id}
+    assert dummy_abstract.review_count == 2
@@ -13,11 +13,10 @@ import warnings
 from collections import defaultdict
 from contextlib import contextmanager
 from copy import deepcopy
-from io import BytesIO
 from mimetypes import guess_extension
 from tempfile import NamedTemporaryFile
 from urllib.parse import urlsplit
-from zipfile import ZipFile
+from zipfile import ZIP_STORED
 
 from flask import current_app, flash, g, redirect, request, session
 from sqlalchemy import inspect
@@ -54,7 +53,8 @@ from indico.util.i18n import _
 from indico.util.iterables import materialize_iterable
 from indico.util.string import strip_tags
 from indico.util.user import principal_from_identifier
-from indico.web.flask.util import send_file, url_for
+from indico.util.zipstream import iter_zip_stream
+from indico.web.flask.util import send_stream, url_for
 from indico.web.forms.colors import get_colors
 
 
@@ -710,35 +710,55 @@ class ZipGeneratorMixin:
     def _iter_items(self, files_holder):
         yield from files_holder
 
-    def _get_item_path(self, item):
-        return item.get_local_path()
+    def _open_item(self, item):
+        """Open an item for reading its contents.
 
-    def _generate_zip_file(self, files_holder, name_prefix='material', name_suffix=None, return_file=False):
+        This must return a file-like object which can be used as a
+        context manager.
+        """
+        return item.open()
+
+    def _get_item_size(self, item):
+        return getattr(item, 'size', None)
+
+    def _iter_named_items(self, files_holder):
+        """Yield the items to add along with their paths in the archive."""
+        self.used_filenames = set()
+        for item in self._iter_items(files_holder):
+            name = self._prepare_folder_structure(item)
+            self.used_filenames.add(name)
+            yield name, item
+
+    def _iter_zip_entries(self, files_holder):
+        for name, item in self._iter_named_items(files_holder):
+            yield name, self._open_item(item), self._get_item_size(item)
+
+    def _generate_zip_file(self, files_holder, name_prefix='material', name_suffix=None, return_file=False,
+                           compression=ZIP_STORED):
         """Generate a zip file containing the files passed.
 
+        Unless a file is requested, the zip file is streamed to the client
+        while it is being generated, reading the files straight from the
+        storage backend.
+
         :param files_holder: An iterable (or an iterable containing) object that
                              contains the files to be added in the zip file.
         :param name_prefix: The prefix to the zip file name
         :param name_suffix: The suffix to the zip file name
         :param return_file: Return the temp file instead of a response
+        :param compression: The compression method used for the files
         """
-        temp_file = NamedTemporaryFile(suffix='.zip', dir=config.TEMP_DIR, delete=False)  # noqa: SIM115
-        with ZipFile(temp_file.name, 'w', allowZip64=True) as zip_handler:
-            self.used_filenames = set()
-            for item in self._iter_items(files_holder):
-                name = self._prepare_folder_structure(item)
-                self.used_filenames.add(name)
-                with self._get_item_path(item) as filepath:
-                    if isinstance(filepath, BytesIO):
-                        zip_handler.writestr(name, filepath.getvalue())
-                    else:
-                        zip_handler.write(filepath, name)
-
-        zip_file_name = f'{name_prefix}-{name_suffix}.zip' if name_suffix else f'{name_prefix}.zip'
-        chmod_umask(temp_file.name)
+        chunks = iter_zip_stream(self._iter_zip_entries(files_holder), compression=compression)
         if return_file:
+            temp_file = NamedTemporaryFile(suffix='.zip', dir=config.TEMP_DIR, delete=False)  # noqa: SIM115
+            for chunk in chunks:
+                temp_file.write(chunk)
+            temp_file.flush()
+            temp_file.seek(0)
+            chmod_umask(temp_file.name)
             return temp_file
-        return send_file(zip_file_name, temp_file.name, 'application/zip', inline=False)
+        zip_file_name = f'{name_prefix}-{name_suffix}.zip' if name_suffix else f'{name_prefix}.zip'
+        return send_stream(zip_file_name, chunks, 'application/zip')
 
     def _prepare_folder_structure(self, item):
         file_name = secure_filename(f'{item.id}_{item.filename}', str(item.id))
@@ -53,6 +53,7 @@ class File(StoredFileMixin, db.Model):
     )
 
     # relationship backrefs:
+    # - attachment_package (AttachmentPackage.file)
     # - custom_boa_of (Event.custom_boa)
     # - data_export_of (DataExportRequest.file)
     # - editing_revision_files (EditingRevisionFile.file)
@@ -8,6 +8,7 @@
 from flask import session
 
 from indico.core import signals
+from indico.core.logger import Logger
 from indico.modules.logs.models.entries import (AppLogEntry, AppLogRealm, CategoryLogEntry, CategoryLogRealm,
                                                 EventLogEntry, EventLogRealm, LogKind)
 from indico.modules.logs.renderers import EmailRenderer, SimpleRenderer
@@ -21,6 +22,9 @@ __all__ = ('AppLogEntry', 'CategoryLogEntry', 'EventLogEntry', 'EventLogRealm',
            'LogKind')
 
 
+logger = Logger.get('logs')
+
+
 @signals.menu.items.connect_via('event-management-sidemenu')
 def _extend_event_management_menu(sender, event, **kwargs):
     if event.can_manage(session.user):
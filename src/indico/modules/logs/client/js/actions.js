@@ -20,6 +20,7 @@ export const VIEW_PREV_ENTRY = 'VIEW_PREV_ENTRY';
 export const VIEW_NEXT_ENTRY = 'VIEW_NEXT_ENTRY';
 export const SET_METADATA_QUERY = 'SET_METADATA_QUERY';
 export const SET_INITIAL_REALMS = 'SET_INITIAL_REALMS';
+export const SET_ARCHIVE = 'SET_ARCHIVE';
 
 export function setKeyword(keyword) {
   return {type: SET_KEYWORD, keyword};
@@ -45,6 +46,10 @@ export function setInitialRealms(initialRealms) {
   return {type: SET_INITIAL_REALMS, initialRealms};
 }
 
+export function setArchive(archive) {
+  return {type: SET_ARCHIVE, archive};
+}
+
 export function clearMetadataQuery() {
   return dispatch => {
     dispatch(setMetadataQuery({}));
@@ -113,8 +118,8 @@ export function viewNextEntry() {
   };
 }
 
-export function updateEntries(entries, pages, totalPageCount) {
-  return {type: UPDATE_ENTRIES, entries, pages, totalPageCount};
+export function updateEntries(entries, pages, totalPageCount, entriesPage) {
+  return {type: UPDATE_ENTRIES, entries, pages, totalPageCount, entriesPage};
 }
 
 export function fetchStarted() {
@@ -129,7 +134,7 @@ export function fetchLogEntries() {
   return async (dispatch, getStore) => {
     dispatch(fetchStarted());
     const {
-      logs: {filters, keyword, currentPage, metadataQuery},
+      logs: {filters, keyword, currentPage, metadataQuery, entries, entriesPage, archive},
       staticData: {fetchLogsUrl},
     } = getStore();
 
@@ -138,9 +143,21 @@ export function fetchLogEntries() {
       filters: [],
       meta: metadataQuery,
     };
+    // when moving to an adjacent page, let the server continue from the entries we
+    // already have instead of skipping all the entries before the requested page
+    if (currentPage > 1 && entries.length && !archive) {
+      if (currentPage === entriesPage + 1) {
+        params.after = entries[entries.length - 1].id;
+      } else if (currentPage === entriesPage - 1) {
+        params.before = entries[0].id;
+      }
+    }
     if (keyword) {
       params.q = keyword;
     }
+    if (archive) {
+      params.archive = archive;
+    }
 
     Object.entries(filters).forEach(([item, active]) => {
       if (active) {
@@ -159,7 +176,12 @@ export function fetchLogEntries() {
       dispatch(fetchFailed());
       return;
     }
-    const {entries, pages, total_page_count: totalPageCount} = response.data;
-    dispatch(updateEntries(entries, pages, totalPageCount));
+    const {
+      entries: newEntries,
+      pages,
+      total_page_count: totalPageCount,
+      current_page: entriesPage,
+    } = response.data;
+    dispatch(updateEntries(newEntries, pages, totalPageCount, entriesPage));
   };
 }
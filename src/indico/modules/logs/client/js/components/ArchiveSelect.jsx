@@ -0,0 +1,60 @@
+// This file is part of Indico.
+// Copyright (C) 2002 - 2025 CERN
+//
+// Indico is free software; you can redistribute it and/or
+// modify it under the terms of the MIT License; see the
+// LICENSE file for more details.
+
+
+import PropTypes from 'prop-types';
+import React from 'react';
+
+import {PluralTranslate, Translate} from 'indico/react/i18n';
+
+export default function ArchiveSelect({archives, archive, setArchive}) {
+  if (!archives.length) {
+    return null;
+  }
+  return (
+    <div className="toolbar">
+      <div className="group">
+        <span className="i-button label">
+          <Translate>Entries</Translate>
+        </span>
+        <select
+          className="i-button"
+          value={archive || ''}
+          onChange={e => setArchive(e.target.value ? +e.target.value : null)}
+        >
+          <option value="">{Translate.string('Recent')}</option>
+          {archives.map(({id, title, entryCount}) => (
+            <option key={id} value={id}>
+              {PluralTranslate.string(
+                '{title} (archived, {count} entry)',
+                '{title} (archived, {count} entries)',
+                entryCount,
+                {title, count: entryCount}
+              )}
+            </option>
+          ))}
+        </select>
+      </div>
+    </div>
+  );
+}
+
+ArchiveSelect.propTypes = {
+  archives: PropTypes.arrayOf(
+    PropTypes.shape({
+      id: PropTypes.number.isRequired,
+      title: PropTypes.string.isRequired,
+      entryCount: PropTypes.number.isRequired,
+    })
+  ).isRequired,
+  archive: PropTypes.number,
+  setArchive: PropTypes.func.isRequired,
+};
+
+ArchiveSelect.defaultProps = {
+  archive: null,
+};
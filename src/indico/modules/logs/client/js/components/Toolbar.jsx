@@ -9,6 +9,7 @@ import PropTypes from 'prop-types';
 import React from 'react';
 import {connect} from 'react-redux';
 
+import ArchiveSelect from '../containers/ArchiveSelect';
 import Filter from '../containers/Filter';
 import SearchBox from '../containers/SearchBox';
 
@@ -22,6 +23,7 @@ class Toolbar extends React.Component {
     return (
       <div className="toolbars">
         <Filter realms={realms} />
+        <ArchiveSelect />
         <SearchBox />
       </div>
     );
@@ -0,0 +1,31 @@
+// This file is part of Indico.
+// Copyright (C) 2002 - 2025 CERN
+//
+// Indico is free software; you can redistribute it and/or
+// modify it under the terms of the MIT License; see the
+// LICENSE file for more details.
+
+
+import {connect} from 'react-redux';
+
+import {fetchLogEntries, setArchive, setDetailedView, setPage} from '../actions';
+import ArchiveSelect from '../components/ArchiveSelect';
+
+const mapStateToProps = ({logs, staticData}) => ({
+  archives: staticData.archives,
+  archive: logs.archive,
+});
+
+const mapDispatchToProps = dispatch => ({
+  setArchive: archive => {
+    dispatch(setArchive(archive));
+    dispatch(setPage(1));
+    dispatch(setDetailedView(null));
+    dispatch(fetchLogEntries());
+  },
+});
+
+export default connect(
+  mapStateToProps,
+  mapDispatchToProps
+)(ArchiveSelect);
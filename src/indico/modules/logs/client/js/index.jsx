@@ -23,6 +23,7 @@ window.addEventListener('load', () => {
     staticData: {
       fetchLogsUrl: rootElement.dataset.fetchLogsUrl,
       realms: JSON.parse(rootElement.dataset.realms),
+      archives: JSON.parse(rootElement.dataset.archives),
       pageSize: 15,
     },
   };
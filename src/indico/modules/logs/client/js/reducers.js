@@ -11,12 +11,14 @@ const initialState = {
   entries: [],
   keyword: null,
   currentPage: 1,
+  entriesPage: null,
   isFetching: false,
   metadataQuery: {},
   filters: {},
   pages: [],
   totalPageCount: 0,
   currentViewIndex: null,
+  archive: null,
 };
 
 export default function logReducer(state = initialState, action) {
@@ -33,6 +35,7 @@ export default function logReducer(state = initialState, action) {
       return {
         ...state,
         entries: action.entries,
+        entriesPage: action.entriesPage,
         pages: action.pages,
         totalPageCount: action.totalPageCount,
         isFetching: false,
@@ -43,6 +46,8 @@ export default function logReducer(state = initialState, action) {
       return {...state, isFetching: false};
     case actions.SET_DETAILED_VIEW:
       return {...state, currentViewIndex: action.currentViewIndex};
+    case actions.SET_ARCHIVE:
+      return {...state, archive: action.archive};
     case actions.SET_METADATA_QUERY:
       return {...state, metadataQuery: action.metadataQuery};
     default:
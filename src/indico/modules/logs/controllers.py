@@ -5,32 +5,102 @@
 # modify it under the terms of the MIT License; see the
 # LICENSE file for more details.
 
+
 from babel.dates import get_timezone
 from flask import flash, jsonify, redirect, request, session
+from flask_sqlalchemy.pagination import Pagination
 from werkzeug.exceptions import BadRequest, Forbidden
 
 from indico.core.config import config
 from indico.core.db import db
-from indico.core.db.sqlalchemy.util.queries import preprocess_ts_string
+from indico.core.db.sqlalchemy.util.models import IndicoQueryPagination
+from indico.core.db.sqlalchemy.util.queries import escape_like, preprocess_ts_string
 from indico.core.notifications import make_email, send_email
 from indico.modules.admin import RHAdminBase
 from indico.modules.categories.controllers.base import RHManageCategoryBase
 from indico.modules.events.management.controllers import RHManageEventBase
+from indico.modules.logs.models.archives import LogArchive, LogArchiveType
 from indico.modules.logs.models.entries import (AppLogEntry, AppLogRealm, CategoryLogEntry, CategoryLogRealm,
                                                 EventLogEntry, EventLogRealm, UserLogEntry, UserLogRealm)
-from indico.modules.logs.util import serialize_log_entry
+from indico.modules.logs.util import get_archived_log_records, serialize_log_entry
 from indico.modules.logs.views import WPAppLogs, WPCategoryLogs, WPEventLogs, WPUserLogs
 from indico.modules.users.controllers import RHUserBase
+from indico.util.date_time import format_date
 from indico.util.i18n import _
+from indico.util.string import remove_accents
 from indico.web.flask.util import url_for
 
 
 LOG_PAGE_SIZE = 15
-
-
-def _contains(field, text):
-    return (db.func.to_tsvector('simple', db.func.indico.indico_unaccent(field))
-            .match(db.func.indico.indico_unaccent(preprocess_ts_string(text)), postgresql_regconfig='simple'))
+#: How many pages after the current one are counted at most
+LOG_COUNT_PAGES_AHEAD = 10
+
+
+class LogEntryPagination(IndicoQueryPagination):
+    """Paginate log entries without looking at the whole log.
+
+    When the entry right before or after the requested page is known
+    (i.e. when going to the next or previous page), the page is loaded
+    based on the ``(logged_dt, id)`` of that entry instead of skipping
+    all the entries before it. Entries are only counted up to a few
+    pages after the requested one, so the total number of pages is a
+    lower bound for large logs.
+    """
+
+    def _query_items(self):
+        query = self._query_args['query']
+        model = self._query_args['model']
+        after = self._query_args.get('after')
+        before = self._query_args.get('before')
+        sort_key = db.tuple_(model.logged_dt, model.id)
+        if after is not None:
+            return (query.filter(sort_key < after)
+                    .order_by(model.logged_dt.desc(), model.id.desc())
+                    .limit(self.per_page)
+                    .all())
+        elif before is not None:
+            items = (query.filter(sort_key > before)
+                     .order_by(model.logged_dt, model.id)
+                     .limit(self.per_page)
+                     .all())
+            return items[::-1]
+        return (query.order_by(model.logged_dt.desc(), model.id.desc())
+                .limit(self.per_page)
+                .offset(self._query_offset)
+                .all())
+
+    def _query_count(self):
+        query = self._query_args['query']
+        model = self._query_args['model']
+        limit = (self.page + LOG_COUNT_PAGES_AHEAD) * self.per_page
+        subquery = query.with_entities(model.id).order_by(None).limit(limit).subquery()
+        return db.session.query(subquery).count()
+
+
+class ArchivedLogEntryPagination(Pagination):
+    """Paginate log entries loaded from an archive.
+
+    Only the entries on the requested page are created from the raw
+    archive data.
+    """
+
+    def _query_items(self):
+        records = self._query_args['records']
+        return self._query_args['archive'].build_entries(records[self._query_offset:self._query_offset + self.per_page])
+
+    def _query_count(self):
+        return len(self._query_args['records'])
+
+
+def _matches(model, text):
+    # the words must all be in the entry's search vector or in the name of its user
+    name_criteria = [db.func.indico.indico_unaccent(db.func.lower(db.m.User.searchable_names))
+                     .ilike(f'%{escape_like(remove_accents(word.lower()))}%')
+                     for word in text.split()]
+    user_ids = db.session.query(db.m.User.id).filter(*name_criteria)
+    return db.or_(model.search_vector.match(db.func.indico.indico_unaccent(preprocess_ts_string(text)),
+                                            postgresql_regconfig='simple'),
+                  model.user_id.in_(user_ids.scalar_subquery()))
 
 
 def _get_metadata_query():
@@ -39,6 +109,13 @@ def _get_metadata_query():
             if k.startswith('meta.')}
 
 
+def _get_archives(log_type, obj):
+    archives = LogArchive.query_for(log_type, obj).order_by(LogArchive.start_dt.desc(), LogArchive.id).all()
+    return [{'id': archive.id, 'title': format_date(archive.start_dt, 'MMMM yyyy', timezone='UTC'),
+             'entryCount': archive.entry_count}
+            for archive in archives]
+
+
 class RHAppLogs(RHAdminBase):
     """Show app logs."""
 
@@ -47,6 +124,7 @@ class RHAppLogs(RHAdminBase):
         realms = {realm.name: realm.title for realm in AppLogRealm}
         return WPAppLogs.render_template('logs.html', 'logs',
                                          realms=realms, metadata_query=metadata_query,
+                                         archives=_get_archives(LogArchiveType.app, None),
                                          logs_api_url=url_for('.api_app_logs'))
 
 
@@ -58,6 +136,7 @@ class RHCategoryLogs(RHManageCategoryBase):
         realms = {realm.name: realm.title for realm in CategoryLogRealm}
         return WPCategoryLogs.render_template('logs.html', self.category, 'logs',
                                               realms=realms, metadata_query=metadata_query,
+                                              archives=_get_archives(LogArchiveType.category, self.category),
                                               logs_api_url=url_for('.api_category_logs', self.category))
 
 
@@ -68,6 +147,7 @@ class RHEventLogs(RHManageEventBase):
         metadata_query = _get_metadata_query()
         realms = {realm.name: realm.title for realm in EventLogRealm}
         return WPEventLogs.render_template('logs.html', self.event, realms=realms, metadata_query=metadata_query,
+                                           archives=_get_archives(LogArchiveType.event, self.event),
                                            logs_api_url=url_for('.api_event_logs', self.event))
 
 
@@ -84,12 +164,14 @@ class RHUserLogs(RHUserBase):
         realms = {realm.name: realm.title for realm in UserLogRealm}
         return WPUserLogs.render_template('logs.html', 'logs', user=self.user,
                                           realms=realms, metadata_query=metadata_query,
+                                          archives=_get_archives(LogArchiveType.user, self.user),
                                           logs_api_url=url_for('.api_user_logs', self.user))
 
 
 class LogsAPIMixin:
     model = None
     realm_enum = None
+    archive_type = None
 
     @property
     def object(self):
@@ -99,6 +181,11 @@ class LogsAPIMixin:
     def object_tzinfo(self):
         raise NotImplementedError
 
+    def _get_sort_key(self, entry_id):
+        query = self.object.log_entries if self.object else self.model.query
+        row = query.filter_by(id=entry_id).with_entities(self.model.logged_dt, self.model.id).first()
+        return tuple(row) if row else None
+
     def _process(self):
         page = int(request.args.get('page', 1))
         filters = request.args.getlist('filters')
@@ -108,38 +195,48 @@ class LogsAPIMixin:
         if not filters and not metadata_query:
             return jsonify(current_page=1, pages=[], entries=[], total_page_count=0)
 
-        query = self.object.log_entries if self.object else self.model.query
-        query = query.order_by(self.model.logged_dt.desc())
         realms = {self.realm_enum.get(f) for f in filters if self.realm_enum.get(f)}
+        if 'archive' in request.args:
+            archive = (LogArchive.query_for(self.archive_type, self.object)
+                       .filter_by(id=request.args.get('archive', type=int))
+                       .first_or_404())
+            records = get_archived_log_records(archive, realms=realms, metadata_query=metadata_query, text=text)
+            return self._jsonify_page(ArchivedLogEntryPagination(archive=archive, records=records, page=page,
+                                                                 per_page=LOG_PAGE_SIZE, max_per_page=None))
+
+        # when moving to an adjacent page the client sends the id of the last/first
+        # entry it already has, which lets us avoid an offset on large logs
+        after = before = None
+        if 'after' in request.args:
+            after = self._get_sort_key(request.args.get('after', type=int))
+        elif 'before' in request.args:
+            before = self._get_sort_key(request.args.get('before', type=int))
+
+        query = self.object.log_entries if self.object else self.model.query
         if realms:
             query = query.filter(self.model.realm.in_(realms))
 
-        if text:
-            query = query.filter(
-                db.or_(_contains(self.model.module, text),
-                       _contains(self.model.type, text),
-                       _contains(self.model.summary, text),
-                       _contains(db.m.User.first_name + ' ' + db.m.User.last_name, text),
-                       _contains(self.model.data['body'].astext, text),
-                       _contains(self.model.data['subject'].astext, text),
-                       _contains(self.model.data['from'].astext, text),
-                       _contains(self.model.data['to'].astext, text),
-                       _contains(self.model.data['cc'].astext, text))
-            ).outerjoin(db.m.User, db.m.User.id == self.model.user_id)
+        if text and text.strip():
+            query = query.filter(_matches(self.model, text))
 
         if metadata_query:
             query = query.filter(self.model.meta.contains(metadata_query))
 
-        query = query.paginate(page=page, per_page=LOG_PAGE_SIZE)
+        return self._jsonify_page(LogEntryPagination(query=query, model=self.model, after=after, before=before,
+                                                     page=page, per_page=LOG_PAGE_SIZE, max_per_page=None))
+
+    def _jsonify_page(self, pagination):
         tzinfo = self.object_tzinfo
         entries = [dict(serialize_log_entry(entry, tzinfo), index=index, html=entry.render())
-                   for index, entry in enumerate(query.items)]
-        return jsonify(current_page=page, pages=list(query.iter_pages()), total_page_count=query.pages, entries=entries)
+                   for index, entry in enumerate(pagination.items)]
+        return jsonify(current_page=pagination.page, pages=list(pagination.iter_pages()),
+                       total_page_count=pagination.pages, entries=entries)
 
 
 class RHAppLogsJSON(LogsAPIMixin, RHAdminBase):
     model = AppLogEntry
     realm_enum = AppLogRealm
+    archive_type = LogArchiveType.app
 
     @property
     def object(self):
@@ -153,6 +250,7 @@ class RHAppLogsJSON(LogsAPIMixin, RHAdminBase):
 class RHCategoryLogsJSON(LogsAPIMixin, RHManageCategoryBase):
     model = CategoryLogEntry
     realm_enum = CategoryLogRealm
+    archive_type = LogArchiveType.category
 
     @property
     def object(self):
@@ -166,6 +264,7 @@ class RHCategoryLogsJSON(LogsAPIMixin, RHManageCategoryBase):
 class RHEventLogsJSON(LogsAPIMixin, RHManageEventBase):
     model = EventLogEntry
     realm_enum = EventLogRealm
+    archive_type = LogArchiveType.event
 
     @property
     def object(self):
@@ -179,6 +278,7 @@ class RHEventLogsJSON(LogsAPIMixin, RHManageEventBase):
 class RHUserLogsJSON(LogsAPIMixin, RHUserBase):
     model = UserLogEntry
     realm_enum = UserLogRealm
+    archive_type = LogArchiveType.user
 
     @property
     def object(self):
@@ -0,0 +1,72 @@
+# This file is part of Indico.
+# Copyright (C) 2002 - 2025 CERN
+#
+# Indico is free software; you can redistribute it and/or
+# modify it under the terms of the MIT License; see the
+# LICENSE file for more details.
+
+from datetime import timedelta
+from itertools import pairwise
+
+import pytest
+
+from indico.core.db import db
+from indico.modules.logs.controllers import LogEntryPagination, _matches
+from indico.modules.logs.models.entries import EventLogEntry, EventLogRealm, LogKind
+from indico.util.date_time import now_utc
+
+
+@pytest.fixture
+def log_entries(dummy_event, dummy_user):
+    start_dt = now_utc()
+    entries = []
+    for i in range(10):
+        entry = dummy_event.log(EventLogRealm.management, LogKind.other, 'Test', f'Entry {i}', user=dummy_user,
+                                type_='email', data={'subject': f'Subject {i}', 'body': f'Hello wörld {i}'})
+        # two entries share each timestamp to make sure the id is used as well
+        entry.logged_dt = start_dt - timedelta(minutes=i // 2)
+        entries.append(entry)
+    db.session.flush()
+    return entries
+
+
+def test_log_entry_pagination(dummy_event, log_entries):
+    query = dummy_event.log_entries
+    pages = [LogEntryPagination(query=query, model=EventLogEntry, page=page, per_page=3, max_per_page=None)
+             for page in range(1, 5)]
+    expected = sorted(log_entries, key=lambda entry: (entry.logged_dt, entry.id), reverse=True)
+    assert [entry for page in pages for entry in page.items] == expected
+    assert pages[0].total == 10
+    assert pages[0].pages == 4
+
+    # continuing from the last/first entry of an adjacent page gives the same entries
+    for prev_page, page in pairwise(pages):
+        last = prev_page.items[-1]
+        keyset_page = LogEntryPagination(query=query, model=EventLogEntry, page=page.page, per_page=3,
+                                         max_per_page=None, after=(last.logged_dt, last.id))
+        assert keyset_page.items == page.items
+    for page, next_page in pairwise(pages):
+        first = next_page.items[0]
+        keyset_page = LogEntryPagination(query=query, model=EventLogEntry, page=page.page, per_page=3,
+                                         max_per_page=None, before=(first.logged_dt, first.id))
+        assert keyset_page.items == page.items
+
+
+def test_log_entry_pagination_count_limit(mocker, dummy_event, log_entries):
+    mocker.patch('indico.modules.logs.controllers.LOG_COUNT_PAGES_AHEAD', 1)
+    pagination = LogEntryPagination(query=dummy_event.log_entries, model=EventLogEntry, page=1, per_page=3,
+                                    max_per_page=None)
+    assert pagination.total == 6
+
+
+@pytest.mark.parametrize(('text', 'expected'), (
+    ('subject', 10),
+    ('subj 3', 1),
+    ('world 7', 1),
+    ('entry hello', 10),
+    ('guinea', 10),
+    ('pig', 10),
+    ('nothing', 0),
+))
+def test_log_entry_search(dummy_event, log_entries, text, expected):
+    assert dummy_event.log_entries.filter(_matches(EventLogEntry, text)).count() == expected
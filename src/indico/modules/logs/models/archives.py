@@ -0,0 +1,170 @@
+# This file is part of Indico.
+# Copyright (C) 2002 - 2025 CERN
+#
+# Indico is free software; you can redistribute it and/or
+# modify it under the terms of the MIT License; see the
+# LICENSE file for more details.
+
+import gzip
+import io
+import json
+import posixpath
+from datetime import datetime
+
+from sqlalchemy.orm.attributes import set_committed_value
+
+from indico.core.config import config
+from indico.core.db import db
+from indico.core.db.sqlalchemy import PyIntEnum, UTCDateTime
+from indico.core.storage import StoredFileMixin
+from indico.modules.logs.models.entries import AppLogEntry, CategoryLogEntry, EventLogEntry, LogKind, UserLogEntry
+from indico.util.enum import IndicoIntEnum
+from indico.util.string import format_repr
+
+
+class LogArchiveType(IndicoIntEnum):
+    event = 1
+    category = 2
+    user = 3
+    app = 4
+
+    @property
+    def model(self):
+        return {LogArchiveType.event: EventLogEntry,
+                LogArchiveType.category: CategoryLogEntry,
+                LogArchiveType.user: UserLogEntry,
+                LogArchiveType.app: AppLogEntry}[self]
+
+
+class LogArchive(StoredFileMixin, db.Model):
+    """An archive of old log entries.
+
+    Each archive contains the entries one log (of an event, category,
+    user or the application) had in a given month.  They are stored as
+    a compressed file in the storage backend and removed from the log
+    table, so the log tables only contain recent entries.
+    """
+
+    __tablename__ = 'log_archives'
+    __table_args__ = (db.Index(None, 'type', 'object_id', 'start_dt'),
+                      {'schema': 'indico'})
+
+    #: The ID of the archive
+    id = db.Column(
+        db.Integer,
+        primary_key=True
+    )
+    #: The type of the archived log
+    type = db.Column(
+        PyIntEnum(LogArchiveType),
+        nullable=False
+    )
+    #: The ID of the event/category/user whose log entries are archived
+    object_id = db.Column(
+        db.Integer,
+        nullable=True
+    )
+    #: The start of the month containing the archived entries
+    start_dt = db.Column(
+        UTCDateTime,
+        nullable=False
+    )
+    #: The start of the month after the one containing the archived entries
+    end_dt = db.Column(
+        UTCDateTime,
+        nullable=False
+    )
+    #: The number of archived log entries
+    entry_count = db.Column(
+        db.Integer,
+        nullable=False
+    )
+
+    def __repr__(self):
+        return format_repr(self, 'id', 'type', 'object_id', 'start_dt', 'entry_count')
+
+    @classmethod
+    def query_for(cls, log_type, obj):
+        """Get a query for the archives of a log.
+
+        :param log_type: A :class:`LogArchiveType`
+        :param obj: The event/category/user, or `None` for the application log
+        """
+        return cls.query.filter_by(type=log_type, object_id=(obj.id if obj is not None else None))
+
+    def _build_storage_path(self):
+        self.assign_id()
+        path_segments = ['logs', self.type.name, str(self.object_id or 0)]
+        return config.LOG_ARCHIVE_STORAGE, posixpath.join(*path_segments, f'{self.id}-{self.filename}')
+
+    def save_entries(self, entries):
+        """Store log entries in the archive file.
+
+        :param entries: The log entries to archive
+        """
+        buf = io.BytesIO()
+        with gzip.GzipFile(fileobj=buf, mode='wb') as f:
+            for entry in entries:
+                f.write(json.dumps(_dump_entry(entry)).encode() + b'\n')
+        self.entry_count = len(entries)
+        self.filename = f'{self.start_dt:%Y-%m}.jsonl.gz'
+        self.content_type = 'application/gzip'
+        buf.seek(0)
+        self.save(buf)
+
+    def load_records(self):
+        """Load the raw log entry data from the archive file."""
+        with self.open() as f, gzip.open(f, 'rt') as gz:
+            return [json.loads(line) for line in gz]
+
+    def build_entries(self, records):
+        """Create log entries from raw data loaded from the archive.
+
+        The entries are transient objects which are not added to the
+        database session, but they can be serialized and rendered just
+        like entries which are still in the log table.
+
+        :param records: Entry data as returned by :meth:`load_records`
+        """
+        model = self.type.model
+        entries = [_load_entry(model, data) for data in records]
+        user_ids = {entry.user_id for entry in entries if entry.user_id is not None}
+        users = {u.id: u for u in db.m.User.query.filter(db.m.User.id.in_(user_ids))} if user_ids else {}
+        for entry in entries:
+            set_committed_value(entry, 'user', users.get(entry.user_id))
+        return entries
+
+    def load_entries(self):
+        """Load the log entries from the archive file.
+
+        See :meth:`build_entries` for details about the entries.
+        """
+        return self.build_entries(self.load_records())
+
+
+def _dump_entry(entry):
+    data = {
+        'id': entry.id,
+        'logged_dt': entry.logged_dt.isoformat(),
+        'kind': entry.kind.name,
+        'realm': entry.realm.name,
+        'module': entry.module,
+        'type': entry.type,
+        'summary': entry.summary,
+        'data': entry.data,
+        'meta': entry.meta,
+        'user_id': entry.user_id,
+    }
+    if entry.link_fk_name:
+        data[entry.link_fk_name] = getattr(entry, entry.link_fk_name)
+    return data
+
+
+def _load_entry(model, data):
+    realm_enum = model.__table__.c.realm.type.enum
+    entry = model(id=data['id'], logged_dt=datetime.fromisoformat(data['logged_dt']), kind=LogKind[data['kind']],
+                  realm=realm_enum[data['realm']], module=data['module'], type=data['type'],
+                  summary=data['summary'], data=data['data'], meta=data['meta'], user_id=data['user_id'])
+    if model.link_fk_name:
+        setattr(entry, model.link_fk_name, data[model.link_fk_name])
+    return entry
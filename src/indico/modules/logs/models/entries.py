@@ -5,7 +5,7 @@
 # modify it under the terms of the MIT License; see the
 # LICENSE file for more details.
 
-from sqlalchemy.dialects.postgresql import JSON, JSONB
+from sqlalchemy.dialects.postgresql import JSON, JSONB, TSVECTOR
 from sqlalchemy.ext.declarative import declared_attr
 
 from indico.core.db import db
@@ -60,6 +60,18 @@ class LogKind(IndicoIntEnum):
     negative = 4
 
 
+#: The searchable text of a log entry. Email bodies are truncated to
+#: keep the tsvector of huge emails below the size limit of postgres.
+SEARCH_VECTOR_SQL = '''
+    to_tsvector('simple'::regconfig, indico.indico_unaccent(
+        module || ' ' || type || ' ' || summary || ' ' ||
+        coalesce(data ->> 'subject', '') || ' ' || coalesce(data ->> 'from', '') || ' ' ||
+        coalesce(data ->> 'to', '') || ' ' || coalesce(data ->> 'cc', '') || ' ' ||
+        left(coalesce(data ->> 'body', ''), 100000)
+    ))
+'''
+
+
 class LogEntryBase(db.Model):
     """Base model for log entries."""
 
@@ -69,7 +81,11 @@ class LogEntryBase(db.Model):
     @strict_classproperty
     @classmethod
     def __auto_table_args(cls):
-        return (db.Index(None, 'meta', postgresql_using='gin'),)
+        # the last index is used to list the log entries of an object page by page
+        sort_columns = ([cls.link_fk_name] if cls.link_fk_name else []) + ['logged_dt', 'id']
+        return (db.Index(None, 'meta', postgresql_using='gin'),
+                db.Index(None, 'search_vector', postgresql_using='gin'),
+                db.Index(None, *sort_columns))
 
     user_backref_name = None
     link_fk_name = None
@@ -122,6 +138,11 @@ class LogEntryBase(db.Model):
         JSONB,
         nullable=False
     )
+    #: The fulltext search vector of the entry (generated by postgres)
+    search_vector = db.Column(
+        TSVECTOR,
+        db.Computed(SEARCH_VECTOR_SQL, persisted=True)
+    )
 
     @declared_attr
     def user_id(cls):
@@ -0,0 +1,80 @@
+# This file is part of Indico.
+# Copyright (C) 2002 - 2025 CERN
+#
+# Indico is free software; you can redistribute it and/or
+# modify it under the terms of the MIT License; see the
+# LICENSE file for more details.
+
+from dateutil.relativedelta import relativedelta
+
+from indico.core.db import db
+from indico.core.db.sqlalchemy import UTCDateTime
+from indico.modules.logs import logger
+from indico.modules.logs.models.archives import LogArchive, LogArchiveType
+
+
+def get_archivable_log_months(log_type, before):
+    """Get the logs and months which contain entries to archive.
+
+    :param log_type: A :class:`LogArchiveType`
+    :param before: Only entries logged before this date are archived;
+                   it should be the start of a month
+    :return: A list of ``(object_id, month_start_dt)`` tuples
+    """
+    model = log_type.model
+    month = db.func.date_trunc('month', model.logged_dt, type_=UTCDateTime)
+    if not model.link_fk_name:
+        query = db.session.query(month).filter(model.logged_dt < before).group_by(month).order_by(month)
+        return [(None, start_dt) for start_dt, in query]
+    object_id = getattr(model, model.link_fk_name)
+    return (db.session.query(object_id, month)
+            .filter(model.logged_dt < before)
+            .group_by(object_id, month)
+            .order_by(object_id, month)
+            .all())
+
+
+def archive_log_month(log_type, object_id, start_dt):
+    """Move the entries a log has in one month into an archive.
+
+    The entries are stored in a compressed file in the storage backend
+    and deleted from the log table.
+
+    :param log_type: A :class:`LogArchiveType`
+    :param object_id: The ID of the event/category/user, or `None` for
+                      the application log
+    :param start_dt: The start of the month to archive
+    :return: The new :class:`LogArchive`
+    """
+    model = log_type.model
+    end_dt = start_dt + relativedelta(months=1)
+    query = model.query.filter(model.logged_dt >= start_dt, model.logged_dt < end_dt)
+    if model.link_fk_name:
+        query = query.filter(getattr(model, model.link_fk_name) == object_id)
+    entries = query.order_by(model.logged_dt, model.id).all()
+    archive = LogArchive(type=log_type, object_id=object_id, start_dt=start_dt, end_dt=end_dt)
+    archive.save_entries(entries)
+    db.session.add(archive)
+    query.delete(synchronize_session=False)
+    for entry in entries:
+        db.session.expunge(entry)
+    db.session.flush()
+    logger.info('Archived %d %s log entries of %s (%s) to %s', archive.entry_count, log_type.name,
+                start_dt.strftime('%Y-%m'), object_id, archive)
+    return archive
+
+
+def archive_log_entries(before):
+    """Archive all log entries logged before the given date.
+
+    Each month of each log is archived separately and committed right
+    away, so an interrupted run can simply be restarted.
+
+    :param before: The date before which entries are archived; it
+                   should be the start of a month
+    """
+    for log_type in LogArchiveType:
+        for object_id, start_dt in get_archivable_log_months(log_type, before):
+            archive = archive_log_month(log_type, object_id, start_dt)
+            db.session.commit()
+            yield archive
@@ -0,0 +1,74 @@
+# This file is part of Indico.
+# Copyright (C) 2002 - 2025 CERN
+#
+# Indico is free software; you can redistribute it and/or
+# modify it under the terms of the MIT License; see the
+# LICENSE file for more details.
+
+from datetime import datetime
+
+import pytz
+
+from indico.modules.logs.models.archives import LogArchive, LogArchiveType
+from indico.modules.logs.models.entries import AppLogEntry, AppLogRealm, EventLogRealm, LogKind
+from indico.modules.logs.operations import archive_log_entries
+from indico.modules.logs.util import filter_archived_log_entries, get_archived_log_records
+
+
+def _dt(month, day):
+    return pytz.utc.localize(datetime(2024, month, day, 12))
+
+
+def test_archive_log_entries(db, dummy_event, dummy_user):
+    for month, day in ((1, 5), (1, 31), (2, 1), (3, 1)):
+        entry = dummy_event.log(EventLogRealm.emails, LogKind.other, 'Emails', f'Sent email {month}/{day}',
+                                user=dummy_user, type_='email', data={'subject': 'Hellö', 'body': f'Body {day}'},
+                                meta={'month': month})
+        entry.logged_dt = _dt(month, day)
+    AppLogEntry.log(AppLogRealm.admin, LogKind.other, 'Test', 'Something', data={'foo': 'bar'}).logged_dt = _dt(1, 1)
+    db.session.flush()
+
+    archives = list(archive_log_entries(_dt(3, 1).replace(day=1, hour=0)))
+    assert [(a.type, a.object_id, a.start_dt, a.entry_count) for a in archives] == [
+        (LogArchiveType.event, dummy_event.id, _dt(1, 1).replace(hour=0), 2),
+        (LogArchiveType.event, dummy_event.id, _dt(2, 1).replace(hour=0), 1),
+        (LogArchiveType.app, None, _dt(1, 1).replace(hour=0), 1),
+    ]
+    assert [e.summary for e in dummy_event.log_entries] == ['Sent email 3/1']
+    assert not AppLogEntry.query.has_rows()
+    assert LogArchive.query_for(LogArchiveType.event, dummy_event).count() == 2
+
+    entries = archives[0].load_entries()
+    assert [(e.summary, e.logged_dt, e.user, e.event_id, e.realm) for e in entries] == [
+        ('Sent email 1/5', _dt(1, 5), dummy_user, dummy_event.id, EventLogRealm.emails),
+        ('Sent email 1/31', _dt(1, 31), dummy_user, dummy_event.id, EventLogRealm.emails),
+    ]
+    assert archives[2].load_entries()[0].data == {'foo': 'bar'}
+
+    # loading archived entries must not add them to the session
+    db.session.flush()
+    assert dummy_event.log_entries.count() == 1
+
+    assert len(filter_archived_log_entries(entries, text='hello body 31')) == 1
+    assert len(filter_archived_log_entries(entries, text='guinea')) == 2
+    assert len(filter_archived_log_entries(entries, realms={EventLogRealm.management})) == 0
+    assert len(filter_archived_log_entries(entries, metadata_query={'month': 1})) == 2
+
+
+def test_get_archived_log_records(db, mocker, dummy_event):
+    for day in (1, 3, 2):
+        entry = dummy_event.log(EventLogRealm.emails, LogKind.other, 'Emails', f'Sent email {day}', meta={'day': day})
+        entry.logged_dt = _dt(1, day)
+    db.session.flush()
+    archive = next(archive_log_entries(_dt(2, 1).replace(hour=0)))
+    load_records = mocker.spy(LogArchive, 'load_records')
+
+    records = get_archived_log_records(archive, realms={EventLogRealm.emails})
+    assert [r['summary'] for r in records] == ['Sent email 3', 'Sent email 2', 'Sent email 1']
+    assert [e.summary for e in archive.build_entries(records[1:])] == ['Sent email 2', 'Sent email 1']
+    # the filtered data is cached
+    assert get_archived_log_records(archive, realms={EventLogRealm.emails}) == records
+    assert load_records.call_count == 1
+    # but different filters need to load the archive again
+    assert [r['summary'] for r in get_archived_log_records(archive, metadata_query={'day': 2})] == ['Sent email 2']
+    assert load_records.call_count == 2
@@ -5,17 +5,25 @@
 # modify it under the terms of the MIT License; see the
 # LICENSE file for more details.
 
+import hashlib
+import json
 import re
 from datetime import date, datetime, timedelta
 from difflib import SequenceMatcher
 from enum import Enum
+from operator import attrgetter
 
 from markupsafe import Markup
 
 from indico.core import signals
+from indico.core.cache import make_scoped_cache
 from indico.util.date_time import format_human_timedelta
 from indico.util.i18n import force_locale, orig_string
 from indico.util.signals import named_objects_from_signal
+from indico.util.string import remove_accents
+
+
+archive_cache = make_scoped_cache('log-archives')
 
 
 def get_log_renderers():
@@ -186,3 +194,64 @@ def serialize_log_entry(entry, tzinfo):
             'avatarURL': entry.user.avatar_url if entry.user else None
         }
     }
+
+
+def _get_archived_entry_text(entry):
+    data = entry.data if isinstance(entry.data, dict) else {}
+    parts = [entry.module, entry.type, entry.summary, entry.user.full_name if entry.user else '']
+    parts += [str(data.get(key) or '') for key in ('subject', 'from', 'to', 'cc', 'body')]
+    return remove_accents(' '.join(parts)).lower()
+
+
+def filter_archived_log_entries(entries, *, realms=None, metadata_query=None, text=None):
+    """Filter log entries loaded from an archive.
+
+    This applies the same filters the logs API applies in the database,
+    but searching only checks whether each word is contained somewhere
+    in the entry instead of using a fulltext search.
+
+    :param entries: The log entries to filter
+    :param realms: A set of realms the entries must belong to
+    :param metadata_query: A dict the metadata of the entries must match
+    :param text: A search string
+    """
+    words = remove_accents(text).lower().split() if text else []
+
+    def _matches(entry):
+        if realms and entry.realm not in realms:
+            return False
+        if metadata_query and any(entry.meta.get(key) != value for key, value in metadata_query.items()):
+            return False
+        if words:
+            entry_text = _get_archived_entry_text(entry)
+            return all(word in entry_text for word in words)
+        return True
+
+    return [entry for entry in entries if _matches(entry)]
+
+
+def get_archived_log_records(archive, *, realms=None, metadata_query=None, text=None):
+    """Get the raw data of the matching entries of a log archive.
+
+    The filtered data is cached, so paginating through the results
+    does not need to load the whole archive file again.  Use
+    :meth:`LogArchive.build_entries` to create log entries from it.
+
+    :param archive: A :class:`LogArchive`
+    :param realms: A set of realms the entries must belong to
+    :param metadata_query: A dict the metadata of the entries must match
+    :param text: A search string
+    :return: A list of entry data, newest first
+    """
+    filters = [archive.id, archive.md5, sorted(realm.name for realm in realms or ()), metadata_query or {}, text or '']
+    key = hashlib.sha256(json.dumps(filters, sort_keys=True).encode()).hexdigest()
+    if (records := archive_cache.get(key)) is not None:
+        return records
+    records = archive.load_records()
+    entries = filter_archived_log_entries(archive.build_entries(records), realms=realms,
+                                          metadata_query=metadata_query, text=text)
+    entries.sort(key=attrgetter('logged_dt', 'id'), reverse=True)
+    records_by_id = {data['id']: data for data in records}
+    records = [records_by_id[entry.id] for entry in entries]
+    archive_cache.set(key, records, timedelta(hours=1))
+    return records
@@ -7,11 +7,14 @@
 
 import itertools
 
+from flask import has_request_context, request
 from sqlalchemy.orm import contains_eager, joinedload, load_only, raiseload, selectinload, subqueryload, undefer
 from werkzeug.exceptions import BadRequest
 
+from indico.core import signals
 from indico.core.db import db
 from indico.core.db.sqlalchemy.links import LinkType
+from indico.core.db.sqlalchemy.principals import PrincipalType
 from indico.core.db.sqlalchemy.protection import ProtectionMode
 from indico.core.db.sqlalchemy.util.queries import get_n_matching
 from indico.modules.attachments.models.attachments import Attachment
@@ -23,16 +26,20 @@ from indico.modules.events import Event
 from indico.modules.events.contributions.models.contributions import Contribution
 from indico.modules.events.contributions.models.principals import ContributionPrincipal
 from indico.modules.events.contributions.models.subcontributions import SubContribution
+from indico.modules.events.models.persons import EventPerson
 from indico.modules.events.models.principals import EventPrincipal
 from indico.modules.events.notes.models.notes import EventNote, EventNoteRevision
+from indico.modules.events.registration.models.registrations import Registration, RegistrationState
 from indico.modules.events.sessions.models.blocks import SessionBlock
 from indico.modules.events.sessions.models.principals import SessionPrincipal
 from indico.modules.events.sessions.models.sessions import Session
+from indico.modules.networks.models.networks import IPNetworkGroup
 from indico.modules.search.base import IndicoSearchProvider, SearchTarget
 from indico.modules.search.result_schemas import (AttachmentResultSchema, CategoryResultSchema,
                                                   ContributionResultSchema, EventNoteResultSchema, EventResultSchema)
 from indico.modules.search.schemas import (AttachmentSchema, DetailedCategorySchema, HTMLStrippingContributionSchema,
                                            HTMLStrippingEventNoteSchema, HTMLStrippingEventSchema)
+from indico.util.caching import memoize_request
 
 
 def _apply_acl_entry_strategy(rel, principal):
@@ -61,6 +68,149 @@ def _apply_contrib_access_strategy(rel):
     return rel
 
 
+@memoize_request
+def _get_matching_network_ids():
+    if not has_request_context() or not request.remote_addr:
+        return set()
+    ip = str(request.remote_addr)
+    return {net.id for net in IPNetworkGroup.query if net.contains_ip(ip)}
+
+
+def _has_attachment_access_override():
+    if not has_request_context() or not request.remote_addr:
+        return False
+    ip = str(request.remote_addr)
+    return any(net.contains_ip(ip) for net in IPNetworkGroup.query.filter_by(attachment_access_override=True))
+
+
+def _get_principal_criterion(principal_cls, user):
+    """Get a filter matching all ACL entries which may contain the user.
+
+    The criterion is allowed to match more entries than a real ACL check
+    would (e.g. multipass groups if we cannot get all the groups the user
+    is in), but it must never miss an entry granting access to the user.
+    """
+    criteria = []
+    if principal_cls.allow_networks and (network_ids := _get_matching_network_ids()):
+        criteria.append(db.and_(principal_cls.type == PrincipalType.network,
+                                principal_cls.ip_network_group_id.in_(network_ids)))
+    if user is None:
+        return db.or_(*criteria) if criteria else db.false()
+    criteria.append(db.and_(principal_cls.type == PrincipalType.user, principal_cls.user_id == user.id))
+    if local_group_ids := {g.id for g in user.local_groups}:
+        criteria.append(db.and_(principal_cls.type == PrincipalType.local_group,
+                                principal_cls.local_group_id.in_(local_group_ids)))
+    if user.can_get_all_multipass_groups:
+        criteria.extend(db.and_(principal_cls.type == PrincipalType.multipass_group,
+                                principal_cls.multipass_group_provider == group.provider.name,
+                                db.func.lower(principal_cls.multipass_group_name) == group.name.lower())
+                        for group in user.iter_all_multipass_groups())
+    else:
+        # checking group membership one by one is way too expensive, so
+        # we let the ACL check at the end deal with those entries
+        criteria.append(principal_cls.type == PrincipalType.multipass_group)
+    if principal_cls.allow_emails:
+        criteria.append(db.and_(principal_cls.type == PrincipalType.email,
+                                principal_cls.email.in_(user.all_emails)))
+    if principal_cls.allow_event_roles and (event_role_ids := {r.id for r in user.event_roles}):
+        criteria.append(db.and_(principal_cls.type == PrincipalType.event_role,
+                                principal_cls.event_role_id.in_(event_role_ids)))
+    if principal_cls.allow_category_roles and (category_role_ids := {r.id for r in user.category_roles}):
+        criteria.append(db.and_(principal_cls.type == PrincipalType.category_role,
+                                principal_cls.category_role_id.in_(category_role_ids)))
+    if principal_cls.allow_registration_forms:
+        regform_ids = (db.session.query(Registration.registration_form_id)
+                       .filter(Registration.user_id == user.id,
+                               Registration.state.in_([RegistrationState.unpaid, RegistrationState.complete]),
+                               ~Registration.is_deleted))
+        criteria.append(db.and_(principal_cls.type == PrincipalType.registration_form,
+                                principal_cls.registration_form_id.in_(regform_ids)))
+    return db.or_(*criteria)
+
+
+def _get_public_category_ids_query():
+    cte = Category.get_protection_cte()
+    return db.session.query(cte.c.id).filter(cte.c.protection_mode == ProtectionMode.public)
+
+
+def _get_granted_category_ids_query(user):
+    # ACL entries in a category may grant access to anything in its subtree
+    # (management access even to objects which are protected on their own)
+    granted_ids = (db.session.query(CategoryPrincipal.category_id)
+                   .filter(_get_principal_criterion(CategoryPrincipal, user)))
+    cte = Category.get_subtree_ids_cte(granted_ids)
+    return db.session.query(cte.c.id)
+
+
+def _get_category_visibility_filter(user):
+    """Get a filter for categories the user may be able to access.
+
+    Like all the visibility filters, this is a pre-filter which lets
+    the database discard the vast majority of inaccessible rows; the
+    results still need to go through the actual ACL check.
+    """
+    return db.or_(Category.id.in_(_get_public_category_ids_query()),
+                  Category.id.in_(_get_granted_category_ids_query(user)))
+
+
+def _get_event_visibility_filter(user, *, include_children=False):
+    """Get a filter for events the user may be able to access.
+
+    :param include_children: Whether to also consider access granted
+                             on objects inside the event (sessions,
+                             contributions and attachments) which may
+                             be accessible even if the event is not.
+    """
+    criteria = [
+        Event.is_public,
+        Event.is_inheriting & Event.category_id.in_(_get_public_category_ids_query()),
+        Event.category_id.in_(_get_granted_category_ids_query(user)),
+        Event.access_key != '',  # noqa: PLC1901
+        Event.id.in_(db.session.query(EventPrincipal.event_id)
+                     .filter(_get_principal_criterion(EventPrincipal, user))),
+    ]
+    if user is not None:
+        # speakers and other people linked to the event may have access
+        criteria.append(Event.id.in_(db.session.query(EventPerson.event_id)
+                                     .filter(EventPerson.user_id == user.id)))
+    if include_children:
+        # the search queries may already contain those tables, so we need to make
+        # sure the subqueries are not correlated with the outer query
+        criteria += [
+            Event.id.in_(db.session.query(Session.event_id)
+                         .filter(~Session.is_deleted,
+                                 Session.is_public | Session.acl_entries.any(
+                                     _get_principal_criterion(SessionPrincipal, user)))
+                         .correlate(None)),
+            Event.id.in_(db.session.query(Contribution.event_id)
+                         .filter(~Contribution.is_deleted,
+                                 Contribution.is_public | Contribution.acl_entries.any(
+                                     _get_principal_criterion(ContributionPrincipal, user)))
+                         .correlate(None)),
+            Event.id.in_(db.session.query(AttachmentFolder.event_id)
+                         .filter(AttachmentFolder.acl_entries.any(
+                             _get_principal_criterion(AttachmentFolderPrincipal, user)))
+                         .correlate(None)),
+            Event.id.in_(db.session.query(AttachmentFolder.event_id)
+                         .join(AttachmentFolder.attachments)
+                         .filter(Attachment.acl_entries.any(_get_principal_criterion(AttachmentPrincipal, user)))
+                         .correlate(None)),
+        ]
+    return db.or_(*criteria)
+
+
+def _can_use_visibility_filter(user, admin_override_enabled, obj_types):
+    if admin_override_enabled and user and user.is_admin:
+        return False
+    # access overrides from plugins cannot be expressed in SQL; the only
+    # ones in the core (IP-based attachment access) are handled by the
+    # callers
+    return not any(not getattr(receiver, '__module__', '').startswith('indico.')
+                   for obj_type in obj_types
+                   for receiver in itertools.chain(signals.acl.can_access.receivers_for(obj_type),
+                                                   signals.acl.can_manage.receivers_for(obj_type)))
+
+
 class InternalSearch(IndicoSearchProvider):
     def search(self, query, user=None, page=None, object_types=(), *, admin_override_enabled=False,
                **params):
@@ -150,7 +300,7 @@ class InternalSearch(IndicoSearchProvider):
         return (protection_mode == ProtectionMode.public or
                 obj.can_access(user, allow_admin=admin_override_enabled))
 
-    def _paginate(self, query, page, column, user, admin_override_enabled):
+    def _paginate(self, query, page, column, user, admin_override_enabled, visibility_filter=None):
         reverse = False
         pagenav = {'prev': None, 'next': None}
         if not page:
@@ -165,11 +315,16 @@ class InternalSearch(IndicoSearchProvider):
             pagenav['next'] = -(page - 1)
             reverse = True
 
+        if visibility_filter is not None:
+            # most rows the user cannot access are discarded by the database, so
+            # the ACL check below is just a safety net and rarely rejects anything
+            query = query.filter(visibility_filter)
+
         preloaded_categories = set()
         res = get_n_matching(
             query, self.RESULTS_PER_PAGE + 1,
             lambda obj: self._can_access(user, obj, admin_override_enabled=admin_override_enabled),
-            prefetch_factor=20,
+            prefetch_factor=(2 if visibility_filter is not None else 20),
             preload_bulk=lambda objs: self._preload_categories(objs, preloaded_categories)
         )
 
@@ -202,7 +357,10 @@ class InternalSearch(IndicoSearchProvider):
                           undefer(Category.effective_protection_mode),
                           subqueryload(Category.acl_entries)))
 
-        objs, pagenav = self._paginate(query, page, Category.id, user, admin_override_enabled)
+        visibility_filter = None
+        if _can_use_visibility_filter(user, admin_override_enabled, {Category}):
+            visibility_filter = _get_category_visibility_filter(user)
+        objs, pagenav = self._paginate(query, page, Category.id, user, admin_override_enabled, visibility_filter)
         res = DetailedCategorySchema(many=True).dump(objs)
         return pagenav, CategoryResultSchema(many=True).load(res)
 
@@ -225,7 +383,10 @@ class InternalSearch(IndicoSearchProvider):
                 _apply_acl_entry_strategy(selectinload(Event.acl_entries), EventPrincipal)
             )
         )
-        objs, pagenav = self._paginate(query, page, Event.id, user, admin_override_enabled)
+        visibility_filter = None
+        if _can_use_visibility_filter(user, admin_override_enabled, {Category, Event}):
+            visibility_filter = _get_event_visibility_filter(user)
+        objs, pagenav = self._paginate(query, page, Event.id, user, admin_override_enabled, visibility_filter)
 
         query = (
             Event.query
@@ -277,7 +438,11 @@ class InternalSearch(IndicoSearchProvider):
             )
         )
 
-        objs, pagenav = self._paginate(query, page, Contribution.id, user, admin_override_enabled)
+        visibility_filter = None
+        if _can_use_visibility_filter(user, admin_override_enabled, {Category, Event, Session, Contribution}):
+            visibility_filter = _get_event_visibility_filter(user, include_children=True)
+        objs, pagenav = self._paginate(query, page, Contribution.id, user, admin_override_enabled,
+                                       visibility_filter)
 
         event_strategy = joinedload(Contribution.event)
         event_strategy.joinedload(Event.own_venue)
@@ -420,7 +585,12 @@ class InternalSearch(IndicoSearchProvider):
             .outerjoin(Session.event.of_type(session_event))
         )
 
-        objs, pagenav = self._paginate(query, page, Attachment.id, user, admin_override_enabled)
+        visibility_filter = None
+        if (_can_use_visibility_filter(user, admin_override_enabled,
+                                       {Category, Event, Session, Contribution, AttachmentFolder, Attachment})
+                and not _has_attachment_access_override()):
+            visibility_filter = AttachmentFolder.event.has(_get_event_visibility_filter(user, include_children=True))
+        objs, pagenav = self._paginate(query, page, Attachment.id, user, admin_override_enabled, visibility_filter)
 
         query = (
             Attachment.query
@@ -539,7 +709,10 @@ class InternalSearch(IndicoSearchProvider):
             .outerjoin(Session.event.of_type(session_event))
         )
 
-        objs, pagenav = self._paginate(query, page, EventNote.id, user, admin_override_enabled)
+        visibility_filter = None
+        if _can_use_visibility_filter(user, admin_override_enabled, {Category, Event, Session, Contribution}):
+            visibility_filter = EventNote.event.has(_get_event_visibility_filter(user, include_children=True))
+        objs, pagenav = self._paginate(query, page, EventNote.id, user, admin_override_enabled, visibility_filter)
 
         query = (
             EventNote.query
@@ -0,0 +1,87 @@
+# This file is part of Indico.
+# Copyright (C) 2002 - 2025 CERN
+#
+# Indico is free software; you can redistribute it and/or
+# modify it under the terms of the MIT License; see the
+# LICENSE file for more details.
+
+import pytest
+
+from indico.core.db.sqlalchemy.protection import ProtectionMode
+from indico.modules.categories import Category
+from indico.modules.events import Event
+from indico.modules.search.internal import InternalSearch, _get_category_visibility_filter, _get_event_visibility_filter
+
+
+@pytest.fixture
+def protected_tree(create_category, create_event):
+    public_cat = create_category(1, title='public')
+    protected_cat = create_category(2, title='protected', protection_mode=ProtectionMode.protected)
+    child_cat = create_category(3, title='child', parent=protected_cat)
+    events = {
+        'public': create_event(1, category=public_cat),
+        'protected-in-public': create_event(2, category=public_cat, protection_mode=ProtectionMode.protected),
+        'inheriting-in-protected': create_event(3, category=child_cat),
+        'public-in-protected': create_event(4, category=child_cat, protection_mode=ProtectionMode.public),
+    }
+    return protected_cat, child_cat, events
+
+
+def _visible_event_ids(user, **kwargs):
+    return {e.id for e in Event.query.filter(_get_event_visibility_filter(user, **kwargs))}
+
+
+@pytest.mark.usefixtures('request_context')
+def test_event_visibility_filter_anonymous(protected_tree):
+    __, __, events = protected_tree
+    assert _visible_event_ids(None) == {events['public'].id, events['public-in-protected'].id}
+
+
+@pytest.mark.usefixtures('request_context')
+def test_event_visibility_filter_acl(protected_tree, dummy_user):
+    protected_cat, __, events = protected_tree
+    assert _visible_event_ids(dummy_user) == {events['public'].id, events['public-in-protected'].id}
+    events['protected-in-public'].update_principal(dummy_user, read_access=True)
+    assert _visible_event_ids(dummy_user) == {events['public'].id, events['public-in-protected'].id,
+                                              events['protected-in-public'].id}
+    protected_cat.update_principal(dummy_user, read_access=True)
+    assert _visible_event_ids(dummy_user) == {e.id for e in events.values()}
+
+
+@pytest.mark.usefixtures('request_context')
+def test_event_visibility_filter_children(protected_tree, dummy_user, create_contribution):
+    __, __, events = protected_tree
+    event = events['protected-in-public']
+    contrib = create_contribution(event, 'Dummy')
+    contrib.update_principal(dummy_user, read_access=True)
+    assert event.id not in _visible_event_ids(dummy_user)
+    assert event.id in _visible_event_ids(dummy_user, include_children=True)
+
+
+@pytest.mark.usefixtures('request_context')
+def test_category_visibility_filter(protected_tree, dummy_user):
+    protected_cat, child_cat, __ = protected_tree
+    visible = {c.id for c in Category.query.filter(_get_category_visibility_filter(dummy_user))}
+    assert protected_cat.id not in visible
+    assert child_cat.id not in visible
+    protected_cat.update_principal(dummy_user, read_access=True)
+    visible = {c.id for c in Category.query.filter(_get_category_visibility_filter(dummy_user))}
+    assert {protected_cat.id, child_cat.id} <= visible
+
+
+@pytest.mark.usefixtures('request_context')
+def test_search_events_matches_acl_check(protected_tree, dummy_user, mocker):
+    __, __, events = protected_tree
+    for event in events.values():
+        event.title = 'Visibility test'
+    events['protected-in-public'].update_principal(dummy_user, read_access=True)
+    mocker.patch.object(InternalSearch, 'RESULTS_PER_PAGE', 2)
+    search = InternalSearch()
+    found = set()
+    page = None
+    while True:
+        pagenav, results = search.search_events('Visibility', dummy_user, page, None, False)
+        found |= {r['event_id'] for r in results}
+        if not (page := pagenav['next']):
+            break
+    assert found == {e.id for e in events.values() if e.can_access(dummy_user)}
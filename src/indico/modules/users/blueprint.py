@@ -20,7 +20,8 @@ from indico.modules.users.controllers import (RHAcceptRegistrationRequest, RHAdm
                                               RHUserPreferencesMarkdownAPI, RHUserPreferencesMastodonServer,
                                               RHUsersAdmin, RHUsersAdminCreate, RHUsersAdminMerge,
                                               RHUsersAdminMergeCheck, RHUsersAdminSettings, RHUserSearch,
-                                              RHUserSearchInfo, RHUserSearchToken, RHUserSuggestionsRemove)
+                                              RHUserSearchInfo, RHUserSearchToken, RHUserSearchTypeahead,
+                                              RHUserSuggestionsRemove)
 from indico.web.flask.wrappers import IndicoBlueprint
 
 
@@ -89,6 +90,7 @@ _bp.add_url_rule('/<int:user_id>/picture-<slug>/<signature>', 'user_profile_pict
 # User search
 _bp.add_url_rule('/search/info', 'user_search_info', RHUserSearchInfo)
 _bp.add_url_rule('/search/', 'user_search', RHUserSearch)
+_bp.add_url_rule('/search/typeahead', 'user_search_typeahead', RHUserSearchTypeahead)
 _bp.add_url_rule('/search/token', 'user_search_token', RHUserSearchToken)
 
 # Users API
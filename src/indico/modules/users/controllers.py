@@ -56,8 +56,8 @@ from indico.modules.users.schemas import (AffiliationSchema, BasicCategorySchema
 from indico.modules.users.util import (get_avatar_url_from_name, get_gravatar_for_user, get_linked_events,
                                        get_mastodon_server_name, get_related_categories, get_suggested_categories,
                                        get_unlisted_events, get_user_by_email, get_user_titles, log_user_update,
-                                       merge_users, search_affiliations, search_users, send_avatar, serialize_user,
-                                       set_user_avatar)
+                                       merge_users, search_affiliations, search_users, search_users_typeahead,
+                                       send_avatar, serialize_user, set_user_avatar)
 from indico.modules.users.views import (WPUser, WPUserDashboard, WPUserDataExport, WPUserFavorites, WPUserPersonalData,
                                         WPUserProfilePic, WPUsersAdmin)
 from indico.util.date_time import now_utc
@@ -1057,6 +1057,21 @@ class RHUserSearch(RHProtected):
         return jsonify(users=results, total=total)
 
 
+class RHUserSearchTypeahead(RHUserSearch):
+    """Search for users while typing (in a single search field)."""
+
+    @use_kwargs({
+        'q': fields.Str(required=True, validate=validate.Length(min=1, max=100)),
+        'favorites_first': fields.Bool(load_default=False),
+    }, location='query')
+    def _process(self, q, favorites_first):
+        results = [search_result_schema.dump(user) for user in search_users_typeahead(q, include_pending=True)]
+        if favorites_first:
+            favorites = {u.id for u in session.user.favorite_users}
+            results.sort(key=lambda x: x['id'] not in favorites)
+        return jsonify(users=results)
+
+
 class RHUserSearchInfo(RHProtected):
     def _process(self):
         external_users_available = any(auth.supports_search for auth in multipass.identity_providers.values())
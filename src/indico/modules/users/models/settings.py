@@ -16,6 +16,9 @@ from indico.core.settings.util import get_all_settings, get_setting
 class UserSetting(JSONSettingsBase, db.Model):
     """User-specific settings."""
 
+    # the user may be specified either as an object or by its id
+    process_cached = False
+
     __table_args__ = (db.Index(None, 'user_id', 'module', 'name'),
                       db.Index(None, 'user_id', 'module'),
                       db.UniqueConstraint('user_id', 'module', 'name'),
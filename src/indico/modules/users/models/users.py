@@ -17,7 +17,7 @@ from sqlalchemy.dialects.postgresql import JSONB, UUID
 from sqlalchemy.event import listens_for
 from sqlalchemy.ext.associationproxy import association_proxy
 from sqlalchemy.ext.hybrid import hybrid_property
-from sqlalchemy.orm import object_session
+from sqlalchemy.orm import column_property, object_session
 from sqlalchemy.sql import select
 from werkzeug.utils import cached_property
 
@@ -431,6 +431,13 @@ class User(PersonMixin, db.Model):
         collection_class=set,
         backref=db.backref('user', lazy=False)
     )
+    #: An indexed string containing the name in both orders for effective searching
+    #: This string looks like ``first last|||last first`` so a ``*foo*bar*`` query
+    #: against it finds users regardless of the order in which the names were entered.
+    searchable_names = column_property(
+        first_name + ' ' + last_name + '|||' + last_name + ' ' + first_name,
+        deferred=True,
+    )
 
     # relationship backrefs:
     # - _all_settings (UserSetting.user)
@@ -885,3 +892,4 @@ define_unaccented_lowercase_index(User.last_name)
 define_unaccented_lowercase_index(User.affiliation)
 define_unaccented_lowercase_index(User.phone)
 define_unaccented_lowercase_index(User.address)
+define_unaccented_lowercase_index(User.searchable_names, User.__table__, 'ix_users_searchable_names_unaccent')
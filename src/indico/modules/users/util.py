@@ -7,8 +7,9 @@
 
 import hashlib
 import os
+import re
 from collections import defaultdict
-from datetime import datetime
+from datetime import datetime, timedelta
 from io import BytesIO
 from operator import attrgetter, itemgetter
 
@@ -21,6 +22,7 @@ from werkzeug.http import http_date, parse_date
 
 from indico.core import signals
 from indico.core.auth import multipass
+from indico.core.cache import make_scoped_cache
 from indico.core.db import db
 from indico.core.db.sqlalchemy.custom.unaccent import unaccent_match
 from indico.core.db.sqlalchemy.principals import PrincipalMixin, PrincipalPermissionsMixin, PrincipalType
@@ -49,6 +51,15 @@ from indico.web.flask.util import send_file, url_for
 from indico.web.util import strip_path_from_url
 
 
+#: The maximum number of users returned by the typeahead user search
+USER_TYPEAHEAD_LIMIT = 10
+#: The number of ranked user IDs cached for each typeahead search query
+USER_TYPEAHEAD_CACHE_SIZE = 200
+#: How long the results of a typeahead search query are cached
+USER_TYPEAHEAD_CACHE_TTL = timedelta(minutes=2)
+
+_typeahead_cache = make_scoped_cache('user-typeahead')
+
 # colors for user-specific avatar bubbles
 user_colors = ['#e06055', '#ff8a65', '#e91e63', '#f06292', '#673ab7', '#ba68c8', '#7986cb', '#3f51b5', '#5e97f6',
                '#00a4e4', '#4dd0e1', '#0097a7', '#d4e157', '#aed581', '#57bb8a', '#4db6ac', '#607d8b', '#795548',
@@ -211,16 +222,20 @@ def serialize_user(user):
     }
 
 
+def _searchable_names_like(pattern):
+    # this matches the expression of the trigram index on `searchable_names`
+    return db.func.indico.indico_unaccent(db.func.lower(User.searchable_names)).ilike(pattern)
+
+
 def _build_name_search(name_list):
     text = remove_accents('%{}%'.format('%'.join(escape_like(name) for name in name_list)))
-    return db.or_(db.func.indico.indico_unaccent(db.func.concat(User.first_name, ' ', User.last_name)).ilike(text),
-                  db.func.indico.indico_unaccent(db.func.concat(User.last_name, ' ', User.first_name)).ilike(text))
+    return _searchable_names_like(text)
 
 
 def build_user_search_query(criteria, exact=False, include_deleted=False, include_pending=False,
                             include_blocked=False, favorites_first=False):
     unspecified = object()
-    query = User.query.distinct(User.id).options(db.joinedload(User._all_emails))
+    query = User.query.options(db.joinedload(User._all_emails))
 
     if not include_pending:
         query = query.filter(~User.is_pending)
@@ -231,7 +246,7 @@ def build_user_search_query(criteria, exact=False, include_deleted=False, includ
 
     email = criteria.pop('email', unspecified)
     if email is not unspecified:
-        query = query.join(UserEmail).filter(unaccent_match(UserEmail.email, email, exact))
+        query = query.filter(User._all_emails.any(unaccent_match(UserEmail.email, email, exact)))
 
     # search on any of the name fields (first_name OR last_name)
     name = criteria.pop('name', unspecified)
@@ -245,9 +260,6 @@ def build_user_search_query(criteria, exact=False, include_deleted=False, includ
     for k, v in criteria.items():
         query = query.filter(unaccent_match(getattr(User, k), v, exact))
 
-    # wrap as subquery so we can apply order regardless of distinct-by-id
-    query = query.from_self()
-
     if favorites_first:
         query = (query.outerjoin(favorite_user_table, db.and_(favorite_user_table.c.user_id == session.user.id,
                                                               favorite_user_table.c.target_id == User.id))
@@ -257,6 +269,102 @@ def build_user_search_query(criteria, exact=False, include_deleted=False, includ
                           User.id)
 
 
+def _normalize_typeahead_query(q):
+    return ' '.join(remove_accents(q.replace(',', ' ')).lower().split())
+
+
+def _get_typeahead_rank(user, terms):
+    """Get the rank of a user in the typeahead search results.
+
+    This is the same as the ranking done in the database by
+    :func:`_query_typeahead_users` and returns ``None`` if the user
+    does not match the search terms at all.
+    """
+    names = remove_accents(f'{user.first_name} {user.last_name}|||{user.last_name} {user.first_name}'.lower())
+    pattern = '.*'.join(re.escape(term) for term in terms)
+    if re.match(pattern, names) or re.search(rf'\|\|\|{pattern}', names):
+        return 0
+    if len(terms) == 1 and any(email.startswith(terms[0]) for email in user.all_emails):
+        return 1
+    if re.search(pattern, names) or (len(terms) == 1 and any(terms[0] in email for email in user.all_emails)):
+        return 2
+    return None
+
+
+def _query_typeahead_users(terms, include_pending, limit):
+    pattern = '%'.join(escape_like(term) for term in terms)
+    name_prefix = db.or_(_searchable_names_like(f'{pattern}%'), _searchable_names_like(f'%|||{pattern}%'))
+    criteria = [_searchable_names_like(f'%{pattern}%')]
+    rank = db.case((name_prefix, 0), else_=2)
+    if len(terms) == 1:
+        # same expression as the trigram index on the email column
+        email_expr = db.func.indico.indico_unaccent(db.func.lower(UserEmail.email))
+        criteria.append(User._all_emails.any(email_expr.ilike(f'%{pattern}%')))
+        rank = db.case((name_prefix, 0), (User._all_emails.any(email_expr.ilike(f'{pattern}%')), 1), else_=2)
+    query = (User.query
+             .filter(~User.is_deleted, ~User.is_blocked, db.or_(*criteria))
+             .order_by(rank,
+                       db.func.lower(db.func.indico.indico_unaccent(User.first_name)),
+                       db.func.lower(db.func.indico.indico_unaccent(User.last_name)),
+                       User.id)
+             .limit(limit))
+    if not include_pending:
+        query = query.filter(~User.is_pending)
+    return [user_id for user_id, in query.with_entities(User.id)]
+
+
+def search_users_typeahead(q, *, include_pending=False, limit=USER_TYPEAHEAD_LIMIT):
+    """Search users by name or email while the query is being typed.
+
+    The results are ranked: users whose name (in any order) starts with
+    the query come first, followed by users whose email starts with it
+    and finally users whose name or email contains it anywhere.
+
+    To avoid querying the database for each keystroke, the ranked IDs of
+    all matches are cached for a short time if there are not too many of
+    them, and the results for a longer query are then filtered from the
+    cached results of its prefix.
+
+    :param q: The search string containing (parts of) names or an email.
+    :param include_pending: Whether pending users should be included.
+    :param limit: The maximum number of users to return.
+    :return: A list of :class:`.User` objects.
+    """
+    q = _normalize_typeahead_query(q)
+    if not q:
+        return []
+    terms = q.split()
+    prefixes = [q[:n].strip() for n in range(len(q), 0, -1)]
+    cached = _typeahead_cache.get_many(*(f'{int(include_pending)}:{prefix}' for prefix in prefixes))
+    for prefix, data in zip(prefixes, cached, strict=True):
+        if data is not None and (prefix == q or data['complete']):
+            break
+    else:
+        prefix, data = q, None
+
+    users = {}
+    if data is None:
+        user_ids = _query_typeahead_users(terms, include_pending, USER_TYPEAHEAD_CACHE_SIZE + 1)
+        data = {'ids': user_ids[:USER_TYPEAHEAD_CACHE_SIZE], 'complete': len(user_ids) <= USER_TYPEAHEAD_CACHE_SIZE}
+        _typeahead_cache.set(f'{int(include_pending)}:{q}', data, USER_TYPEAHEAD_CACHE_TTL)
+    elif prefix != q:
+        # the cached results of a shorter query contain all matches of the current one
+        users = {user.id: user
+                 for user in (User.query
+                              .filter(User.id.in_(data['ids']), ~User.is_deleted)
+                              .options(db.selectinload(User._all_emails)))}
+        ranks = {user.id: rank for user in users.values() if (rank := _get_typeahead_rank(user, terms)) is not None}
+        # keep the order of the cached results within each rank
+        user_ids = sorted((user_id for user_id in data['ids'] if user_id in ranks), key=ranks.get)
+        data = {'ids': user_ids, 'complete': True}
+        _typeahead_cache.set(f'{int(include_pending)}:{q}', data, USER_TYPEAHEAD_CACHE_TTL)
+
+    user_ids = data['ids'][:limit]
+    if missing := set(user_ids) - users.keys():
+        users.update((user.id, user) for user in User.query.filter(User.id.in_(missing), ~User.is_deleted))
+    return [users[user_id] for user_id in user_ids if user_id in users]
+
+
 def _deduplicate_identities(identities):
     by_email = defaultdict(list)
     for ident in identities:
@@ -367,6 +475,29 @@ def get_user_by_email(email, create_pending=False):
     return user
 
 
+def get_users_by_emails(emails):
+    """Find the users for many email addresses at once.
+
+    This is the same as calling :func:`get_user_by_email` for each
+    email address, but uses a single query.
+
+    :param emails: An iterable of email addresses.
+    :return: A dict mapping the (normalized) email addresses to
+             :class:`.User` instances; emails which do not belong
+             to exactly one user are not included.
+    """
+    emails = {email.lower().strip() for email in emails} - {''}
+    if not emails:
+        return {}
+    query = (db.session.query(UserEmail.email, User)
+             .join(User, User.id == UserEmail.user_id)
+             .filter(~User.is_deleted, UserEmail.email.in_(emails)))
+    users_by_email = {}
+    for email, user in query:
+        users_by_email.setdefault(email, set()).add(user)
+    return {email: next(iter(users)) for email, users in users_by_email.items() if len(users) == 1}
+
+
 def merge_users(source, target, force=False):
     """Merge two users together, unifying all related data.
 
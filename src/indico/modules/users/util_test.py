@@ -0,0 +1,54 @@
+# This file is part of Indico.
+# Copyright (C) 2002 - 2025 CERN
+#
+# Indico is free software; you can redistribute it and/or
+# modify it under the terms of the MIT License; see the
+# LICENSE file for more details.
+
+import pytest
+
+from indico.modules.users.util import _get_typeahead_rank, get_users_by_emails, search_users, search_users_typeahead
+
+
+@pytest.fixture
+def search_users_data(create_user):
+    return [create_user(101, 'John', 'Doe', email='jdoe@example.test'),
+            create_user(102, 'Jane', 'Johnson', email='jane@example.test'),
+            create_user(103, 'Émile', 'Zola', email='ezola@example.test'),
+            create_user(104, 'Alice', 'Smith', email='johnny@example.test')]
+
+
+@pytest.mark.parametrize(('q', 'expected'), (
+    ('joh', [102, 101, 104]),
+    ('JOHN', [102, 101, 104]),
+    ('doe john', [101]),
+    ('john, doe', [101]),
+    ('emile', [103]),
+    ('zola emi', [103]),
+    ('mile', [103]),
+    ('example', [104, 103, 102, 101]),
+    ('nobody', []),
+))
+def test_search_users_typeahead(search_users_data, q, expected):
+    users = {user.id: user for user in search_users_data}
+    assert [user.id for user in search_users_typeahead(q)] == expected
+    # the ranks used to filter cached results must match those from the database
+    terms = q.replace(',', '').lower().split()
+    ranks = [_get_typeahead_rank(users[user_id], terms) for user_id in expected]
+    assert ranks == sorted(ranks)
+    assert None not in ranks
+
+
+def test_search_users_typeahead_limit(search_users_data):
+    assert [user.id for user in search_users_typeahead('example', limit=2)] == [104, 103]
+
+
+def test_search_users_by_name(search_users_data):
+    assert {user.id for user in search_users(name='doe john')} == {101}
+    assert {user.id for user in search_users(name='emile')} == {103}
+    assert {user.id for user in search_users(email='johnny')} == {104}
+
+
+def test_get_users_by_emails(search_users_data):
+    users = get_users_by_emails(['JDOE@example.test', 'ezola@example.test', 'unknown@example.test', ''])
+    assert {email: user.id for email, user in users.items()} == {'jdoe@example.test': 101, 'ezola@example.test': 103}
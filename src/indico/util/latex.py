@@ -0,0 +1,97 @@
+# This file is part of Indico.
+# Copyright (C) 2002 - 2025 CERN
+#
+# Indico is free software; you can redistribute it and/or
+# modify it under the terms of the MIT License; see the
+# LICENSE file for more details.
+
+import hashlib
+import os
+import time
+from contextlib import contextmanager
+from datetime import timedelta
+from pathlib import Path
+
+from flask import has_request_context
+from werkzeug.exceptions import ServiceUnavailable
+
+import indico
+from indico.core.cache import make_scoped_cache
+from indico.core.config import config
+from indico.util.i18n import _
+
+
+fragment_cache = make_scoped_cache('latex-fragments')
+slot_cache = make_scoped_cache('latex-slots')
+
+#: The maximum total size of files (e.g. images) cached along with a LaTeX fragment
+MAX_FRAGMENT_FILES_SIZE = 2 * 1024 * 1024
+#: The time (in seconds) a request waits for LaTeX to become available
+#: when :data:`LATEX_MAX_CONCURRENCY` processes are already running
+MAX_SLOT_WAIT = 10
+#: The interval (in seconds) between two checks for the result of a
+#: PDF generation running in a different process, or a free LaTeX slot
+POLL_INTERVAL = 0.25
+
+
+class RawLatex(str):
+    pass
+
+
+def render_cached_fragment(text, source_dir, render):
+    """Render a LaTeX fragment, reusing the result of previous builds.
+
+    Fragments are cached by the hash of their source.  Any files created
+    in `source_dir` while rendering (e.g. images downloaded from the web)
+    are cached as well and restored when the cached fragment is used.
+
+    :param text: The source of the fragment
+    :param source_dir: The directory containing the LaTeX sources
+    :param render: A callable rendering the fragment
+    """
+    key = hashlib.sha256(f'{indico.__version__}\n{text}'.encode()).hexdigest()
+    if (cached := fragment_cache.get(key)) is not None:
+        latex, files = cached
+        for name, data in files.items():
+            Path(source_dir, name).write_bytes(data)
+        return RawLatex(latex)
+    existing = set(os.listdir(source_dir))
+    latex = render()
+    files = {name: Path(source_dir, name).read_bytes() for name in os.listdir(source_dir) if name not in existing}
+    # do not keep transient errors such as an image that could not be downloaded
+    if 'Indico rendering error' not in latex and sum(map(len, files.values())) <= MAX_FRAGMENT_FILES_SIZE:
+        fragment_cache.set(key, (str(latex), files), timedelta(days=7))
+    return latex
+
+
+def get_max_latex_duration():
+    # documents with a table of contents need two LaTeX runs
+    return config.LATEX_TIMEOUT * 2
+
+
+@contextmanager
+def latex_slot():
+    """Wait until LaTeX may be run.
+
+    This limits the number of LaTeX processes running at the same time
+    across all Indico processes to :data:`LATEX_MAX_CONCURRENCY`.  In a
+    request we only wait for a short time and then fail, in order to not
+    block web workers during a burst of PDF requests.
+    """
+    if not config.LATEX_MAX_CONCURRENCY:
+        yield
+        return
+    deadline = (time.monotonic() + MAX_SLOT_WAIT) if has_request_context() else None
+    while True:
+        # slots expire in case a process dies without releasing its slot
+        slot = next((n for n in range(config.LATEX_MAX_CONCURRENCY)
+                     if slot_cache.add(n, True, get_max_latex_duration())), None)
+        if slot is not None:
+            break
+        elif deadline is not None and time.monotonic() > deadline:
+            raise ServiceUnavailable(_('Too many PDF files are being generated right now. Please try again later.'))
+        time.sleep(POLL_INTERVAL)
+    try:
+        yield
+    finally:
+        slot_cache.delete(slot)
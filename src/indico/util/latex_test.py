@@ -0,0 +1,43 @@
+# This file is part of Indico.
+# Copyright (C) 2002 - 2025 CERN
+#
+# Indico is free software; you can redistribute it and/or
+# modify it under the terms of the MIT License; see the
+# LICENSE file for more details.
+
+import pytest
+from werkzeug.exceptions import ServiceUnavailable
+
+from indico.util.latex import latex_slot, render_cached_fragment
+
+
+def test_render_cached_fragment(tmp_path, mocker):
+    def _render():
+        (tmp_path / 'first' / 'image.png').write_bytes(b'image')
+        return r'\includegraphics{image.png}'
+
+    render = mocker.Mock(side_effect=_render)
+    (tmp_path / 'first').mkdir()
+    (tmp_path / 'second').mkdir()
+    assert render_cached_fragment('![](image)', tmp_path / 'first', render) == r'\includegraphics{image.png}'
+    assert render_cached_fragment('![](image)', tmp_path / 'second', render) == r'\includegraphics{image.png}'
+    assert render.call_count == 1
+    assert (tmp_path / 'second' / 'image.png').read_bytes() == b'image'
+
+
+def test_render_cached_fragment_error(tmp_path, mocker):
+    render = mocker.Mock(return_value='Indico rendering error')
+    render_cached_fragment('![](image)', tmp_path, render)
+    render_cached_fragment('![](image)', tmp_path, render)
+    assert render.call_count == 2
+
+
+@pytest.mark.usefixtures('request_context')
+def test_latex_slot(mocker, patch_indico_config):
+    mocker.patch('indico.util.latex.MAX_SLOT_WAIT', 0)
+    patch_indico_config('LATEX_MAX_CONCURRENCY', 1)
+    with latex_slot():
+        with pytest.raises(ServiceUnavailable), latex_slot():
+            pass
+    with latex_slot():
+        pass
@@ -0,0 +1,71 @@
+# This file is part of Indico.
+# Copyright (C) 2002 - 2025 CERN
+#
+# Indico is free software; you can redistribute it and/or
+# modify it under the terms of the MIT License; see the
+# LICENSE file for more details.
+
+import time
+from io import RawIOBase
+from zipfile import ZIP_STORED, ZipFile, ZipInfo
+
+
+class _ZipStreamBuffer(RawIOBase):
+    """A write-only, unseekable buffer for a streamed ZIP file.
+
+    Since it cannot seek, `ZipFile` writes data descriptors after each
+    member instead of going back to update the local headers, so the
+    archive can be sent to the client while it is being generated.
+    """
+
+    def __init__(self):
+        self._chunks = []
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def drain(self):
+        data = b''.join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def iter_zip_stream(entries, *, compression=ZIP_STORED, chunk_size=1024*1024):
+    """Generate a ZIP archive on the fly.
+
+    The contents of each member are read in chunks and the CRC is
+    computed while writing them, so neither the archive nor any of
+    its members ever need to be stored on disk or kept in memory.
+    ZIP64 extensions are used whenever needed.
+
+    :param entries: An iterable of ``(name, fileobj, size)`` tuples.
+                    ``fileobj`` is a context manager returning a
+                    file-like object; it is only entered once the
+                    member is written.  ``size`` is the size of the
+                    member or ``None`` if it is unknown, in which
+                    case ZIP64 is always used for it.
+    :param compression: `ZIP_STORED` or `ZIP_DEFLATED`
+    :param chunk_size: The number of bytes to read at once
+    :return: An iterator yielding the archive as bytes
+    """
+    buf = _ZipStreamBuffer()
+    with ZipFile(buf, 'w', compression=compression, allowZip64=True) as zip_file:
+        for name, fileobj, size in entries:
+            info = ZipInfo(name, date_time=time.localtime(time.time())[:6])
+            info.compress_type = compression
+            info.external_attr = 0o600 << 16
+            if size is not None:
+                info.file_size = size
+            with fileobj as source, zip_file.open(info, 'w', force_zip64=(size is None)) as target:
+                while chunk := source.read(chunk_size):
+                    target.write(chunk)
+                    if data := buf.drain():
+                        yield data
+            if data := buf.drain():
+                yield data
+    # closing the zip file writes the central directory
+    yield buf.drain()
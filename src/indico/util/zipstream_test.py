@@ -0,0 +1,54 @@
+# This file is part of Indico.
+# Copyright (C) 2002 - 2025 CERN
+#
+# Indico is free software; you can redistribute it and/or
+# modify it under the terms of the MIT License; see the
+# LICENSE file for more details.
+
+from io import BytesIO
+from zipfile import ZIP_DEFLATED, ZIP_STORED, ZipFile
+
+import pytest
+
+from indico.util.zipstream import iter_zip_stream
+
+
+@pytest.mark.parametrize('compression', (ZIP_STORED, ZIP_DEFLATED))
+@pytest.mark.parametrize('known_size', (True, False))
+def test_iter_zip_stream(compression, known_size):
+    files = {
+        'foo.txt': b'hello world',
+        'dir/bar.bin': bytes(range(256)) * 1000,
+        'empty.txt': b'',
+    }
+    entries = ((name, BytesIO(data), len(data) if known_size else None) for name, data in files.items())
+    chunks = list(iter_zip_stream(entries, compression=compression, chunk_size=1000))
+    assert len(chunks) > len(files)
+    with ZipFile(BytesIO(b''.join(chunks))) as zip_file:
+        assert zip_file.testzip() is None
+        assert zip_file.namelist() == list(files)
+        for name, data in files.items():
+            info = zip_file.getinfo(name)
+            assert info.compress_type == compression
+            assert zip_file.read(name) == data
+
+
+def test_iter_zip_stream_lazy():
+    opened = []
+
+    def _iter_entries():
+        for name in ('a', 'b'):
+            opened.append(name)
+            yield name, BytesIO(name.encode()), 1
+
+    chunks = iter_zip_stream(_iter_entries())
+    next(chunks)
+    assert opened == ['a']
+    rest = list(chunks)
+    assert opened == ['a', 'b']
+    assert rest
+
+
+def test_iter_zip_stream_empty():
+    with ZipFile(BytesIO(b''.join(iter_zip_stream([])))) as zip_file:
+        assert zip_file.namelist() == []
@@ -7,10 +7,27 @@
 
 import time
 
-from flask import g, request_started
+from flask import g, request, request_started
 from sqlalchemy.engine import Engine
 from sqlalchemy.event import listens_for
 
+from indico.core.config import config
+from indico.core.logger import Logger
+
+
+logger = Logger.get('db.stats')
+
+
+class QueryStats:
+    """Statistics about the executions of a single SQL statement."""
+
+    __slots__ = ('count', 'duration', 'source')
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0
+        self.source = None
+
 
 def request_stats_request_started():
     if g.get('request_stats_initialized'):
@@ -18,9 +35,71 @@ def request_stats_request_started():
     g.request_stats_initialized = True
     g.query_count = 0
     g.query_duration = 0
+    g.query_statements = {} if config.DB_QUERY_REPEAT_THRESHOLD else None
     g.req_start_ts = time.time()
 
 
+def _track_statement(statement, duration):
+    from indico.core.db.sqlalchemy.logging import _get_sql_line
+
+    try:
+        stats = g.query_statements[statement]
+    except KeyError:
+        g.query_statements[statement] = stats = QueryStats()
+    stats.count += 1
+    stats.duration += duration
+    if stats.count == config.DB_QUERY_REPEAT_THRESHOLD:
+        # only look up the source once we know we are going to report it, since
+        # getting the stack is way more expensive than counting the queries
+        stats.source = _get_sql_line()
+
+
+def get_repeated_queries():
+    """Get the SELECT statements which have been executed repeatedly.
+
+    Many executions of the same statement (with different parameters)
+    are usually caused by lazy-loading a relationship while iterating
+    over a list of objects (the "N+1 queries" problem).
+
+    :return: A list of ``(statement, stats)`` tuples, sorted by the
+             number of executions.
+    """
+    statements = g.get('query_statements')
+    if not statements:
+        return []
+    return sorted(((statement, stats) for statement, stats in statements.items()
+                   if stats.count >= config.DB_QUERY_REPEAT_THRESHOLD and statement.lstrip().startswith('SELECT')),
+                  key=lambda x: x[1].count, reverse=True)
+
+
+def _format_repeated_query(statement, stats):
+    source = f'{stats.source["file"]}:{stats.source["line"]} ({stats.source["function"]})' if stats.source else '?'
+    statement = ' '.join(statement.split())
+    if len(statement) > 250:
+        statement = statement[:250] + '...'
+    return f'{stats.count} times ({stats.duration:.3f}s) from {source}: {statement}'
+
+
+def _check_query_stats(response):
+    if not g.get('request_stats_initialized'):
+        return response
+    stats = get_request_stats()
+    if config.DB_QUERY_STATS_HEADER:
+        response.headers.add('Server-Timing',
+                             f'db;dur={stats["query_duration"] * 1000:.1f};desc="{stats["query_count"]} queries"')
+    budget = config.DB_QUERY_BUDGET
+    over_budget = budget is not None and stats['query_count'] > budget
+    repeated = get_repeated_queries()
+    if over_budget or repeated:
+        lines = [(f'{request.method} {request.relative_url} ran {stats["query_count"]} queries '
+                  f'({stats["query_duration"]:.3f}s of {stats["req_duration"]:.3f}s)')]
+        if over_budget:
+            lines[0] += f', exceeding the budget of {budget} queries'
+        lines += [f'  repeated {_format_repeated_query(statement, s)}' for statement, s in repeated]
+        logger.warning('\n'.join(lines))
+    return response
+
+
 def setup_request_stats(app):
     @request_started.connect_via(app)
     def _request_started(sender, **kwargs):
@@ -33,12 +112,16 @@ def setup_request_stats(app):
         context._query_start_time = time.time()
 
     @listens_for(Engine, 'after_cursor_execute', named=True)
-    def after_cursor_execute(context, **unused):
+    def after_cursor_execute(context, statement, **unused):
         if not g.get('request_stats_initialized'):
             return
         total = time.time() - context._query_start_time
         g.query_count += 1
         g.query_duration += total
+        if g.query_statements is not None:
+            _track_statement(statement, total)
+
+    app.after_request(_check_query_stats)
 
 
 def get_request_stats():
@@ -0,0 +1,64 @@
+# This file is part of Indico.
+# Copyright (C) 2002 - 2025 CERN
+#
+# Indico is free software; you can redistribute it and/or
+# modify it under the terms of the MIT License; see the
+# LICENSE file for more details.
+
+import pytest
+from flask import g
+from werkzeug.wrappers import Response
+
+from indico.web.flask.stats import (_check_query_stats, _track_statement, get_repeated_queries,
+                                    request_stats_request_started)
+
+
+@pytest.fixture
+def query_stats(patch_indico_config, mocker):
+    patch_indico_config('DB_QUERY_REPEAT_THRESHOLD', 3)
+    mocker.patch('indico.core.db.sqlalchemy.logging._get_sql_line',
+                 return_value={'file': 'foo.py', 'line': 123, 'function': 'bar'})
+    request_stats_request_started()
+
+    def _execute(statement, count):
+        for __ in range(count):
+            g.query_count += 1
+            g.query_duration += 0.1
+            _track_statement(statement, 0.1)
+
+    return _execute
+
+
+@pytest.mark.usefixtures('request_context')
+def test_repeated_queries(query_stats):
+    query_stats('SELECT 1', 2)
+    query_stats('SELECT 2', 3)
+    query_stats('SELECT 3', 5)
+    query_stats('UPDATE foo SET bar = 1', 5)
+    repeated = get_repeated_queries()
+    assert [(statement, stats.count) for statement, stats in repeated] == [('SELECT 3', 5), ('SELECT 2', 3)]
+    assert repeated[0][1].source['file'] == 'foo.py'
+    assert repeated[0][1].duration == pytest.approx(0.5)
+
+
+@pytest.mark.usefixtures('request_context')
+@pytest.mark.parametrize(('budget', 'repeat', 'warning'), (
+    (None, 2, False),
+    (10, 2, False),
+    (10, 3, True),
+    (2, 2, True),
+))
+def test_check_query_stats(query_stats, patch_indico_config, caplog, budget, repeat, warning):
+    patch_indico_config('DB_QUERY_BUDGET', budget)
+    patch_indico_config('DB_QUERY_STATS_HEADER', True)
+    query_stats('SELECT 1', repeat)
+    query_stats('SELECT 2', 1)
+    caplog.set_level('WARNING', 'indico.db.stats')
+    response = _check_query_stats(Response())
+    assert response.headers['Server-Timing'].endswith(f'desc="{repeat + 1} queries"')
+    if warning:
+        assert ('repeated 3 times' in caplog.text) == (repeat == 3)
+        assert ('foo.py:123 (bar): SELECT 1' in caplog.text) == (repeat == 3)
+        assert ('exceeding the budget of 2 queries' in caplog.text) == (budget == 2)
+    else:
+        assert not caplog.records
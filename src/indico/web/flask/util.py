@@ -9,10 +9,11 @@ import inspect
 import os
 import re
 from importlib import import_module
-from urllib.parse import urlsplit
+from urllib.parse import quote, urlsplit
 
 from flask import Blueprint, current_app, g, redirect, request
 from flask import send_file as _send_file
+from flask import stream_with_context
 from flask import url_for as _url_for
 from flask.helpers import get_root_path
 from flask_cors import cross_origin
@@ -22,6 +23,7 @@ from werkzeug.routing import BaseConverter, BuildError, RequestRedirect, Unicode
 from indico.core.config import config
 from indico.util.caching import memoize
 from indico.util.locators import get_locator
+from indico.util.string import str_to_ascii
 from indico.web.util import jsonify_data
 
 
@@ -239,6 +241,30 @@ def _is_office_mimetype(mimetype):
     return False
 
 
+def _is_inline(mimetype, inline, safe):
+    if inline is None:
+        inline = mimetype not in ('text/csv', 'text/xml', 'application/xml')
+    if request.user_agent.platform == 'Android':
+        # Android is just full of fail when it comes to inline content-disposition...
+        inline = False
+    if _is_office_mimetype(mimetype):
+        inline = False
+    if safe and mimetype in ('text/html', 'image/svg+xml'):
+        inline = False
+    return inline
+
+
+def _add_file_headers(rv, *, safe, no_cache):
+    if safe:
+        rv.headers.add('Content-Security-Policy', "script-src 'self'; object-src 'self'")
+    if no_cache:
+        del rv.expires
+        del rv.cache_control.max_age
+        rv.cache_control.public = False
+        rv.cache_control.private = True
+        rv.cache_control.no_cache = True
+
+
 def send_file(name, path_or_fd, mimetype, *, last_modified=None, no_cache=True, inline=None,
               max_age=86400, conditional=False, safe=True, **kwargs):
     """Send a file to the user.
@@ -260,15 +286,7 @@ def send_file(name, path_or_fd, mimetype, *, last_modified=None, no_cache=True,
     """
     name = re.sub(r'\s+', ' ', name).strip()  # get rid of crap like linebreaks
     assert '/' in mimetype
-    if inline is None:
-        inline = mimetype not in ('text/csv', 'text/xml', 'application/xml')
-    if request.user_agent.platform == 'Android':
-        # Android is just full of fail when it comes to inline content-disposition...
-        inline = False
-    if _is_office_mimetype(mimetype):
-        inline = False
-    if safe and mimetype in ('text/html', 'image/svg+xml'):
-        inline = False
+    inline = _is_inline(mimetype, inline, safe)
     if not no_cache:
         kwargs['max_age'] = max_age
     try:
@@ -278,14 +296,34 @@ def send_file(name, path_or_fd, mimetype, *, last_modified=None, no_cache=True,
         if not current_app.debug:
             raise
         raise NotFound(f'File not found: {path_or_fd}')
-    if safe:
-        rv.headers.add('Content-Security-Policy', "script-src 'self'; object-src 'self'")
-    if not conditional and no_cache:
-        del rv.expires
-        del rv.cache_control.max_age
-        rv.cache_control.public = False
-        rv.cache_control.private = True
-        rv.cache_control.no_cache = True
+    _add_file_headers(rv, safe=safe, no_cache=(not conditional and no_cache))
+    return rv
+
+
+def send_stream(name, chunks, mimetype, *, inline=False, safe=True):
+    """Send data to the user while it is being generated.
+
+    `name` is the filename visible to the user.
+    `chunks` is an iterable yielding the data as bytes. It is consumed
+    within the request context, so it may still access the database.
+    `mimetype` is the MIME type of the data.
+    `inline` is whether the browser should display the data instead of
+    downloading it; like in :func:`send_file` it is ignored for some
+    clients and file types.
+    `safe` adds the same security features as in :func:`send_file`.
+    """
+    name = re.sub(r'\s+', ' ', name).strip()
+    assert '/' in mimetype
+    inline = _is_inline(mimetype, inline, safe)
+    rv = current_app.response_class(stream_with_context(chunks), mimetype=mimetype, direct_passthrough=True)
+    try:
+        name.encode('ascii')
+    except UnicodeEncodeError:
+        names = {'filename': str_to_ascii(name), 'filename*': "UTF-8''{}".format(quote(name, safe='!#$&+-.^_`|~'))}
+    else:
+        names = {'filename': name}
+    rv.headers.set('Content-Disposition', 'inline' if inline else 'attachment', **names)
+    _add_file_headers(rv, safe=safe, no_cache=True)
     return rv
 
 
@@ -7,7 +7,7 @@
 
 import pytest
 
-from indico.web.flask.util import endpoint_for_url
+from indico.web.flask.util import endpoint_for_url, send_stream
 
 
 @pytest.mark.parametrize(('base_url', 'url', 'endpoint'), (
@@ -25,3 +25,16 @@ def test_endpoint_for_url(base_url, url, endpoint):
     else:
         assert data is not None
         assert data[0] == endpoint
+
+
+@pytest.mark.parametrize(('mimetype', 'user_agent', 'disposition'), (
+    ('text/calendar', 'Mozilla/5.0 (X11; Linux x86_64)', 'inline'),
+    ('text/calendar', 'Mozilla/5.0 (Linux; Android 14)', 'attachment'),
+    ('text/html', 'Mozilla/5.0 (X11; Linux x86_64)', 'attachment'),
+))
+def test_send_stream_headers(app, mimetype, user_agent, disposition):
+    with app.test_request_context(headers={'User-Agent': user_agent}):
+        rv = send_stream('test.ics', iter([b'data']), mimetype, inline=True)
+        assert rv.headers['Content-Disposition'] == f'{disposition}; filename=test.ics'
+        assert rv.headers['Content-Security-Policy'] == "script-src 'self'; object-src 'self'"
+        assert rv.cache_control.no_cache
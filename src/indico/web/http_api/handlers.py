@@ -17,7 +17,7 @@ from uuid import UUID
 
 import sentry_sdk
 from authlib.oauth2 import OAuth2Error
-from flask import current_app, g, request, session
+from flask import current_app, g, request, session, stream_with_context
 from werkzeug.exceptions import BadRequest, NotFound
 
 from indico.core.cache import make_scoped_cache
@@ -29,7 +29,7 @@ from indico.modules.api.models.keys import APIKey
 from indico.util.signals import make_interceptable
 from indico.web.http_api import HTTPAPIHook
 from indico.web.http_api.metadata.serializer import Serializer
-from indico.web.http_api.responses import HTTPAPIError, HTTPAPIResult, HTTPAPIResultSchema
+from indico.web.http_api.responses import HTTPAPIError, HTTPAPIResult, HTTPAPIResultSchema, HTTPAPIResultStream
 from indico.web.http_api.util import get_query_parameter
 
 
@@ -38,6 +38,9 @@ RE_REMOVE_EXTENSION = re.compile(r'\.(\w+)(?:$|(?=\?))')
 
 API_CACHE = make_scoped_cache('legacy-http-api')
 
+# Streamed results are only cached if there are not more than this many of them
+STREAM_CACHE_MAX_RESULTS = 100
+
 
 def normalizeQuery(path, query, remove=('signature',), separate=False):
     """Normalize request path and query so it can be used for caching and signing.
@@ -99,6 +102,17 @@ def checkAK(apiKey, signature, timestamp, path, query):
     return ak, onlyPublic
 
 
+def _iter_stream(serializer, stream, envelope, cache_key, ts, type_map, logger):
+    try:
+        yield from serializer.iter_stream(stream, envelope)
+    except Exception:
+        logger.exception('Serialization error in streamed request %s?%s', request.path, request.query_string.decode())
+        raise
+    if stream.kept_results is not None:
+        API_CACHE.set(cache_key, (stream.kept_results, stream.extra, ts, stream.complete, type_map),
+                      api_settings.get('cache_ttl'))
+
+
 @make_interceptable
 def handler(prefix, path):
     path = posixpath.join('/', prefix, path)
@@ -220,7 +234,7 @@ def handler(prefix, path):
         if result is None:
             g.current_api_user = user
             # Perform the actual exporting
-            res = hook(user)
+            res = hook(user, stream=Serializer.registry[dformat].streamable)
             if isinstance(res, current_app.response_class):
                 addToCache = False
                 is_response = True
@@ -231,7 +245,10 @@ def handler(prefix, path):
                 result, extra, complete, typeMap = res, {}, True, {}
         if result is not None and addToCache:
             ttl = api_settings.get('cache_ttl')
-            if ttl > 0:
+            if ttl > 0 and isinstance(result, HTTPAPIResultStream):
+                # cached once all results have been sent
+                result.keep_results(STREAM_CACHE_MAX_RESULTS)
+            elif ttl > 0:
                 API_CACHE.set(cacheKey, (result, extra, ts, complete, typeMap), ttl)
     except HTTPAPIError as e:
         error = e
@@ -259,6 +276,15 @@ def handler(prefix, path):
             return result
         serializer = Serializer.create(dformat, query_params=queryParams, pretty=pretty, typeMap=typeMap,
                                        **hook.serializer_args)
+        if error is None and isinstance(result, HTTPAPIResultStream):
+            envelope = None
+            if serializer.encapsulate:
+                envelope = HTTPAPIResultSchema(exclude=('count', 'extra', 'results')).dump(
+                    HTTPAPIResult(None, path, query, ts)
+                )
+            chunks = _iter_stream(serializer, result, envelope, cacheKey, ts, typeMap, logger)
+            return current_app.response_class(stream_with_context(chunks),
+                                              content_type=serializer.get_response_content_type())
         if error:
             if not serializer.schemaless:
                 # if our serializer has a specific schema (HTML, ICAL, etc...)
@@ -9,6 +9,7 @@
 
 import re
 from datetime import datetime, time, timedelta
+from functools import partial
 from types import GeneratorType
 from urllib.parse import unquote
 
@@ -27,7 +28,7 @@ from indico.web.http_api.metadata.atom import AtomSerializer
 from indico.web.http_api.metadata.html import HTML4Serializer
 from indico.web.http_api.metadata.ical import ICalSerializer
 from indico.web.http_api.metadata.jsonp import JSONPSerializer
-from indico.web.http_api.responses import HTTPAPIError
+from indico.web.http_api.responses import HTTPAPIError, HTTPAPIResultStream
 from indico.web.http_api.util import get_query_parameter
 
 
@@ -51,6 +52,10 @@ class HTTPAPIHook:
     COMMIT = False  # commit database changes
     HTTP_POST = False  # require (and allow) HTTP POST
     NO_CACHE = False
+    # Whether results returned by a generator may be sent to the client while they are being generated.
+    # The ``_extra`` function of such a hook is called after all results have been generated, and receives
+    # ``None`` instead of the list of results.
+    STREAMING = False
 
     @classmethod
     def parseRequest(cls, path, queryParams):
@@ -145,12 +150,14 @@ class HTTPAPIHook:
             return self.METHOD_NAME
         return self.PREFIX + '_' + self._type.replace('-', '_')
 
-    def _performCall(self, func, user):
+    def _performCall(self, func, user, stream=False):
         resultList = []
         complete = True
         try:
             res = func(user)
-            if isinstance(res, GeneratorType):
+            if stream and isinstance(res, GeneratorType):
+                return res, None
+            elif isinstance(res, GeneratorType):
                 for obj in res:
                     resultList.append(obj)  # noqa: PERF402
             else:
@@ -159,18 +166,26 @@ class HTTPAPIHook:
             complete = (self._limit == self._userLimit)
         return resultList, complete
 
-    def _perform(self, user, func, extra_func):
+    def _perform(self, user, func, extra_func, stream=False):
         self._getParams()
         if not self._has_access(user):
             raise HTTPAPIError('Access to this resource is restricted.', 403)
-        resultList, complete = self._performCall(func, user)
+        resultList, complete = self._performCall(func, user, stream=stream)
         if isinstance(resultList, current_app.response_class):
             return True, resultList, None, None
+        elif isinstance(resultList, GeneratorType):
+            extra_func = partial(extra_func, user, None) if extra_func else None
+            return False, HTTPAPIResultStream(resultList, (self._limit == self._userLimit), extra_func), None, None
         extra = extra_func(user, resultList) if extra_func else None
         return False, resultList, complete, extra
 
-    def __call__(self, user):
-        """Perform the actual exporting."""
+    def __call__(self, user, *, stream=False):
+        """Perform the actual exporting.
+
+        :param user: The user performing the request
+        :param stream: Whether to return an `HTTPAPIResultStream` instead
+                       of a list in case the hook supports streaming.
+        """
         if (request.method == 'POST') != self.HTTP_POST:
             # XXX: this should never happen, since HTTP_POST is only used within /api/,
             # where the flask url rule requires POST
@@ -185,7 +200,8 @@ class HTTPAPIHook:
             raise NotImplementedError(method_name)
 
         if not self.COMMIT:
-            is_response, resultList, complete, extra = self._perform(user, func, extra_func)
+            is_response, resultList, complete, extra = self._perform(user, func, extra_func,
+                                                                     stream=(stream and self.STREAMING))
             db.session.rollback()
         else:
             try:
@@ -111,6 +111,7 @@ def serialize_session(cal, fossil, now, fid=None):
 
 class ICalSerializer(Serializer):
     schemaless = False
+    streamable = True
     _mime = 'text/calendar'
 
     _mappers = {
@@ -126,21 +127,41 @@ class ICalSerializer(Serializer):
     def register_mapper(cls, fossil, func):
         cls._mappers[fossil] = func
 
+    def _create_calendar(self):
+        cal = ical.Calendar()
+        cal.add('version', '2.0')
+        cal.add('prodid', '-//CERN//INDICO//EN')
+        return cal
+
+    def _get_mapper(self, fossil):
+        if '_fossil' in fossil:
+            return ICalSerializer._mappers.get(fossil['_fossil'])
+        else:
+            return self._extra_args.get('ical_serializer')
+
     def _execute(self, fossils):
         results = fossils['results']
         if not isinstance(results, list):
             results = [results]
 
-        cal = ical.Calendar()
-        cal.add('version', '2.0')
-        cal.add('prodid', '-//CERN//INDICO//EN')
+        cal = self._create_calendar()
         now = now_utc()
         for fossil in results:
-            if '_fossil' in fossil:
-                mapper = ICalSerializer._mappers.get(fossil['_fossil'])
-            else:
-                mapper = self._extra_args.get('ical_serializer')
-            if mapper:
+            if mapper := self._get_mapper(fossil):
                 mapper(cal, fossil, now)
 
         return cal.to_ical()
+
+    def iter_stream(self, stream, envelope=None):
+        # the components are serialized separately and put between the lines
+        # of the (otherwise empty) calendar
+        head, end, tail = self._create_calendar().to_ical().rpartition(b'END:VCALENDAR')
+        yield head
+        now = now_utc()
+        for fossil in stream:
+            if mapper := self._get_mapper(fossil):
+                cal = ical.Calendar()
+                mapper(cal, fossil, now)
+                for component in cal.subcomponents:
+                    yield component.to_ical()
+        yield end + tail
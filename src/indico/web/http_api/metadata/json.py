@@ -15,10 +15,24 @@ class JSONSerializer(Serializer):
     """Basically direct translation from the fossil."""
 
     _mime = 'application/json'
+    streamable = True
 
     def _execute(self, fossil):
         indent = ' ' * 4 if self.pretty else None
         return simplejson.dumps(fossil, cls=IndicoJSONEncoder, indent=indent).replace('/', '\\/')
 
+    def iter_stream(self, stream, envelope=None):
+        sep, indent = (',\n', ' ' * 4) if self.pretty else (', ', '')
+        if envelope is not None:
+            # strip the closing brace so the results can be added to the object
+            yield self._execute(envelope).rstrip()[:-1].rstrip() + sep + indent + '"results": '
+        yield '['
+        for i, fossil in enumerate(stream):
+            yield (sep if i else '') + self._execute(fossil)
+        yield ']'
+        if envelope is not None:
+            # strip the opening brace to append the remaining fields to the object
+            yield sep + self._execute(stream.dump_summary())[1:].lstrip('\n')
+
 
 Serializer.register('json', JSONSerializer)
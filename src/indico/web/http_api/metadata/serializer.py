@@ -8,6 +8,8 @@
 class Serializer:
     schemaless = True
     encapsulate = True
+    #: Whether the serializer can send results while they are being generated
+    streamable = False
 
     registry = {}
 
@@ -49,6 +51,17 @@ class Serializer:
         self._data = self._execute(obj, *args, **kwargs)
         return self._data
 
+    def iter_stream(self, stream, envelope=None):
+        """Serialize results while they are being generated.
+
+        :param stream: An `HTTPAPIResultStream` containing the results
+        :param envelope: The fields of the `HTTPAPIResult` which are known
+                         before generating the results, or ``None`` if
+                         the results are not encapsulated
+        :return: An iterator yielding the serialized data in chunks
+        """
+        raise NotImplementedError
+
 
 from indico.web.http_api.metadata.json import JSONSerializer  # noqa: F401,E402
 from indico.web.http_api.metadata.xml import XMLSerializer  # noqa: F401,E402
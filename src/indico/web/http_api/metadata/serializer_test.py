@@ -0,0 +1,91 @@
+# This file is part of Indico.
+# Copyright (C) 2002 - 2025 CERN
+#
+# Indico is free software; you can redistribute it and/or
+# modify it under the terms of the MIT License; see the
+# LICENSE file for more details.
+
+import json
+
+import pytest
+from lxml import etree
+
+from indico.web.http_api.exceptions import LimitExceededException
+from indico.web.http_api.metadata.jsonp import JSONPSerializer
+from indico.web.http_api.metadata.serializer import Serializer
+from indico.web.http_api.responses import HTTPAPIResultStream
+
+
+RESULTS = [
+    {'_type': 'Event', 'id': 1, 'title': 'Foo/Bar'},
+    {'_type': 'Event', 'id': 2, 'title': 'Test', 'keywords': ['a', 'b']},
+]
+ENVELOPE = {'ts': 1234, 'url': 'http://localhost/export/categ/1.json', '_type': 'HTTPAPIResult'}
+
+
+def _make_stream(results=RESULTS, **kwargs):
+    return HTTPAPIResultStream(iter(results), extra_func=lambda: {'moreFutureEvents': False}, **kwargs)
+
+
+@pytest.mark.parametrize('pretty', (False, True))
+def test_json_stream(pretty):
+    serializer = Serializer.create('json', pretty=pretty)
+    data = ''.join(serializer.iter_stream(_make_stream(), ENVELOPE))
+    assert json.loads(data) == {**ENVELOPE, 'results': RESULTS, 'count': 2,
+                                'additionalInfo': {'moreFutureEvents': False}}
+    assert '\\/' in data
+
+
+def test_json_stream_no_envelope():
+    serializer = Serializer.create('json')
+    assert json.loads(''.join(serializer.iter_stream(_make_stream()))) == RESULTS
+    assert json.loads(''.join(serializer.iter_stream(_make_stream([])))) == []
+
+
+def test_jsonp_stream():
+    serializer = JSONPSerializer({'jsonp': 'callback'})
+    data = ''.join(serializer.iter_stream(_make_stream(), ENVELOPE))
+    assert data.startswith('// fetched from Indico\ncallback(')
+    assert data.endswith(');')
+    assert json.loads(data.split('(', 1)[1][:-2])['count'] == 2
+
+
+def test_xml_stream():
+    serializer = Serializer.create('xml')
+    streamed = etree.fromstring(b''.join(serializer.iter_stream(_make_stream(), ENVELOPE)))
+    regular = etree.fromstring(serializer({**ENVELOPE, 'results': RESULTS, 'count': 2,
+                                           'additionalInfo': {'moreFutureEvents': False}}))
+    assert streamed.tag == regular.tag == 'httpapiresult'
+    assert {el.tag for el in streamed} == {el.tag for el in regular}
+    for tag in ('count', 'ts', 'url', 'results', 'additionalInfo'):
+        assert etree.tostring(streamed.find(tag)) == etree.tostring(regular.find(tag))
+
+
+def test_xml_stream_pretty():
+    serializer = Serializer.create('xml', pretty=True)
+    streamed = etree.fromstring(b''.join(serializer.iter_stream(_make_stream(), ENVELOPE)))
+    assert len(streamed.find('results')) == 2
+    assert streamed.find('count').text == '2'
+
+
+def test_stream_limit():
+    def _iter_results():
+        yield from RESULTS
+        raise LimitExceededException
+
+    stream = HTTPAPIResultStream(_iter_results(), complete_on_limit=False)
+    assert list(stream) == RESULTS
+    assert stream.count == 2
+    assert not stream.complete
+    assert stream.extra == {}
+
+
+@pytest.mark.parametrize(('max_count', 'expected'), (
+    (1, None),
+    (2, RESULTS),
+))
+def test_stream_keep_results(max_count, expected):
+    stream = _make_stream()
+    stream.keep_results(max_count)
+    assert list(stream) == RESULTS
+    assert stream.kept_results == expected
@@ -26,6 +26,7 @@ class XMLSerializer(Serializer):
     """Receive a fossil (or a collection of them) and converts them to XML."""
 
     _mime = 'text/xml'
+    streamable = True
 
     def __init__(self, query_params, pretty=False, **kwargs):
         self._typeMap = kwargs.pop('typeMap', {})
@@ -104,5 +105,25 @@ class XMLSerializer(Serializer):
         return etree.tostring(result, pretty_print=self.pretty,
                               xml_declaration=xml_declaration, encoding='utf-8')
 
+    def _tostring(self, element):
+        return etree.tostring(element, pretty_print=self.pretty, encoding='utf-8')
+
+    def iter_stream(self, stream, envelope=None):
+        yield b"<?xml version='1.0' encoding='utf-8'?>\n"
+        root = self._xmlForFossil(envelope) if envelope is not None else etree.Element('collection')
+        if not len(root):
+            root.text = ''  # avoid a self-closing tag
+        head, closing_tag, tail = self._tostring(root).rpartition(b'</')
+        yield head
+        if envelope is not None:
+            yield b'<results>'
+        for fossil in stream:
+            yield self._tostring(self._xmlForFossil(fossil))
+        if envelope is not None:
+            yield b'</results>'
+            for element in self._xmlForFossil(stream.dump_summary()):
+                yield self._tostring(element)
+        yield closing_tag + tail
+
 
 Serializer.register('xml', XMLSerializer)
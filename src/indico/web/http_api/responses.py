@@ -6,12 +6,14 @@
 # LICENSE file for more details.
 
 import time
+from functools import cached_property
 
 from marshmallow import fields
 from marshmallow.decorators import post_dump
 
 from indico.core.config import config
 from indico.core.marshmallow import mm
+from indico.web.http_api.exceptions import LimitExceededException
 
 
 class HTTPAPIError(Exception):
@@ -42,6 +44,58 @@ class HTTPAPIResult:
         return len(self.results)
 
 
+class HTTPAPIResultStream:
+    """Results of an HTTP API call which are sent while being generated.
+
+    The number of results, whether they are complete and the extra data
+    are only available once the results have been iterated over.
+
+    :param results: An iterable of results
+    :param complete_on_limit: Whether the results are considered complete
+                              if the iterable stops with a
+                              `LimitExceededException`
+    :param extra_func: A callable returning the extra data
+    """
+
+    def __init__(self, results, complete_on_limit=False, extra_func=None):
+        self._results = results
+        self._complete_on_limit = complete_on_limit
+        self._extra_func = extra_func
+        self._max_kept = 0
+        self.count = 0
+        self.complete = True
+        #: The results, if there were no more than specified in `keep_results`
+        self.kept_results = None
+
+    def keep_results(self, max_count):
+        """Keep the results in memory unless there are more than `max_count`."""
+        self._max_kept = max_count
+        self.kept_results = []
+
+    def __iter__(self):
+        try:
+            for result in self._results:
+                self.count += 1
+                if self.kept_results is not None:
+                    if self.count > self._max_kept:
+                        self.kept_results = None
+                    else:
+                        self.kept_results.append(result)
+                yield result
+        except LimitExceededException:
+            self.complete = self._complete_on_limit
+
+    @cached_property
+    def extra(self):
+        return self._extra_func() if self._extra_func else {}
+
+    def dump_summary(self):
+        """Dump the envelope fields which are only known at the end."""
+        data = HTTPAPIResultSchema(only=('count', 'extra')).dump(self)
+        del data['_type']
+        return data
+
+
 class HTTPAPIResultSchema(mm.Schema):
     count = fields.Integer()
     extra = fields.Raw(data_key='additionalInfo')
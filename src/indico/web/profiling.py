@@ -0,0 +1,286 @@
+# This file is part of Indico.
+# Copyright (C) 2002 - 2025 CERN
+#
+# Indico is free software; you can redistribute it and/or
+# modify it under the terms of the MIT License; see the
+# LICENSE file for more details.
+
+"""Low-overhead profiling of requests in production.
+
+This module provides two tools which are meant to be used under real
+traffic without slowing it down noticeably:
+
+- latency histograms per RH class and HTTP method, which are written to
+  a file in the Prometheus text format (e.g. to be picked up by the
+  textfile collector of the node exporter)
+- a sampling profiler which periodically looks at the stack of some
+  requests and aggregates the samples into collapsed-stack files that
+  can be turned into flamegraphs
+"""
+
+import atexit
+import os
+import random
+import sys
+import threading
+import time
+from bisect import bisect_left
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from pathlib import Path
+
+from flask import request
+
+from indico.core.config import config
+from indico.core.logger import Logger
+
+
+logger = Logger.get('profiling')
+
+#: The upper bounds (in seconds) of the latency histogram buckets
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+#: The interval (in seconds) between two stack samples of a request
+SAMPLE_INTERVAL = 0.005
+#: The minimum interval (in seconds) between writing data to disk
+DUMP_INTERVAL = 30
+
+
+def _is_running(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        # the process exists but belongs to another user
+        return True
+    return True
+
+
+def prune_metrics_files(directory):
+    """Delete the metrics files of processes which are no longer running.
+
+    Each process writes its own file, so without pruning the files of
+    old worker processes would stay around and their counters would
+    still be exported.
+
+    :param directory: The directory containing the metrics files
+    """
+    for path in Path(directory).glob('indico-*.prom'):
+        try:
+            pid = int(path.stem.removeprefix('indico-'))
+        except ValueError:
+            continue
+        if pid != os.getpid() and not _is_running(pid):
+            path.unlink(missing_ok=True)
+
+
+def _write_atomic(path, data):
+    tmp_path = Path(f'{path}.tmp')
+    tmp_path.write_text(data)
+    tmp_path.replace(path)
+
+
+def _format_frame(frame):
+    code = frame.f_code
+    return f'{frame.f_globals.get("__name__", "?")}:{code.co_qualname}'
+
+
+def collapse_stack(frame):
+    """Format a stack in the collapsed-stack format used by flamegraph tools.
+
+    :param frame: The innermost frame of the stack
+    :return: A string containing the frames from the outermost to the
+             innermost one, separated by semicolons.
+    """
+    frames = []
+    while frame is not None:
+        frames.append(_format_frame(frame).replace(';', ':'))
+        frame = frame.f_back
+    return ';'.join(reversed(frames))
+
+
+class LatencyHistograms:
+    """Histograms of request durations, one per RH class and HTTP method."""
+
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = buckets
+        self._data = {}
+        self._lock = threading.Lock()
+
+    def observe(self, rh, method, duration):
+        """Record the duration of a request.
+
+        :param rh: The name of the RH class
+        :param method: The HTTP method of the request
+        :param duration: The duration of the request in seconds
+        """
+        bucket = bisect_left(self.buckets, duration)
+        with self._lock:
+            try:
+                counts, total = self._data[(rh, method)]
+            except KeyError:
+                counts, total = [0] * (len(self.buckets) + 1), 0
+            counts[bucket] += 1
+            self._data[(rh, method)] = counts, total + duration
+
+    def dump_prometheus(self, extra_labels=None):
+        """Dump the histograms in the Prometheus text format.
+
+        :param extra_labels: A dict with labels added to all metrics
+        """
+        extra = ''.join(f',{name}="{value}"' for name, value in (extra_labels or {}).items())
+        lines = ['# HELP indico_request_duration_seconds Time spent processing a request',
+                 '# TYPE indico_request_duration_seconds histogram']
+        with self._lock:
+            data = sorted((key, list(counts), total) for key, (counts, total) in self._data.items())
+        for (rh, method), counts, total in data:
+            labels = f'rh="{rh}",method="{method}"{extra}'
+            cumulative = 0
+            for bound, count in zip([*self.buckets, '+Inf'], counts, strict=True):
+                cumulative += count
+                lines.append(f'indico_request_duration_seconds_bucket{{{labels},le="{bound}"}} {cumulative}')
+            lines.append(f'indico_request_duration_seconds_sum{{{labels}}} {total}')
+            lines.append(f'indico_request_duration_seconds_count{{{labels}}} {cumulative}')
+        return '\n'.join(lines) + '\n'
+
+
+class StackSampler:
+    """Sample the stacks of threads which are processing a request.
+
+    A single background thread takes a sample from each registered
+    thread every `interval` seconds.  The samples are aggregated per
+    key (usually the endpoint) in the collapsed-stack format.
+    """
+
+    def __init__(self, interval=SAMPLE_INTERVAL):
+        self.interval = interval
+        self.samples = defaultdict(Counter)
+        self._threads = {}
+        self._lock = threading.Lock()
+        self._active = threading.Event()
+        self._pid = None
+
+    def _ensure_running(self):
+        # the thread does not survive a fork, so we need to check the
+        # pid in case we are running in a forked worker process
+        if self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+            threading.Thread(target=self._run, name='indico-stack-sampler', daemon=True).start()
+
+    @contextmanager
+    def sample(self, key):
+        """Sample the current thread while inside the context manager."""
+        ident = threading.get_ident()
+        self._ensure_running()
+        with self._lock:
+            self._threads[ident] = key
+            self._active.set()
+        try:
+            yield
+        finally:
+            with self._lock:
+                del self._threads[ident]
+                if not self._threads:
+                    self._active.clear()
+
+    def take_samples(self):
+        """Take a sample from all registered threads."""
+        with self._lock:
+            threads = dict(self._threads)
+        frames = sys._current_frames()
+        stacks = [(key, collapse_stack(frame))
+                  for ident, key in threads.items()
+                  if (frame := frames.get(ident)) is not None]
+        with self._lock:
+            for key, stack in stacks:
+                self.samples[key][stack] += 1
+
+    def dump(self, path_func):
+        """Write the collapsed stacks of each key to a file.
+
+        :param path_func: A callable returning the file path for a key
+        """
+        with self._lock:
+            samples = {key: dict(counter) for key, counter in self.samples.items()}
+        for key, stacks in samples.items():
+            _write_atomic(path_func(key), ''.join(f'{stack} {count}\n' for stack, count in sorted(stacks.items())))
+
+    def _run(self):
+        while True:
+            self._active.wait()
+            time.sleep(self.interval)
+            try:
+                self.take_samples()
+            except Exception:
+                logger.exception('Taking stack samples failed')
+
+
+_histograms = LatencyHistograms()
+_sampler = StackSampler()
+_last_dump = {'histograms': time.monotonic(), 'samples': time.monotonic()}
+_histograms_path = {}
+
+
+def _should_dump(what):
+    now = time.monotonic()
+    if now - _last_dump[what] < DUMP_INTERVAL:
+        return False
+    _last_dump[what] = now
+    return True
+
+
+def _get_sample_path(endpoint):
+    return os.path.join(config.TEMP_DIR, f'profile-{endpoint}-{os.getpid()}.folded')
+
+
+def _dump_histograms():
+    path = os.path.join(config.LATENCY_METRICS_DIR, f'indico-{os.getpid()}.prom')
+    _write_atomic(path, _histograms.dump_prometheus({'worker': config.WORKER_NAME, 'pid': os.getpid()}))
+    _histograms_path[os.getpid()] = path
+    prune_metrics_files(config.LATENCY_METRICS_DIR)
+
+
+@atexit.register
+def _remove_histograms():
+    # processes killed without running exit handlers are handled by
+    # the pruning done by the other processes
+    if path := _histograms_path.get(os.getpid()):
+        Path(path).unlink(missing_ok=True)
+
+
+def _should_sample():
+    if not config.PROFILE_SAMPLE_RATE:
+        return False
+    if config.PROFILE_ENDPOINTS and request.endpoint not in config.PROFILE_ENDPOINTS:
+        return False
+    return random.random() < config.PROFILE_SAMPLE_RATE
+
+
+@contextmanager
+def profile_request(rh):
+    """Record the latency of a request and sample it if enabled.
+
+    :param rh: The RH processing the current request
+    """
+    sampled = _should_sample()
+    start = time.perf_counter()
+    try:
+        if sampled:
+            with _sampler.sample(request.endpoint):
+                yield
+        else:
+            yield
+    finally:
+        if config.LATENCY_METRICS_DIR:
+            _histograms.observe(type(rh).__name__, request.method, time.perf_counter() - start)
+        try:
+            if config.LATENCY_METRICS_DIR and _should_dump('histograms'):
+                _dump_histograms()
+            if sampled and _should_dump('samples'):
+                _sampler.dump(_get_sample_path)
+        except OSError:
+            logger.exception('Could not write profiling data')
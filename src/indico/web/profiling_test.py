@@ -0,0 +1,81 @@
+# This file is part of Indico.
+# Copyright (C) 2002 - 2025 CERN
+#
+# Indico is free software; you can redistribute it and/or
+# modify it under the terms of the MIT License; see the
+# LICENSE file for more details.
+
+import os
+import subprocess
+import sys
+import threading
+
+from indico.web.profiling import LatencyHistograms, StackSampler, collapse_stack, prune_metrics_files
+
+
+def test_latency_histograms():
+    histograms = LatencyHistograms(buckets=(0.1, 1))
+    histograms.observe('RHFoo', 'GET', 0.05)
+    histograms.observe('RHFoo', 'GET', 0.1)
+    histograms.observe('RHFoo', 'GET', 0.5)
+    histograms.observe('RHFoo', 'GET', 3)
+    histograms.observe('RHFoo', 'POST', 0.5)
+    lines = histograms.dump_prometheus({'pid': 123}).splitlines()
+    assert lines[1] == '# TYPE indico_request_duration_seconds histogram'
+    assert lines[2:] == [
+        'indico_request_duration_seconds_bucket{rh="RHFoo",method="GET",pid="123",le="0.1"} 2',
+        'indico_request_duration_seconds_bucket{rh="RHFoo",method="GET",pid="123",le="1"} 3',
+        'indico_request_duration_seconds_bucket{rh="RHFoo",method="GET",pid="123",le="+Inf"} 4',
+        'indico_request_duration_seconds_sum{rh="RHFoo",method="GET",pid="123"} 3.65',
+        'indico_request_duration_seconds_count{rh="RHFoo",method="GET",pid="123"} 4',
+        'indico_request_duration_seconds_bucket{rh="RHFoo",method="POST",pid="123",le="0.1"} 0',
+        'indico_request_duration_seconds_bucket{rh="RHFoo",method="POST",pid="123",le="1"} 1',
+        'indico_request_duration_seconds_bucket{rh="RHFoo",method="POST",pid="123",le="+Inf"} 1',
+        'indico_request_duration_seconds_sum{rh="RHFoo",method="POST",pid="123"} 0.5',
+        'indico_request_duration_seconds_count{rh="RHFoo",method="POST",pid="123"} 1',
+    ]
+
+
+def test_prune_metrics_files(tmp_path):
+    proc = subprocess.Popen([sys.executable, '-c', ''])
+    proc.wait()
+    running = tmp_path / f'indico-{os.getppid()}.prom'
+    own = tmp_path / f'indico-{os.getpid()}.prom'
+    dead = tmp_path / f'indico-{proc.pid}.prom'
+    other = tmp_path / 'other.prom'
+    for path in (running, own, dead, other):
+        path.write_text('')
+    prune_metrics_files(tmp_path)
+    assert {path.name for path in tmp_path.iterdir()} == {running.name, own.name, other.name}
+
+
+def test_collapse_stack():
+    def _inner():
+        return collapse_stack(sys._getframe())
+
+    stack = _inner().split(';')
+    assert stack[-1] == f'{__name__}:test_collapse_stack.<locals>._inner'
+    assert stack[-2] == f'{__name__}:test_collapse_stack'
+
+
+def test_stack_sampler():
+    sampler = StackSampler()
+    started = threading.Event()
+    done = threading.Event()
+
+    def _work():
+        with sampler.sample('test'):
+            started.set()
+            done.wait()
+
+    thread = threading.Thread(target=_work)
+    thread.start()
+    started.wait()
+    sampler.take_samples()
+    sampler.take_samples()
+    done.set()
+    thread.join()
+    sampler.take_samples()
+    [(stack, count)] = sampler.samples['test'].items()
+    assert count == 2
+    assert f'{__name__}:test_stack_sampler.<locals>._work' in stack.split(';')
@@ -31,6 +31,7 @@ from indico.util.i18n import _
 from indico.util.locators import get_locator
 from indico.util.signals import values_from_signal
 from indico.web.flask.util import url_for
+from indico.web.profiling import profile_request
 from indico.web.util import get_request_user
 
 
@@ -303,28 +304,29 @@ class RH:
         logger.info('%s %s [IP=%s] [PID=%s]',
                     request.method, request.relative_url, request.remote_addr, os.getpid())
 
-        try:
-            init_email_queue()
-            self._check_csrf()
-            if terms_response := self._check_terms():
-                return terms_response
-
-            res = self._do_process()
-            signals.core.after_process.send()
-
-            if self.commit:
-                db.session.commit()
-                flush_email_queue()
-            else:
+        with profile_request(self):
+            try:
+                init_email_queue()
+                self._check_csrf()
+                if terms_response := self._check_terms():
+                    return terms_response
+
+                res = self._do_process()
+                signals.core.after_process.send()
+
+                if self.commit:
+                    db.session.commit()
+                    flush_email_queue()
+                else:
+                    db.session.rollback()
+            except DatabaseError:
+                db.session.rollback()
+                handle_sqlalchemy_database_error()  # this will re-raise an exception
+            except Exception:
+                # rollback to avoid errors as rendering the error page
+                # within the indico layout may trigger an auto-flush
                 db.session.rollback()
-        except DatabaseError:
-            db.session.rollback()
-            handle_sqlalchemy_database_error()  # this will re-raise an exception
-        except Exception:
-            # rollback to avoid errors as rendering the error page
-            # within the indico layout may trigger an auto-flush
-            db.session.rollback()
-            raise
+                raise
         logger.debug('Request successful')
 
         if res is None: